@@ -23,7 +23,70 @@ class Settings(BaseSettings):
     yahoo_finance_api_key: str = ""
     alpha_vantage_api_key: str = ""
     twitter_api_key: str = ""
-    
+
+    # Market data cache
+    ohlcv_cache_dir: str = ".cache/ohlcv"
+    # Large enough to keep a screener universe of daily series resident
+    ohlcv_cache_max_entries: int = 2048
+    # Memory budget for computed indicator arrays
+    indicator_cache_max_bytes: int = 64 * 1024 * 1024
+    # Live indicator states: most series tracked, and seconds unread before one is dropped
+    indicator_stream_max_tracked: int = 512
+    indicator_stream_idle_ttl: float = 1800.0
+
+    # Thread pool for blocking provider calls (yfinance, feedparser)
+    provider_executor_workers: int = 8
+
+    # Worker processes for CPU-heavy analytics (screener, sweeps, Monte Carlo VaR)
+    cpu_pool_workers: int = 4
+
+    # Shared upstream HTTP clients (Finnhub, Gemini, Alpha Vantage)
+    http2_enabled: bool = False
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+
+    # Quotes: micro-TTL for Finnhub /quote, max age of streamed last trades
+    quote_cache_ttl: float = 2.0
+    quote_stream_max_age: float = 15.0
+
+    # Upstream quotas (requests per minute, burst size) for the rate-limit scheduler
+    rate_limits_per_minute: dict[str, float] = {
+        "finnhub": 60,
+        "yahoo": 30,
+        "alpha_vantage": 5,
+        "gemini": 15,
+    }
+    rate_limit_bursts: dict[str, int] = {
+        "finnhub": 5,
+        "yahoo": 5,
+        "alpha_vantage": 1,
+        "gemini": 3,
+    }
+    rate_limit_max_queue: int = 200
+
+    # Market data source: "live" upstreams or "replay" of recorded fixtures
+    market_data_provider: str = "live"
+    replay_fixtures_dir: str = "fixtures/market_data"
+    replay_latency_ms: float = 0.0
+    replay_jitter_ms: float = 0.0
+    replay_seed: int = 42
+
+    # Screener universe: a symbols file (one per line) wins over the inline list
+    screener_universe: list[str] = []
+    screener_universe_file: str = ""
+    screener_shard_size: int = 250
+
+    # Parameter sweeps: cap on candidates x symbols per job, symbols per
+    # worker task, and how many jobs (finished ones first) are kept
+    sweep_max_evaluations: int = 250_000
+    sweep_chunk_symbols: int = 8
+    sweep_max_jobs: int = 50
+
+    # Equity curves: most calendar days of closes fetched for marking, and
+    # how many users' curves are kept in memory
+    equity_curve_max_days: int = 3650
+    equity_curve_cache_size: int = 256
+
 
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
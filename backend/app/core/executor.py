@@ -0,0 +1,183 @@
+import asyncio
+import importlib
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Sequence
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class BoundedExecutor:
+    """
+    Size-limited thread pool for blocking provider calls (yfinance, feedparser).
+
+    Keeps those calls off the event loop and records how long work waits in
+    the queue before a worker picks it up.
+    """
+
+    def __init__(self, max_workers: int, name: str = "provider", sample_size: int = 1000):
+        self.max_workers = max_workers
+        self.name = name
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._wait_ms = deque(maxlen=sample_size)
+        self._run_ms = deque(maxlen=sample_size)
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "queue_depth": 0,
+            "active": 0,
+            "max_queue_depth": 0,
+        }
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the pool and await its result."""
+        submitted_at = time.perf_counter()
+
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["queue_depth"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._stats["queue_depth"])
+
+        future = self._pool.submit(self._call, fn, submitted_at, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future) -> None:
+        # Cancelled while queued (caller cancelled, or shutdown(cancel_futures=True)):
+        # _call never ran, so it never took the future off the queue
+        if future.cancelled():
+            with self._lock:
+                self._stats["queue_depth"] -= 1
+                self._stats["cancelled"] += 1
+
+    def _call(self, fn: Callable[..., Any], submitted_at: float, args: tuple, kwargs: dict) -> Any:
+        started_at = time.perf_counter()
+        with self._lock:
+            self._stats["queue_depth"] -= 1
+            self._stats["active"] += 1
+            self._wait_ms.append((started_at - submitted_at) * 1000)
+
+        failed = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._stats["active"] -= 1
+                self._stats["failed" if failed else "completed"] += 1
+                self._run_ms.append((time.perf_counter() - started_at) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait/run time percentiles (ms) over recent calls."""
+        with self._lock:
+            return {
+                **self._stats,
+                "max_workers": self.max_workers,
+                "wait_ms": self._summarize(self._wait_ms),
+                "run_ms": self._summarize(self._run_ms),
+            }
+
+    @staticmethod
+    def _summarize(samples: deque) -> Dict[str, float]:
+        if not samples:
+            return {"avg": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        return {
+            "avg": round(sum(ordered) / len(ordered), 3),
+            "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 3),
+            "max": round(ordered[-1], 3),
+        }
+
+    def shutdown(self) -> None:
+        logger.info("Shutting down executor", name=self.name)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _noop() -> None:
+    return None
+
+
+def _preload(modules: Sequence[str]) -> None:
+    """Worker initializer: import heavy modules before the first task arrives."""
+    for module in modules:
+        importlib.import_module(module)
+
+
+class ProcessPool:
+    """
+    Worker processes for CPU-bound analytics (screener shards, sweeps).
+
+    Workers are spawned rather than forked, since the API process runs
+    threads. The pool is created on first use; `warm` starts the workers
+    (and imports `preload` in each) ahead of the first request.
+    """
+
+    def __init__(self, max_workers: int, name: str = "cpu", preload: Sequence[str] = ()):
+        self.max_workers = max_workers
+        self.name = name
+        self.preload = tuple(preload)
+        self._pool: ProcessPoolExecutor = None
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "active": 0}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_preload,
+                    initargs=(self.preload,),
+                )
+            return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a picklable top-level function in a worker process."""
+        loop = asyncio.get_running_loop()
+        self._stats["submitted"] += 1
+        self._stats["active"] += 1
+        try:
+            result = await loop.run_in_executor(self.pool, fn, *args)
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+        finally:
+            self._stats["active"] -= 1
+        self._stats["completed"] += 1
+        return result
+
+    async def warm(self) -> None:
+        await asyncio.gather(*(self.run(_noop) for _ in range(self.max_workers)))
+        logger.info("✅ Process pool started", name=self.name, workers=self.max_workers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "max_workers": self.max_workers, "started": self._pool is not None}
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            logger.info("Shutting down process pool", name=self.name)
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Shared pool for every blocking upstream call
+provider_executor = BoundedExecutor(max_workers=settings.provider_executor_workers)
+
+# Shared worker processes for CPU-heavy analytics
+cpu_pool = ProcessPool(
+    max_workers=settings.cpu_pool_workers,
+    preload=("app.services.screener", "app.services.sweeps", "app.services.value_at_risk")
+)
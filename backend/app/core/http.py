@@ -0,0 +1,129 @@
+import importlib.util
+from typing import Any, Dict, Optional
+
+import httpx
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Per-upstream read timeouts (seconds). Callers may still override per request.
+UPSTREAM_TIMEOUTS = {
+    "finnhub": 5.0,
+    "gemini": 30.0,
+    "alpha_vantage": 15.0,
+}
+
+CONNECT_TIMEOUT = 5.0
+
+
+class HTTPClientPool:
+    """
+    One long-lived httpx.AsyncClient per upstream.
+
+    Clients are opened at app startup and closed at shutdown, so TCP/TLS
+    connections are kept alive and reused across requests instead of being
+    set up on every call.
+    """
+
+    def __init__(
+        self,
+        timeouts: Dict[str, float],
+        http2: bool = False,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0
+    ):
+        self.timeouts = timeouts
+        self.http2 = http2 and self._http2_available()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._requests: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _http2_available() -> bool:
+        # httpx only speaks HTTP/2 when the optional `h2` package is installed
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("⚠ HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+            return False
+        return True
+
+    async def startup(self) -> None:
+        for name in self.timeouts:
+            self.get(name)
+        logger.info("✅ HTTP clients opened", upstreams=list(self._clients), http2=self.http2)
+
+    async def shutdown(self) -> None:
+        for name, client in list(self._clients.items()):
+            await client.aclose()
+        self._clients.clear()
+        logger.info("HTTP clients closed")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        Shared client for an upstream. Created lazily so scripts and tests
+        that never run the startup hook still work.
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+            self._clients[name] = client
+        return client
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        counters = self._requests.setdefault(name, {"requests": 0, "errors": 0})
+
+        async def on_request(request: httpx.Request) -> None:
+            counters["requests"] += 1
+
+        async def on_response(response: httpx.Response) -> None:
+            if response.status_code >= 400:
+                counters["errors"] += 1
+
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=self.limits,
+            timeout=httpx.Timeout(self.timeouts.get(name, 10.0), connect=CONNECT_TIMEOUT),
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters and connection pool usage per upstream."""
+        upstreams = {}
+        for name, client in self._clients.items():
+            upstreams[name] = {
+                **self._requests.get(name, {}),
+                **self._pool_usage(client),
+            }
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "upstreams": upstreams,
+        }
+
+    @staticmethod
+    def _pool_usage(client: httpx.AsyncClient) -> Dict[str, Optional[int]]:
+        # httpx does not expose its pool publicly; read httpcore's if present
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return {"connections": None, "idle": None}
+        return {
+            "connections": len(connections),
+            "idle": sum(1 for c in connections if c.is_idle()),
+        }
+
+
+# Shared across the app; opened/closed by the FastAPI lifecycle hooks
+http_clients = HTTPClientPool(
+    UPSTREAM_TIMEOUTS,
+    http2=settings.http2_enabled,
+    max_connections=settings.http_max_connections,
+    max_keepalive_connections=settings.http_max_keepalive_connections,
+)
@@ -0,0 +1,179 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0  # chart loads, copilot chat, quote lookups
+    BACKGROUND = 1   # alert scans, sentiment scans
+
+
+class RateLimitExceeded(Exception):
+    """The provider queue is full; the request was rejected instead of queued."""
+
+    def __init__(self, provider: str):
+        super().__init__(f"Rate limit queue full for {provider}")
+        self.provider = provider
+
+
+class UpstreamRateLimited(Exception):
+    """The upstream answered 429 despite local limiting."""
+
+    def __init__(self, provider: str, retry_after: float = 0.0):
+        super().__init__(f"{provider} rate limited (retry after {retry_after}s)")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(response, default: float = 10.0) -> float:
+    """Seconds to back off from a 429 response's Retry-After header."""
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+class ProviderLimiter:
+    """
+    Token bucket for one upstream with a priority queue of waiters.
+
+    Requests over the quota wait in the queue (interactive before
+    background) instead of failing; only a full queue rejects.
+    """
+
+    def __init__(self, name: str, per_minute: float, burst: int, max_queue: int, sample_size: int = 1000):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.max_queue = max_queue
+        self.tokens = float(self.capacity)
+        # Tokens accrue from this instant; set into the future to block after a 429
+        self.updated_at = time.monotonic()
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wait_ms = deque(maxlen=sample_size)
+        self._stats = {"granted": 0, "queued": 0, "rejected": 0, "penalties": 0}
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        if not self._queue and self._take():
+            self._grant(time.monotonic())
+            return
+
+        if len(self._queue) >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise RateLimitExceeded(self.name)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), time.monotonic(), future))
+        self._stats["queued"] += 1
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        await future
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket and stop issuing tokens for `seconds` (e.g. Retry-After)."""
+        self.tokens = 0.0
+        self.updated_at = max(self.updated_at, time.monotonic() + seconds)
+        self._stats["penalties"] += 1
+        logger.warning("⚠ Upstream rate limited, backing off", provider=self.name, seconds=seconds)
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            if not self._take():
+                await asyncio.sleep(self._delay())
+                continue
+
+            while self._queue:
+                _, _, enqueued_at, future = heapq.heappop(self._queue)
+                if not future.done():  # skip callers that went away
+                    future.set_result(None)
+                    self._grant(enqueued_at)
+                    break
+            else:
+                self.tokens += 1  # nobody left to use it
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if now <= self.updated_at:
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def _delay(self) -> float:
+        blocked = max(0.0, self.updated_at - time.monotonic())
+        return blocked + max(0.0, (1 - self.tokens) / self.rate)
+
+    def _grant(self, enqueued_at: float) -> None:
+        self._stats["granted"] += 1
+        self._wait_ms.append((time.monotonic() - enqueued_at) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        waiting = [entry for entry in self._queue if not entry[3].done()]
+        waits = sorted(self._wait_ms)
+        return {
+            **self._stats,
+            "per_minute": round(self.rate * 60, 2),
+            "burst": self.capacity,
+            "tokens": round(self.tokens, 2),
+            "queue_depth": len(waiting),
+            "queue_depth_by_priority": {
+                p.name.lower(): sum(1 for entry in waiting if entry[0] == p) for p in Priority
+            },
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p95": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0,
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+
+class RateLimitScheduler:
+    """Per-provider token buckets. Unknown providers are not limited."""
+
+    def __init__(self, limits: Dict[str, float], bursts: Dict[str, int], max_queue: int):
+        self._limiters = {
+            name: ProviderLimiter(name, per_minute, bursts.get(name, 1), max_queue)
+            for name, per_minute in limits.items()
+        }
+
+    async def acquire(self, provider: str, priority: Priority = Priority.INTERACTIVE) -> None:
+        limiter = self._limiters.get(provider)
+        if limiter is not None:
+            await limiter.acquire(priority)
+
+    def penalize(self, provider: str, seconds: float) -> None:
+        limiter = self._limiters.get(provider)
+        if limiter is not None:
+            limiter.penalize(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+
+# Shared quota scheduler for all upstream calls
+rate_limiter = RateLimitScheduler(
+    settings.rate_limits_per_minute,
+    settings.rate_limit_bursts,
+    settings.rate_limit_max_queue
+)
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class SingleFlight:
+    """
+    In-flight request coalescing.
+
+    Concurrent callers asking for the same key await one shared task instead
+    of each hitting the upstream. The task is shielded, so a caller that
+    disconnects does not cancel the fetch for everyone else.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn()` once per key at a time. Callers must treat the result as
+        shared (copy before mutating).
+        """
+        self._stats["calls"] += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self._stats["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Single-flight call failed", name=self.name, key=str(key))
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "in_flight": len(self._inflight)}
@@ -2,8 +2,11 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import engine, Base
-from app.routes import users, trades, analytics, sentiment, alerts, copilot
+from app.core.executor import provider_executor, cpu_pool
+from app.core.http import http_clients
+from app.routes import users, trades, analytics, sentiment, alerts, copilot, metrics, backtest
 from app.routes import prices
+from app.services.ohlcv_cache import ohlcv_cache
 import structlog
 
 # Create database tables (commented out for now to avoid connection issues during testing)
@@ -38,6 +41,22 @@ app.include_router(sentiment, prefix="/api/sentiment", tags=["Sentiment"])
 app.include_router(alerts, prefix="/api/alerts", tags=["Alerts"])
 app.include_router(copilot, prefix="/api/copilot", tags=["Copilot"])
 app.include_router(prices.router, prefix="/api/prices", tags=["prices"])
+app.include_router(metrics, prefix="/api/metrics", tags=["Metrics"])
+app.include_router(backtest, prefix="/api/backtest", tags=["Backtest"])
+
+@app.on_event("startup")
+async def startup():
+    await http_clients.startup()
+    await cpu_pool.warm()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await http_clients.shutdown()
+    provider_executor.shutdown()
+    cpu_pool.shutdown()
+    ohlcv_cache.flush(timeout=5)
+
 
 @app.get("/")
 async def root():
@@ -2,4 +2,5 @@ from app.core.database import Base
 from .user import User
 from .trade import Trade
 from .alert import Alert
+from .position import Position
 # Import other models here as they are created
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class Position(Base):
+    """Per user and symbol projection of the trade log, kept in step with trades."""
+    __tablename__ = "positions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "symbol", name="uq_positions_user_symbol"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    symbol = Column(String(10), nullable=False)
+    quantity = Column(Float, nullable=False, default=0.0)  # open quantity, negative when short
+    cost_basis = Column(Float, nullable=False, default=0.0)  # average cost x open quantity (signed)
+    realized_pnl = Column(Float, nullable=False, default=0.0)  # average-cost realized PnL
+    trade_count = Column(Integer, nullable=False, default=0)
+    traded_value = Column(Float, nullable=False, default=0.0)  # sum of quantity x price
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationship
+    user = relationship("User", back_populates="positions")
+
+    @property
+    def average_cost(self):
+        return self.cost_basis / self.quantity if self.quantity else None
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Trade(Base):
     __tablename__ = "trades"
+    __table_args__ = (
+        # Per-user GROUP BY symbol, trade_type (portfolio summary)
+        Index("ix_trades_user_symbol_type", "user_id", "symbol", "trade_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
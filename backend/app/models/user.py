@@ -16,3 +16,4 @@ class User(Base):
     # Relationships
     trades = relationship("Trade", back_populates="user")
     alerts = relationship("Alert", back_populates="user")
+    positions = relationship("Position", back_populates="user")
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from app.core.config import settings
+from app.providers.base import MarketDataProvider
+
+_provider: Optional[MarketDataProvider] = None
+
+
+def get_market_data_provider() -> MarketDataProvider:
+    """
+    Process-wide provider selected by settings.market_data_provider:
+    "live" (Yahoo / Finnhub / Alpha Vantage / RSS) or "replay" (fixture files).
+    """
+    global _provider
+    if _provider is None:
+        if settings.market_data_provider == "replay":
+            from app.providers.replay import ReplayProvider
+            _provider = ReplayProvider(
+                settings.replay_fixtures_dir,
+                latency_ms=settings.replay_latency_ms,
+                jitter_ms=settings.replay_jitter_ms,
+                seed=settings.replay_seed,
+            )
+        else:
+            from app.providers.live import LiveProvider
+            _provider = LiveProvider()
+    return _provider
+
+
+__all__ = ["MarketDataProvider", "get_market_data_provider"]
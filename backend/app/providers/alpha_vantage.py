@@ -0,0 +1,54 @@
+from typing import Any, Dict
+
+import pandas as pd
+
+from app.core.rate_limiter import Priority
+from app.providers.base import MarketDataProvider, filter_window
+from app.utils.alpha_vantage import get_stock_data, get_intraday_data
+
+# yfinance-style interval -> Alpha Vantage intraday interval
+INTRADAY_INTERVALS = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "60m": "60min",
+}
+
+
+class AlphaVantageProvider(MarketDataProvider):
+    """
+    Daily and intraday OHLCV from Alpha Vantage (compact output, ~100 bars).
+    Used as a fallback when Yahoo returns nothing.
+    """
+
+    name = "alpha_vantage"
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> pd.DataFrame:
+        if interval == "1d":
+            series = await get_stock_data(symbol, priority=priority)
+        elif interval in INTRADAY_INTERVALS:
+            series = await get_intraday_data(symbol, INTRADAY_INTERVALS[interval], priority=priority)
+        else:
+            return pd.DataFrame()
+
+        return filter_window(self._to_frame(series), **window)
+
+    @staticmethod
+    def _to_frame(series: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        """{"2024-01-02": {"1. open": "..", ...}} -> normalized frame, oldest first."""
+        if not series:
+            return pd.DataFrame()
+
+        df = pd.DataFrame.from_dict(series, orient="index")
+        df = df.rename(columns=lambda c: c.split(". ", 1)[-1])
+        df = df[["open", "high", "low", "close", "volume"]].astype(float)
+        df.index = pd.to_datetime(df.index)
+        df = df.sort_index().rename_axis("date").reset_index()
+        return df
@@ -0,0 +1,112 @@
+from typing import Any, AsyncIterator, Dict, List
+
+import pandas as pd
+
+from app.core.rate_limiter import Priority
+
+OHLCV_FRAME_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+
+class MarketDataProvider:
+    """
+    Interface every market data source implements.
+
+    OHLCV frames are normalized: date/open/high/low/close/volume columns,
+    oldest bar first. Quotes use Finnhub's shape ({"c", "pc", "t", ...}) and
+    ticks use Finnhub trade messages ({"s", "p", "v", "t"}).
+
+    `window` is either period="<N>d" or start=/end= timestamps.
+    """
+
+    name = "base"
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> pd.DataFrame:
+        raise NotImplementedError
+
+    async def fetch_ohlcv_batch(
+        self,
+        symbols: List[str],
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> Dict[str, pd.DataFrame]:
+        """Default: one call per symbol. Providers with a batch API override this."""
+        frames = {}
+        for symbol in symbols:
+            frames[symbol] = await self.fetch_ohlcv(symbol, interval, priority, **window)
+        return frames
+
+    async def fetch_quote(self, symbol: str, priority: Priority = Priority.INTERACTIVE) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def fetch_news(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def stream_ticks(self, symbols: List[str]) -> AsyncIterator[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flatten a yfinance-style frame into date/open/high/low/close/volume columns.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    # Newer yfinance returns (Price, Ticker) MultiIndex columns
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+        df.columns.name = None
+
+    df = df.reset_index()
+
+    # Standardize column names
+    df = df.rename(columns={
+        "Date": "date",
+        "Datetime": "date",
+        "Open": "open",
+        "High": "high",
+        "Low": "low",
+        "Close": "close",
+        "Volume": "volume",
+    })
+
+    df = df[OHLCV_FRAME_COLUMNS]
+    return df.dropna(subset=["close"]).reset_index(drop=True)
+
+
+def filter_window(df: pd.DataFrame, **window) -> pd.DataFrame:
+    """Apply a period=/start=/end= window to a normalized frame."""
+    if df.empty:
+        return df
+
+    dates = pd.DatetimeIndex(df["date"])
+    mask = pd.Series(True, index=df.index)
+
+    def _align(ts) -> pd.Timestamp:
+        ts = pd.Timestamp(ts)
+        if dates.tz is not None and ts.tz is None:
+            return ts.tz_localize(dates.tz)
+        if dates.tz is None and ts.tz is not None:
+            return ts.tz_localize(None)
+        return ts
+
+    if window.get("period"):
+        days = int(str(window["period"]).rstrip("d"))
+        now = pd.Timestamp.now(tz=dates.tz)
+        if dates.tz is None:
+            now = now.normalize()
+        mask &= dates >= now - pd.Timedelta(days=days)
+    if window.get("start") is not None:
+        mask &= dates >= _align(window["start"])
+    if window.get("end") is not None:
+        mask &= dates <= _align(window["end"])
+
+    return df.loc[mask.to_numpy()].reset_index(drop=True)
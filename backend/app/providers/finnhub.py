@@ -0,0 +1,68 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List
+
+import structlog
+import websockets
+from websockets.exceptions import WebSocketException
+
+from app.core.config import settings
+from app.core.http import http_clients
+from app.core.rate_limiter import rate_limiter, Priority
+from app.providers.base import MarketDataProvider
+
+logger = structlog.get_logger()
+
+
+class FinnhubProvider(MarketDataProvider):
+    """Quotes (REST) and live trades (websocket) from Finnhub."""
+
+    name = "finnhub"
+    REST_URL = "https://finnhub.io/api/v1"
+    WS_URL = "wss://ws.finnhub.io"
+    # Seconds between stream reconnect attempts, doubling up to the max
+    RECONNECT_MIN_DELAY = 1.0
+    RECONNECT_MAX_DELAY = 60.0
+
+    async def fetch_quote(self, symbol: str, priority: Priority = Priority.INTERACTIVE) -> Dict[str, Any]:
+        """
+        Free tier API: works only for quote endpoint.
+        """
+        await rate_limiter.acquire("finnhub", priority)
+        res = await http_clients.get("finnhub").get(
+            f"{self.REST_URL}/quote",
+            params={"symbol": symbol, "token": settings.FINNHUB_API_KEY}
+        )
+        return res.json()
+
+    async def stream_ticks(self, symbols: List[str]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Trade batches for `symbols`. A dropped connection is re-opened (and
+        re-subscribed) with exponential backoff, reset once messages flow again.
+        """
+        url = f"{self.WS_URL}?token={settings.FINNHUB_API_KEY}"
+        delay = self.RECONNECT_MIN_DELAY
+
+        while True:
+            try:
+                async with websockets.connect(url) as ws:
+                    # Subscribe to each symbol
+                    for symbol in symbols:
+                        await ws.send(json.dumps({"type": "subscribe", "symbol": symbol}))
+
+                    async for msg in ws:
+                        delay = self.RECONNECT_MIN_DELAY
+                        try:
+                            data = json.loads(msg)
+                        except ValueError:
+                            logger.warning("⚠ Unparseable Finnhub stream message", message=str(msg)[:200])
+                            continue
+                        if "data" in data:
+                            yield data["data"]
+
+                logger.warning("⚠ Finnhub stream closed, reconnecting", symbols=symbols, delay=delay)
+            except (OSError, WebSocketException) as e:
+                logger.warning("⚠ Finnhub stream error, reconnecting", symbols=symbols, delay=delay, error=str(e))
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
@@ -0,0 +1,59 @@
+from typing import Any, AsyncIterator, Dict, List
+
+import pandas as pd
+import structlog
+
+from app.core.config import settings
+from app.core.rate_limiter import Priority
+from app.providers.base import MarketDataProvider
+from app.providers.yahoo import YahooProvider
+from app.providers.finnhub import FinnhubProvider
+from app.providers.alpha_vantage import AlphaVantageProvider
+from app.utils.rss_parser import get_financial_news
+
+logger = structlog.get_logger()
+
+
+class LiveProvider(MarketDataProvider):
+    """
+    Production routing: OHLCV from Yahoo (Alpha Vantage fallback when a key
+    is configured), quotes and ticks from Finnhub, news from RSS feeds.
+    """
+
+    name = "live"
+
+    def __init__(self):
+        self.yahoo = YahooProvider()
+        self.finnhub = FinnhubProvider()
+        self.alpha_vantage = AlphaVantageProvider() if settings.alpha_vantage_api_key else None
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> pd.DataFrame:
+        df = await self.yahoo.fetch_ohlcv(symbol, interval, priority, **window)
+        if df.empty and self.alpha_vantage is not None:
+            logger.info("Yahoo empty, falling back to Alpha Vantage", symbol=symbol, interval=interval)
+            df = await self.alpha_vantage.fetch_ohlcv(symbol, interval, priority, **window)
+        return df
+
+    async def fetch_ohlcv_batch(
+        self,
+        symbols: List[str],
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> Dict[str, pd.DataFrame]:
+        return await self.yahoo.fetch_ohlcv_batch(symbols, interval, priority, **window)
+
+    async def fetch_quote(self, symbol: str, priority: Priority = Priority.INTERACTIVE) -> Dict[str, Any]:
+        return await self.finnhub.fetch_quote(symbol, priority)
+
+    async def fetch_news(self) -> List[Dict]:
+        return await get_financial_news()
+
+    def stream_ticks(self, symbols: List[str]) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self.finnhub.stream_ticks(symbols)
@@ -0,0 +1,273 @@
+"""
+Offline market data served from recorded fixture files.
+
+Layout under `fixtures_dir`:
+
+    ohlcv/{SYMBOL}_{interval}.csv   date,open,high,low,close,volume
+    quotes/{SYMBOL}.json            Finnhub /quote response
+    ticks/{SYMBOL}.jsonl            one Finnhub trade message per line
+    news.json                       list of RSS article dicts
+
+Record fixtures from the live providers with:
+
+    python -m app.providers.replay record AAPL MSFT --days 365 --intervals 1d 5m
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pandas as pd
+import structlog
+
+from app.core.rate_limiter import Priority
+from app.providers.base import MarketDataProvider, OHLCV_FRAME_COLUMNS, filter_window
+
+logger = structlog.get_logger()
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serves OHLCV, quotes, ticks and news from fixture files.
+
+    Every call sleeps `latency_ms` +/- `jitter_ms` (seeded, so a run is
+    reproducible) to stand in for upstream round-trips. Bars are shifted
+    forward by whole weeks so the newest one falls in the current week;
+    weekdays and sessions stay intact and cache freshness logic behaves
+    as it does live.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir: str, latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 42):
+        self.fixtures_dir = fixtures_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+
+    async def _simulate_latency(self) -> None:
+        delay_ms = self.latency_ms
+        if self.jitter_ms:
+            delay_ms += self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.fixtures_dir, *parts)
+
+    # ------------------------------------------------------------
+    # OHLCV
+    # ------------------------------------------------------------
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> pd.DataFrame:
+        await self._simulate_latency()
+        return filter_window(self._load_ohlcv(symbol, interval), **window)
+
+    async def fetch_ohlcv_batch(
+        self,
+        symbols: List[str],
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> Dict[str, pd.DataFrame]:
+        # One simulated round-trip, like the combined Yahoo download
+        await self._simulate_latency()
+        frames = {}
+        for symbol in symbols:
+            df = filter_window(self._load_ohlcv(symbol, interval), **window)
+            if not df.empty:
+                frames[symbol] = df
+        return frames
+
+    def _load_ohlcv(self, symbol: str, interval: str) -> pd.DataFrame:
+        """Recorded bars for a series, time-shifted; read once per process."""
+        key = (symbol.upper(), interval)
+        if key not in self._frames:
+            path = self._path("ohlcv", f"{key[0]}_{interval}.csv")
+            if not os.path.exists(path):
+                return pd.DataFrame()
+
+            df = pd.read_csv(path)
+            # Intraday bars carry UTC offsets (which change across DST)
+            intraday = interval.endswith(("m", "h"))
+            df["date"] = pd.to_datetime(df["date"], utc=intraday)
+            df = df[OHLCV_FRAME_COLUMNS].sort_values("date").reset_index(drop=True)
+            self._frames[key] = self._shift_to_now(df)
+
+        return self._frames[key].copy()
+
+    @staticmethod
+    def _shift_to_now(df: pd.DataFrame) -> pd.DataFrame:
+        if df.empty:
+            return df
+        dates = pd.DatetimeIndex(df["date"])
+        today = pd.Timestamp.now(tz=dates.tz).normalize()
+        weeks = (today - dates[-1].normalize()).days // 7
+        if weeks > 0:
+            df["date"] = dates + pd.Timedelta(weeks=weeks)
+        return df
+
+    # ------------------------------------------------------------
+    # QUOTES
+    # ------------------------------------------------------------
+    async def fetch_quote(self, symbol: str, priority: Priority = Priority.INTERACTIVE) -> Dict[str, Any]:
+        await self._simulate_latency()
+        symbol = symbol.upper()
+
+        path = self._path("quotes", f"{symbol}.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                quote = json.load(f)
+            return {**quote, "t": int(time.time())}
+
+        # No recorded quote: derive one from the daily bars
+        df = self._load_ohlcv(symbol, "1d")
+        if df.empty:
+            return {"c": 0, "pc": 0, "t": 0}  # Finnhub's answer for unknown symbols
+        return {
+            "c": float(df["close"].iloc[-1]),
+            "pc": float(df["close"].iloc[-2]) if len(df) > 1 else float(df["close"].iloc[-1]),
+            "t": int(time.time()),
+        }
+
+    # ------------------------------------------------------------
+    # NEWS
+    # ------------------------------------------------------------
+    async def fetch_news(self) -> List[Dict]:
+        await self._simulate_latency()
+        path = self._path("news.json")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    # ------------------------------------------------------------
+    # TICKS
+    # ------------------------------------------------------------
+    async def stream_ticks(self, symbols: List[str]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Replay recorded trades for `symbols` merged in time order, keeping the
+        recorded gaps between messages, and loop. Timestamps are rewritten to
+        the wall clock so downstream staleness checks see live data.
+        """
+        recorded = [self._load_ticks(symbol) for symbol in symbols]
+        trades = list(heapq.merge(*recorded, key=lambda trade: trade["t"]))
+        if not trades:
+            logger.warning("⚠ No recorded ticks to replay", symbols=symbols)
+            return
+
+        while True:
+            previous_t = trades[0]["t"]
+            batch: List[Dict[str, Any]] = []
+
+            for trade in trades:
+                if trade["t"] != previous_t and batch:
+                    yield batch
+                    batch = []
+                    await asyncio.sleep(min(trade["t"] - previous_t, 5000) / 1000)
+                previous_t = trade["t"]
+                batch.append({**trade, "t": int(time.time() * 1000)})
+
+            yield batch
+            await self._simulate_latency()
+
+    def _load_ticks(self, symbol: str) -> List[Dict[str, Any]]:
+        path = self._path("ticks", f"{symbol.upper()}.jsonl")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            ticks = [json.loads(line) for line in f if line.strip()]
+        return sorted(ticks, key=lambda trade: trade["t"])
+
+
+# ------------------------------------------------------------
+# RECORDER
+# ------------------------------------------------------------
+async def record_fixtures(
+    symbols: List[str],
+    out_dir: str,
+    intervals: List[str],
+    days: int = 365,
+    tick_seconds: float = 0.0,
+    provider: Optional[MarketDataProvider] = None
+) -> None:
+    """Capture live data into the fixture layout ReplayProvider reads."""
+    from app.providers.live import LiveProvider
+
+    provider = provider or LiveProvider()
+    for sub in ("ohlcv", "quotes", "ticks"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    for interval in intervals:
+        frames = await provider.fetch_ohlcv_batch(symbols, interval, period=f"{days}d")
+        for symbol, df in frames.items():
+            df.to_csv(os.path.join(out_dir, "ohlcv", f"{symbol}_{interval}.csv"), index=False)
+            logger.info("Recorded OHLCV", symbol=symbol, interval=interval, bars=len(df))
+
+    for symbol in symbols:
+        quote = await provider.fetch_quote(symbol)
+        with open(os.path.join(out_dir, "quotes", f"{symbol}.json"), "w") as f:
+            json.dump(quote, f)
+
+    with open(os.path.join(out_dir, "news.json"), "w") as f:
+        json.dump(await provider.fetch_news(), f, default=str)
+
+    if tick_seconds > 0:
+        await _record_ticks(provider, symbols, out_dir, tick_seconds)
+
+
+async def _record_ticks(provider: MarketDataProvider, symbols: List[str], out_dir: str, seconds: float) -> None:
+    files = {s: open(os.path.join(out_dir, "ticks", f"{s}.jsonl"), "a") for s in symbols}
+    deadline = time.monotonic() + seconds
+    ticks = provider.stream_ticks(symbols)
+    try:
+        while time.monotonic() < deadline:
+            try:
+                trades = await asyncio.wait_for(ticks.__anext__(), deadline - time.monotonic())
+            except (asyncio.TimeoutError, StopAsyncIteration):
+                break
+            for trade in trades:
+                if trade.get("s") in files:
+                    files[trade["s"]].write(json.dumps(trade) + "\n")
+    finally:
+        await ticks.aclose()
+        for f in files.values():
+            f.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record market data fixtures for the replay provider")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record")
+    record.add_argument("symbols", nargs="+")
+    record.add_argument("--out", default=None, help="Fixture directory (default: settings.replay_fixtures_dir)")
+    record.add_argument("--intervals", nargs="+", default=["1d"])
+    record.add_argument("--days", type=int, default=365)
+    record.add_argument("--ticks", type=float, default=0.0, help="Seconds of live trades to capture")
+
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    asyncio.run(record_fixtures(
+        [s.upper() for s in args.symbols],
+        args.out or settings.replay_fixtures_dir,
+        args.intervals,
+        days=args.days,
+        tick_seconds=args.ticks,
+    ))
+
+
+if __name__ == "__main__":
+    main()
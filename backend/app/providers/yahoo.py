@@ -0,0 +1,63 @@
+from typing import Dict, List
+
+import pandas as pd
+import yfinance as yf
+
+from app.core.executor import provider_executor
+from app.core.rate_limiter import rate_limiter, Priority
+from app.providers.base import MarketDataProvider, normalize_ohlcv
+
+
+class YahooProvider(MarketDataProvider):
+    """OHLCV from Yahoo Finance. yf.download blocks, so it runs on the provider pool."""
+
+    name = "yahoo"
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> pd.DataFrame:
+        await rate_limiter.acquire("yahoo", priority)
+        df = await provider_executor.run(
+            yf.download,
+            symbol,
+            interval=interval,
+            progress=False,
+            **window
+        )
+        return normalize_ohlcv(df)
+
+    async def fetch_ohlcv_batch(
+        self,
+        symbols: List[str],
+        interval: str,
+        priority: Priority = Priority.INTERACTIVE,
+        **window
+    ) -> Dict[str, pd.DataFrame]:
+        """One combined yf.download, split into normalized per-symbol frames."""
+        await rate_limiter.acquire("yahoo", priority)
+        df = await provider_executor.run(
+            yf.download,
+            symbols,
+            interval=interval,
+            group_by="ticker",
+            progress=False,
+            **window
+        )
+
+        if df is None or df.empty:
+            return {}
+
+        frames = {}
+        for symbol in symbols:
+            if isinstance(df.columns, pd.MultiIndex):
+                if symbol not in df.columns.get_level_values(0):
+                    continue
+                frames[symbol] = normalize_ohlcv(df[symbol])
+            else:
+                # Older yfinance returns flat columns for a single ticker
+                frames[symbol] = normalize_ohlcv(df)
+        return frames
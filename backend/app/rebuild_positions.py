@@ -0,0 +1,29 @@
+"""
+Recompute the positions projection from the trade log, e.g. after a
+bulk import outside the API or to check for drift.
+
+    python -m app.rebuild_positions            # every user
+    python -m app.rebuild_positions --user-id 3
+"""
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.positions import rebuild_positions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, default=None, help="Only this user (default: everyone)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        written = rebuild_positions(db, args.user_id)
+    finally:
+        db.close()
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    print(f"✅ Rebuilt {written} positions for {scope}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,6 @@ from .analytics import router as analytics
 from .sentiment import router as sentiment
 from .alerts import router as alerts
 from .copilot import router as copilot
+from .metrics import router as metrics
+from .backtest import router as backtest
 # All routes implemented
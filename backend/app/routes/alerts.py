@@ -9,6 +9,8 @@ from app.schemas.alert import Alert as AlertSchema, AlertCreate
 from app.services.data_fetcher import DataFetcher
 from app.services.sentiment_analysis import SentimentAnalysis
 from app.services.alert_checker import check_and_trigger_alerts
+from app.services.quote_service import quote_service
+from app.core.rate_limiter import Priority
 
 router = APIRouter()
 
@@ -120,6 +122,12 @@ async def check_alert_triggers(
 
     triggered_alerts = []
 
+    # Warm quotes for every price alert symbol in one batch
+    await quote_service.get_quotes(
+        {alert.symbol for alert in alerts if alert.alert_type in ['price_above', 'price_below']},
+        priority=Priority.BACKGROUND
+    )
+
     for alert in alerts:
         try:
             is_triggered = await check_single_alert(alert)
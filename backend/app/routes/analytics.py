@@ -1,16 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 import traceback
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.models import User, Trade
-from app.services.technical_analysis import TechnicalAnalysis
-from app.services.risk_management import RiskManagement
+from app.models import User
+from app.services.technical_analysis import (
+    TechnicalAnalysis, DEFAULT_INDICATORS, DEFAULT_INDICATOR_PARAMS, indicator_params, resolve_indicators
+)
+from app.services.risk_management import RiskManagement, risk_management
 from app.services.data_fetcher import DataFetcher
+from app.services.bar_series import BarPanel, BarSeries, format_dates
+from app.services.indicator_cache import indicator_cache
+from app.services.screener import load_universe, run_screen, validate as validate_screen, ScreenerExpressionError
+from app.services.indicator_stream import indicator_engine, TIMEFRAMES as STREAM_TIMEFRAMES
+from app.services.multi_timeframe import finest_interval, multi_timeframe_indicators
+from app.services.portfolio import portfolio_summary, realized_pnl_report
+from app.services.equity_curve import user_equity_curve
+from app.services.value_at_risk import (
+    METHODS as VAR_METHODS, MAX_CONFIDENCES as VAR_MAX_CONFIDENCES, MAX_HORIZON_DAYS as VAR_MAX_HORIZON_DAYS,
+    MAX_HORIZONS as VAR_MAX_HORIZONS, portfolio_value_at_risk,
+)
+from app.services.lot_matching import METHODS as LOT_METHODS, match_lots, user_trade_arrays
+from app.services.positions import load_positions
+from app.schemas.position import Position as PositionSchema
 
 router = APIRouter()
 
+# Upper bound on symbols per batch request
+MAX_BATCH_SYMBOLS = 100
+
+# Upper bound on symbols per panel (batch technical) request
+MAX_PANEL_SYMBOLS = 500
+
+# Upper bound on an explicit screener symbol list
+MAX_SCREENER_SYMBOLS = 5000
+
+# Indicators need this many bars to be meaningful
+MIN_INDICATOR_BARS = 50
+
+
+def _serialize_series(bars: BarSeries) -> List[Dict]:
+    """Bar series -> list of candle dicts for the frontend."""
+    return bars.to_records()
+
+
+def _json_floats(values: np.ndarray) -> List[Optional[float]]:
+    """Float array -> list with NaN as None (NaN is not valid JSON)."""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def _indicator_selection(
+    indicators: Optional[str] = Query(None, description="Comma-separated, e.g. rsi,macd,macd_signal,bollinger,atr"),
+    rsi_period: int = Query(DEFAULT_INDICATOR_PARAMS["rsi_period"], ge=2, le=500),
+    macd_fast: int = Query(DEFAULT_INDICATOR_PARAMS["macd_fast"], ge=1, le=500),
+    macd_slow: int = Query(DEFAULT_INDICATOR_PARAMS["macd_slow"], ge=2, le=500),
+    macd_signal_period: int = Query(DEFAULT_INDICATOR_PARAMS["macd_signal_period"], ge=1, le=500),
+    bb_period: int = Query(DEFAULT_INDICATOR_PARAMS["bb_period"], ge=2, le=500),
+    bb_std: float = Query(DEFAULT_INDICATOR_PARAMS["bb_std"], gt=0, le=10),
+    sma_period: int = Query(DEFAULT_INDICATOR_PARAMS["sma_period"], ge=2, le=500),
+    ema_period: int = Query(DEFAULT_INDICATOR_PARAMS["ema_period"], ge=1, le=500),
+    atr_period: int = Query(DEFAULT_INDICATOR_PARAMS["atr_period"], ge=1, le=500),
+    stoch_k_period: int = Query(DEFAULT_INDICATOR_PARAMS["stoch_k_period"], ge=1, le=500),
+    stoch_d_period: int = Query(DEFAULT_INDICATOR_PARAMS["stoch_d_period"], ge=1, le=500),
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Requested indicator outputs and the parameters they use."""
+    try:
+        outputs = resolve_indicators(indicators.split(",")) if indicators else DEFAULT_INDICATORS
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not outputs:
+        raise HTTPException(status_code=400, detail="No indicators selected.")
+    if macd_fast >= macd_slow:
+        raise HTTPException(status_code=400, detail="macd_fast must be shorter than macd_slow.")
+
+    params = indicator_params(outputs, {
+        "rsi_period": rsi_period,
+        "macd_fast": macd_fast,
+        "macd_slow": macd_slow,
+        "macd_signal_period": macd_signal_period,
+        "bb_period": bb_period,
+        "bb_std": bb_std,
+        "sma_period": sma_period,
+        "ema_period": ema_period,
+        "atr_period": atr_period,
+        "stoch_k_period": stoch_k_period,
+        "stoch_d_period": stoch_d_period,
+    })
+    return outputs, params
+
+
+def _parse_symbols(symbols: str, limit: int) -> List[str]:
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols provided.")
+    if len(symbol_list) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} symbols per request.")
+    return symbol_list
+
 
 # -------------------------------------------------------------------
 # PORTFOLIO SUMMARY
@@ -20,49 +108,151 @@ async def get_portfolio_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    trades = db.query(Trade).filter(Trade.user_id == current_user.id).all()
+    """
+    Trade count, traded value, realized PnL and win rate by symbol, read
+    from the positions projection (one row per symbol).
+    """
+    return portfolio_summary(load_positions(db, current_user.id))
 
-    if not trades:
-        return {
-            "total_trades": 0,
-            "total_value": 0,
-            "win_rate": 0,
-            "total_pnl": 0,
-            "sharpe_ratio": 0
-        }
 
-    total_value = sum(trade.quantity * trade.price for trade in trades)
-    total_trades = len(trades)
+@router.get("/positions", response_model=List[PositionSchema])
+async def get_positions(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Open quantity, cost basis and realized PnL per traded symbol."""
+    return load_positions(db, current_user.id)
+
+
+@router.get("/realized-pnl")
+async def get_realized_pnl(
+    method: str = Query("fifo", description=f"Lot matching: {', '.join(LOT_METHODS)}"),
+    recent_lots: int = Query(100, ge=0, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Realized PnL by matching buys against sells lot by lot (FIFO, LIFO or
+    average cost), with holding periods and the win rate per round trip.
+    """
+    if method not in LOT_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown method '{method}'. Available: {', '.join(LOT_METHODS)}")
+
+    try:
+        match = match_lots(user_trade_arrays(db, current_user.id), method)
+        return realized_pnl_report(match, recent_lots)
+
+    except Exception as e:
+        print("❌ REALIZED PNL ERROR:", e)
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Realized PnL calculation failed.")
+
+
+# -------------------------------------------------------------------
+# TECHNICAL ANALYSIS (BATCH)
+# -------------------------------------------------------------------
+@router.get("/technical")
+async def get_technical_analysis_batch(
+    symbols: str,
+    resolution: str = "D",
+    days: int = 90,
+    full: bool = False,
+    selection: Tuple[List[str], Dict[str, Any]] = Depends(_indicator_selection),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Indicators for a whole watchlist in one vectorized pass:
+    ?symbols=AAPL,MSFT,TSLA&indicators=rsi,atr
+
+    Returns each symbol's latest values, or its full arrays with full=true.
+    """
+    outputs, params = selection
+    symbol_list = _parse_symbols(symbols, MAX_PANEL_SYMBOLS)
+
+    try:
+        fetcher = DataFetcher()
+        result = await fetcher.get_bar_series_batch(symbol_list, resolution=resolution, days=days)
+
+        errors = dict(result["errors"])
+        series = {}
+        for symbol, bars in result["series"].items():
+            if len(bars) < MIN_INDICATOR_BARS:
+                errors[symbol] = f"Not enough OHLC data (need {MIN_INDICATOR_BARS}+ candles)"
+            else:
+                series[symbol] = bars
+
+        panel = BarPanel.from_series(series, interval=fetcher.INTERVAL_MAP.get(resolution, "1d"))
+        indicators = TechnicalAnalysis().calculate_panel_indicators(panel, outputs, params)
+
+        results = {}
+        for j, symbol in enumerate(panel.symbols):
+            rows = np.flatnonzero(~np.isnan(panel.close[:, j]))
+            if not full:
+                rows = rows[-1:]
+            result = {
+                "date": format_dates(panel.ts[rows], panel.tz),
+                **{name: _json_floats(values[rows, j]) for name, values in indicators.items()},
+            }
+            results[symbol] = result if full else {key: values[0] for key, values in result.items()}
+
+        return {"results": results, "errors": errors}
 
-    pnl = 0
-    winning_trades = 0
+    except Exception as e:
+        print("❌ ERROR /technical batch:", e)
+        raise HTTPException(status_code=500, detail="Technical indicator calculation failed.")
 
-    symbol_trades = {}
-    for trade in trades:
-        symbol_trades.setdefault(trade.symbol, []).append(trade)
 
-    for symbol, s_trades in symbol_trades.items():
-        buys = [t for t in s_trades if t.trade_type == "buy"]
-        sells = [t for t in s_trades if t.trade_type == "sell"]
+# -------------------------------------------------------------------
+# SCREENER
+# -------------------------------------------------------------------
+@router.get("/screener")
+async def screen_universe(
+    expression: str,
+    symbols: Optional[str] = None,
+    rank_by: Optional[str] = None,
+    descending: bool = False,
+    resolution: str = "D",
+    days: int = 180,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Symbols whose latest bar matches `expression`, e.g.
+    ?expression=rsi < 30 and close > sma&rank_by=rsi
+
+    Scans the configured universe unless `symbols` is given.
+    """
+    try:
+        validate_screen(expression, rank_by)
+    except ScreenerExpressionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        if buys and sells:
-            avg_buy = sum(t.price for t in buys) / len(buys)
-            avg_sell = sum(t.price for t in sells) / len(sells)
-            qty = min(sum(t.quantity for t in buys), sum(t.quantity for t in sells))
-            symbol_pnl = (avg_sell - avg_buy) * qty
-            pnl += symbol_pnl
-            if symbol_pnl > 0:
-                winning_trades += 1
+    universe = _parse_symbols(symbols, MAX_SCREENER_SYMBOLS) if symbols else load_universe()
+    if not universe:
+        raise HTTPException(status_code=400, detail="No screener universe configured; pass symbols=...")
 
-    win_rate = (winning_trades / len(symbol_trades)) * 100 if symbol_trades else 0
-    sharpe_ratio = pnl / total_value if total_value > 0 else 0
+    try:
+        fetcher = DataFetcher()
+        result = await fetcher.get_bar_series_batch(universe, resolution=resolution, days=days)
+        matches = await run_screen(result["series"], expression, rank_by=rank_by, descending=descending)
 
+    except Exception as e:
+        print("❌ ERROR /screener:", e)
+        raise HTTPException(status_code=500, detail="Screener failed.")
+
+    start = (page - 1) * page_size
     return {
-        "total_trades": total_trades,
-        "total_value": round(total_value, 2),
-        "win_rate": round(win_rate, 2),
-        "total_pnl": round(pnl, 2),
-        "sharpe_ratio": round(sharpe_ratio, 4)
+        "expression": expression,
+        "universe": len(universe),
+        "scanned": len(result["series"]),
+        "total": len(matches),
+        "page": page,
+        "page_size": page_size,
+        "matches": matches[start:start + page_size],
+        "errors": result["errors"],
     }
 
 
@@ -72,12 +262,21 @@ async def get_portfolio_summary(
 @router.get("/technical/{symbol}")
 async def get_technical_analysis(
     symbol: str,
+    resolution: str = "D",
+    days: int = 90,
+    selection: Tuple[List[str], Dict[str, Any]] = Depends(_indicator_selection),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get technical indicators using Finnhub OHLC data.
+
+    ?indicators= picks what to compute (default rsi, macd, macd_signal,
+    bollinger_upper, bollinger_lower, sma, ema; also bollinger_middle,
+    macd_histogram, atr, vwap, obv, stoch_k, stoch_d, or the groups
+    "bollinger" and "stochastic"), with periods such as rsi_period=7.
     """
+    outputs, params = selection
     try:
         fetcher = DataFetcher()
         ta = TechnicalAnalysis()
@@ -86,53 +285,34 @@ async def get_technical_analysis(
         symbol = symbol.upper().strip()
 
 
-        df = await fetcher.get_ohlcv_series(symbol, resolution="D", days=90)
-
+        bars = await fetcher.get_bar_series(symbol, resolution=resolution, days=days)
 
-        # FIX: df.empty is unreliable → use len(df)
-        if df is None or len(df) == 0:
-            print("⚠ TECH: DF EMPTY OR NONE")
+        if len(bars) == 0:
+            print("⚠ TECH: NO BARS")
             raise HTTPException(status_code=404, detail="No OHLC data available.")
 
-
-        # Rename columns to match TechnicalAnalysis expectations
-        df = df.rename(columns={
-            "open": "Open",
-            "high": "High",
-            "low": "Low",
-            "close": "Close",
-            "volume": "Volume",
-            "date": "Date",
-        })
-
-        df["Date"] = df["Date"].astype(str)
-
-        # Check required columns
-        for col in ["Open", "High", "Low", "Close"]:
-            if col not in df.columns:
-                raise Exception(f"Missing column: {col}")
-
         # Minimum candles required
-        if len(df) < 50:
+        if len(bars) < MIN_INDICATOR_BARS:
             raise Exception("Not enough OHLC data (need 50+ candles)")
 
-        indicators = ta.calculate_indicators(df)
+        # Unchanged bars (same last bar and content) reuse the arrays computed last time
+        indicators = indicator_cache.get_or_compute(
+            bars,
+            {"indicators": tuple(outputs), **params},
+            lambda: ta.calculate_bar_indicators(bars, outputs, params)
+        )
 
         # Return full arrays for frontend to use
         return {
             "symbol": symbol,
             "indicators": {
-                "date": indicators["Date"].tolist(),
-                "rsi": indicators["rsi"].tolist(),
-                "macd": indicators["macd"].tolist(),
-                "macd_signal": indicators["macd_signal"].tolist(),
-                "bollinger_upper": indicators["bollinger_upper"].tolist(),
-                "bollinger_lower": indicators["bollinger_lower"].tolist(),
-                "sma": indicators.get("sma", []).tolist() if "sma" in indicators else [],
-                "ema": indicators.get("ema", []).tolist() if "ema" in indicators else [],
+                "date": bars.date_strings(),
+                **{name: _json_floats(values) for name, values in indicators.items()},
             }
         }
 
+    except HTTPException:
+        raise
     except Exception:
         import traceback
         print("\n\n❌ TECHNICAL / TRACEBACK ❌")
@@ -144,50 +324,131 @@ async def get_technical_analysis(
 
 
 # -------------------------------------------------------------------
-# RISK METRICS
+# MULTI-TIMEFRAME ANALYSIS (one fetch, resampled locally)
 # -------------------------------------------------------------------
-@router.get("/risk-metrics")
-async def get_risk_metrics(
+@router.get("/technical/{symbol}/timeframes")
+async def get_multi_timeframe_analysis(
+    symbol: str,
+    timeframes: str = Query("D,W,M", description="Comma-separated resolutions, e.g. D,W,M or 5,15,60"),
+    days: int = Query(365 * 3, ge=1, le=365 * 30),
+    selection: Tuple[List[str], Dict[str, Any]] = Depends(_indicator_selection),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    """
+    Indicators on several timeframes at once, aligned on the finest one's
+    timeline: ?timeframes=D,W,M&indicators=rsi,macd
+
+    Only the finest resolution is fetched; coarser bars are resampled from
+    it. On each date a timeframe shows the values of its latest closed bar
+    (`date` within each timeframe is that bar's label).
+    """
+    outputs, params = selection
+    resolutions = list(dict.fromkeys(t.strip().upper() for t in timeframes.split(",") if t.strip()))
+    unknown = [r for r in resolutions if r not in DataFetcher.INTERVAL_MAP]
+    if not resolutions or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown timeframe(s) {', '.join(unknown) or '(none)'}. Available: {', '.join(DataFetcher.INTERVAL_MAP)}",
+        )
+
+    intervals = [DataFetcher.INTERVAL_MAP[r] for r in resolutions]
+    base = resolutions[intervals.index(finest_interval(intervals))]
+    symbol = symbol.upper().strip()
+
     try:
-        trades = db.query(Trade).filter(Trade.user_id == current_user.id).all()
-
-        if not trades:
-            return {
-                "max_drawdown": 0,
-                "sharpe_ratio": 0,
-                "volatility": 0,
-                "var_95": 0
+        bars = await DataFetcher().get_bar_series(symbol, resolution=base, days=days)
+        if len(bars) == 0:
+            raise HTTPException(status_code=404, detail="No OHLC data available.")
+        if len(bars) < MIN_INDICATOR_BARS:
+            raise HTTPException(status_code=400, detail=f"Not enough OHLC data (need {MIN_INDICATOR_BARS}+ candles)")
+
+        # Cached flat as "<interval>:<output>" so unchanged bars skip resampling too
+        flat = indicator_cache.get_or_compute(
+            bars,
+            {"timeframes": tuple(intervals), "indicators": tuple(outputs), **params},
+            lambda: {
+                f"{interval}:{name}": values
+                for interval, computed in multi_timeframe_indicators(bars, intervals, outputs, params).items()
+                for name, values in computed.items()
+            }
+        )
+
+        aligned = {}
+        for resolution, interval in zip(resolutions, intervals):
+            label_ts = flat[f"{interval}:ts"]
+            have = label_ts >= 0
+            dates = np.full(len(label_ts), None, dtype=object)
+            dates[have] = format_dates(label_ts[have], bars.tz)
+            aligned[resolution] = {
+                "date": dates.tolist(),
+                **{name: _json_floats(flat[f"{interval}:{name}"]) for name in outputs},
             }
 
-        # Simple risk calculations
-        pnls = []
-        cumulative = 0
-        peak = 0
-        max_drawdown = 0
+        return {
+            "symbol": symbol,
+            "base": base,
+            "timeframes": resolutions,
+            "date": bars.date_strings(),
+            "indicators": aligned,
+            "latest": {
+                resolution: {key: values[-1] for key, values in series.items()}
+                for resolution, series in aligned.items()
+            },
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print("❌ ERROR /technical timeframes:", e)
+        raise HTTPException(status_code=500, detail="Multi-timeframe calculation failed.")
 
-        for trade in trades:
-            pnl = trade.quantity * trade.price * (1 if trade.trade_type == "sell" else -1)
-            cumulative += pnl
-            pnls.append(cumulative)
 
-            if cumulative > peak:
-                peak = cumulative
-            drawdown = peak - cumulative
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+# -------------------------------------------------------------------
+# LIVE INDICATORS (streamed state, no recomputation)
+# -------------------------------------------------------------------
+@router.get("/technical/{symbol}/live")
+async def get_live_indicators(
+    symbol: str,
+    resolution: str = "D",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Latest RSI / EMA / MACD / SMA / Bollinger values, kept current by the
+    price stream. Only the forming bar's values are returned.
+    """
+    interval = DataFetcher.INTERVAL_MAP.get(resolution)
+    if interval not in STREAM_TIMEFRAMES:
+        raise HTTPException(status_code=400, detail="Live indicators support resolutions 1, 5, 15, 30, 60 and D.")
 
-        volatility = sum(p**2 for p in pnls) / len(pnls) if pnls else 0
-        sharpe_ratio = sum(pnls) / len(pnls) / volatility if volatility > 0 else 0
-        var_95 = sorted(pnls)[int(len(pnls) * 0.05)] if pnls else 0
+    state = await indicator_engine.get(symbol, interval)
+    if state.close is None:
+        raise HTTPException(status_code=404, detail="No OHLC data available.")
 
+    return state.snapshot()
+
+
+# -------------------------------------------------------------------
+# RISK METRICS
+# -------------------------------------------------------------------
+@router.get("/risk-metrics")
+async def get_risk_metrics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Drawdown, Sharpe, volatility and VaR of the daily mark-to-market
+    equity curve, plus total PnL and gross exposure at the last close.
+    """
+    try:
+        curve = await user_equity_curve(db, current_user.id)
+        metrics = risk_management.calculate_risk_metrics(curve["returns"])
         return {
-            "max_drawdown": round(max_drawdown, 2),
-            "sharpe_ratio": round(sharpe_ratio, 4),
-            "volatility": round(volatility, 4),
-            "var_95": round(var_95, 2)
+            **metrics,
+            "total_pnl": round(float(curve["equity"][-1]), 2) if len(curve["ts"]) else 0,
+            "open_exposure": round(float(curve["gross_exposure"][-1]), 2) if len(curve["ts"]) else 0,
+            "days": len(curve["ts"]),
         }
 
     except Exception as e:
@@ -195,6 +456,95 @@ async def get_risk_metrics(
         raise HTTPException(status_code=500, detail="Risk metrics calculation failed.")
 
 
+@router.get("/var")
+async def get_value_at_risk(
+    confidence: str = Query("0.95,0.99", description=f"Up to {VAR_MAX_CONFIDENCES} comma-separated confidence levels in [0.5, 1)"),
+    horizons: str = Query("1,10", description=f"Up to {VAR_MAX_HORIZONS} comma-separated horizons of 1-{VAR_MAX_HORIZON_DAYS} trading days"),
+    methods: Optional[str] = Query(None, description=f"Comma-separated subset of {', '.join(VAR_METHODS)}"),
+    paths: int = Query(100_000, ge=1_000, le=1_000_000),
+    seed: Optional[int] = Query(None, description="Fix the Monte Carlo draws"),
+    lookback_days: int = Query(730, ge=30, le=3650),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Historical, parametric and Monte Carlo VaR and CVaR of the open
+    positions at each confidence level and horizon, as losses in currency.
+    """
+    try:
+        levels = list(dict.fromkeys(float(c) for c in confidence.split(",") if c.strip()))
+        days = list(dict.fromkeys(int(h) for h in horizons.split(",") if h.strip()))
+        chosen = [m.strip() for m in methods.split(",") if m.strip()] if methods else list(VAR_METHODS)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="confidence and horizons must be comma-separated numbers")
+
+    try:
+        return await portfolio_value_at_risk(db, current_user.id, levels, days, chosen, paths, seed, lookback_days)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print("❌ VAR ERROR:", e)
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="VaR calculation failed.")
+
+
+@router.get("/equity-curve")
+async def get_equity_curve(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Daily PnL (cash plus market value), market value, gross exposure and returns."""
+    try:
+        curve = await user_equity_curve(db, current_user.id)
+        return {
+            "dates": format_dates(curve["ts"]),
+            "equity": np.round(curve["equity"], 2).tolist(),
+            "market_value": np.round(curve["market_value"], 2).tolist(),
+            "gross_exposure": np.round(curve["gross_exposure"], 2).tolist(),
+            # Return into each day; none for the first
+            "returns": [None] + np.round(curve["returns"], 6).tolist() if len(curve["ts"]) else [],
+        }
+
+    except Exception as e:
+        print("❌ EQUITY CURVE ERROR:", e)
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Equity curve calculation failed.")
+
+
+# -------------------------------------------------------------------
+# OHLCV SERIES (BATCH)
+# -------------------------------------------------------------------
+@router.get("/series")
+async def get_candle_series_batch(
+    symbols: str,
+    resolution: str = "D",
+    days: int = 180,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Load a whole watchlist in one request: ?symbols=AAPL,MSFT,TSLA
+    """
+    symbol_list = _parse_symbols(symbols, MAX_BATCH_SYMBOLS)
+
+    try:
+        fetcher = DataFetcher()
+        result = await fetcher.get_bar_series_batch(symbol_list, resolution=resolution, days=days)
+
+        return {
+            "series": {
+                symbol: _serialize_series(bars)
+                for symbol, bars in result["series"].items()
+            },
+            "errors": result["errors"],
+        }
+
+    except Exception as e:
+        print("❌ ERROR /series batch:", e)
+        raise HTTPException(status_code=500, detail=f"Error fetching OHLCV batch: {str(e)}")
+
+
 # -------------------------------------------------------------------
 # OHLCV SERIES
 # -------------------------------------------------------------------
@@ -202,29 +552,18 @@ async def get_risk_metrics(
 async def get_candle_series(
     symbol: str,
     resolution: str = "D",
+    days: int = 180,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     try:
         fetcher = DataFetcher()
-        df = await fetcher. get_ohlcv_series(symbol)
+        bars = await fetcher.get_bar_series(symbol, resolution=resolution, days=days)
 
-        if df is None or df.empty:
+        if len(bars) == 0:
             return {"symbol": symbol, "series": []}
 
-        df["date"] = df["date"].astype(str)
-
-        series = [
-            {
-                "date": row["date"],
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": float(row["volume"]),
-            }
-            for _, row in df.iterrows()
-        ]
+        series = _serialize_series(bars)
 
         return {"symbol": symbol, "series": series}
 
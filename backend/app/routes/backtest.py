@@ -0,0 +1,158 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.models import User
+from app.schemas.backtest import BacktestRequest, SweepRequest
+from app.services.backtester import STRATEGIES, run_backtest, strategy_params
+from app.services.data_fetcher import DataFetcher
+from app.services.sweeps import SweepError, SweepJob, build_candidates, sweep_jobs
+
+router = APIRouter()
+
+
+# -------------------------------------------------------------------
+# STRATEGIES
+# -------------------------------------------------------------------
+@router.get("/strategies")
+async def list_strategies(current_user: User = Depends(get_current_user)):
+    """Available rule-based strategies, what they do and their default parameters."""
+    return {
+        name: {"description": fn.__doc__, "params": defaults}
+        for name, (fn, defaults) in STRATEGIES.items()
+    }
+
+
+# -------------------------------------------------------------------
+# SINGLE BACKTEST
+# -------------------------------------------------------------------
+@router.post("/run")
+async def run_single_backtest(
+    request: BacktestRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Backtest one strategy over cached bars: equity curve, trade list,
+    Sharpe, drawdown and win rate.
+    """
+    try:
+        strategy_params(request.strategy, request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    symbol = request.symbol.upper().strip()
+    bars = await DataFetcher().get_bar_series(symbol, resolution=request.resolution, days=request.days)
+    if len(bars) < 2:
+        raise HTTPException(status_code=404, detail="No OHLC data available.")
+
+    try:
+        result = run_backtest(
+            bars,
+            request.strategy,
+            request.params,
+            allow_short=request.allow_short,
+            fee_bps=request.fee_bps,
+            slippage_bps=request.slippage_bps,
+            initial_capital=request.initial_capital,
+            include_curve=request.include_curve,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"symbol": symbol, "resolution": request.resolution, **result}
+
+
+# -------------------------------------------------------------------
+# PARAMETER SWEEPS
+# -------------------------------------------------------------------
+def _owned_job(job_id: str, current_user: User) -> SweepJob:
+    job = sweep_jobs.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Sweep not found.")
+    return job
+
+
+@router.post("/sweeps", status_code=202)
+async def submit_sweep(
+    request: SweepRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a grid or random parameter sweep of one strategy across symbols,
+    optionally walk-forward (best in-sample params scored out of sample).
+    Poll GET /sweeps/{id} or stream GET /sweeps/{id}/stream for results.
+    """
+    try:
+        candidates = build_candidates(request.strategy, request.space, request.mode, request.samples, request.seed)
+    except (SweepError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid parameter space: {e}")
+
+    symbols = list(dict.fromkeys(s.upper().strip() for s in request.symbols if s.strip()))
+    evaluations = len(candidates) * len(symbols)
+    if not candidates or not symbols:
+        raise HTTPException(status_code=400, detail="Nothing to sweep.")
+    if evaluations > settings.sweep_max_evaluations:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{evaluations} evaluations exceeds the limit of {settings.sweep_max_evaluations}.",
+        )
+
+    async def fetch(symbols):
+        return await DataFetcher().get_bar_series_batch(symbols, resolution=request.resolution, days=request.days)
+
+    spec = request.model_dump(exclude={"symbols", "space", "samples", "seed"})
+    job = sweep_jobs.submit(SweepJob(current_user.id, spec, candidates, symbols), fetch)
+    return job.progress()
+
+
+@router.get("/sweeps/{job_id}")
+async def get_sweep(
+    job_id: str,
+    since: int = Query(0, ge=0, description="Return results after this many already seen"),
+    top: int = Query(10, ge=0, le=100),
+    current_user: User = Depends(get_current_user)
+):
+    """Progress, results added since `since`, and the best results so far."""
+    job = _owned_job(job_id, current_user)
+    return {
+        **job.progress(),
+        "since": since,
+        "results": job.results[since:],
+        "best": job.best(top),
+    }
+
+
+@router.get("/sweeps/{job_id}/stream")
+async def stream_sweep(
+    job_id: str,
+    since: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Newline-delimited JSON: one line per result as chunks finish, then a
+    final line with the job's progress once it ends.
+    """
+    job = _owned_job(job_id, current_user)
+
+    async def lines():
+        seen = since
+        while True:
+            await job.wait(seen)
+            for row in job.results[seen:]:
+                yield json.dumps({"type": "result", **row}) + "\n"
+            seen = len(job.results)
+            if job.done and seen == len(job.results):
+                yield json.dumps({"type": "end", **job.progress()}) + "\n"
+                return
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.delete("/sweeps/{job_id}")
+async def cancel_sweep(job_id: str, current_user: User = Depends(get_current_user)):
+    """Cancel a running sweep; results so far are kept."""
+    job = _owned_job(job_id, current_user)
+    sweep_jobs.cancel(job)
+    return job.progress()
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends
+from app.core.security import get_current_user
+from app.core.executor import provider_executor, cpu_pool
+from app.core.http import http_clients
+from app.core.rate_limiter import rate_limiter
+from app.models import User
+from app.services.ohlcv_cache import ohlcv_cache
+from app.services.data_fetcher import market_data_flights
+from app.services.quote_service import quote_service
+from app.services.indicator_stream import indicator_engine
+from app.services.indicator_cache import indicator_cache
+
+router = APIRouter()
+
+
+# -------------------------------------------------------------------
+# CACHE STATS
+# -------------------------------------------------------------------
+@router.get("/cache")
+async def get_cache_metrics(current_user: User = Depends(get_current_user)):
+    """Hit/miss/eviction counters for the market data caches."""
+    return {
+        "ohlcv": ohlcv_cache.stats(),
+        "quotes": quote_service.stats(),
+        "live_indicators": indicator_engine.stats(),
+        "indicators": indicator_cache.stats(),
+    }
+
+
+# -------------------------------------------------------------------
+# EXECUTOR STATS
+# -------------------------------------------------------------------
+@router.get("/executor")
+async def get_executor_metrics(current_user: User = Depends(get_current_user)):
+    """Queue depth and wait times of the blocking provider pool."""
+    return {
+        "provider": provider_executor.stats(),
+        "cpu": cpu_pool.stats(),
+    }
+
+
+# -------------------------------------------------------------------
+# REQUEST COALESCING
+# -------------------------------------------------------------------
+@router.get("/inflight")
+async def get_inflight_metrics(current_user: User = Depends(get_current_user)):
+    """How many market data requests were served by a shared in-flight fetch."""
+    return {
+        "market_data": market_data_flights.stats(),
+    }
+
+
+# -------------------------------------------------------------------
+# HTTP CLIENT POOLS
+# -------------------------------------------------------------------
+@router.get("/http")
+async def get_http_metrics(current_user: User = Depends(get_current_user)):
+    """Request counts and connection pool usage per upstream."""
+    return http_clients.stats()
+
+
+# -------------------------------------------------------------------
+# UPSTREAM RATE LIMITS
+# -------------------------------------------------------------------
+@router.get("/rate-limits")
+async def get_rate_limit_metrics(current_user: User = Depends(get_current_user)):
+    """Queue depth, wait times and rejections per upstream quota."""
+    return rate_limiter.stats()
@@ -1,11 +1,27 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect , Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect , Depends, HTTPException
 from app.services.price_stream import stream_prices
+from app.services.quote_service import quote_service
 from app.services.alert_checker import check_and_trigger_alerts
 from app.core.database import get_db
+from app.core.security import get_current_user
+from app.models import User
+from app.routes.analytics import MAX_BATCH_SYMBOLS, _parse_symbols
 import asyncio
 
 router = APIRouter()
 
+@router.get("/quotes")
+async def get_quotes(
+    symbols: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Latest prices for many symbols at once: ?symbols=AAPL,MSFT
+    """
+    symbol_list = _parse_symbols(symbols, MAX_BATCH_SYMBOLS)
+
+    return {"quotes": await quote_service.get_quotes(symbol_list)}
+
 @router.websocket("/ws/prices")
 async def websocket_prices(websocket: WebSocket, db=Depends(get_db)):
     await websocket.accept()
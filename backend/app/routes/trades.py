@@ -7,6 +7,8 @@ from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models import User, Trade
 from app.schemas.trade import Trade as TradeSchema, TradeCreate
+from app.services.positions import record_trades, recompute_symbols
+from app.services.equity_curve import equity_curves
 import structlog
 
 router = APIRouter()
@@ -30,7 +32,9 @@ async def create_trade(
         notes=trade.notes
     )
     db.add(db_trade)
+    record_trades(db, current_user.id, [db_trade])
     db.commit()
+    equity_curves.invalidate(current_user.id)
     db.refresh(db_trade)
     return db_trade
 
@@ -69,10 +73,16 @@ async def update_trade(
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
 
+    old_symbol = trade.symbol
     for field, value in trade_update.dict().items():
         setattr(trade, field, value)
+    # Stored the same way as on create, so positions key on one symbol
+    trade.symbol = trade.symbol.upper()
+    trade.trade_type = trade.trade_type.lower()
 
+    recompute_symbols(db, current_user.id, {old_symbol, trade.symbol})
     db.commit()
+    equity_curves.invalidate(current_user.id)
     db.refresh(trade)
     return trade
 
@@ -88,7 +98,9 @@ async def delete_trade(
         raise HTTPException(status_code=404, detail="Trade not found")
 
     db.delete(trade)
+    recompute_symbols(db, current_user.id, {trade.symbol})
     db.commit()
+    equity_curves.invalidate(current_user.id)
     return {"message": "Trade deleted successfully"}
 
 @router.post("/upload-csv")
@@ -135,9 +147,11 @@ async def upload_csv(
             except (ValueError, TypeError) as e:
                 raise HTTPException(status_code=400, detail=f"Error at row {index+1}: {str(e)}")
 
-        # Bulk insert using transaction
+        # Bulk insert using transaction, positions included
         db.add_all(trades_to_insert)
+        record_trades(db, current_user.id, trades_to_insert)
         db.commit()
+        equity_curves.invalidate(current_user.id)
 
         logger.info("CSV upload successful", user_id=current_user.id, trades_inserted=len(trades_to_insert))
         return {"message": f"Successfully uploaded {len(trades_to_insert)} trades"}
@@ -1,4 +1,6 @@
 from .user import User, UserCreate, Token, TokenData
 from .trade import Trade, TradeCreate
 from .alert import Alert, AlertCreate
+from .position import Position
+from .backtest import BacktestRequest, SweepRequest, WalkForward
 # Import other schemas here as they are created
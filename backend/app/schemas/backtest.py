@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+class BacktestRequest(BaseModel):
+    symbol: str
+    strategy: str  # 'rsi', 'macd_cross', 'ema_cross', 'bollinger'
+    params: Dict[str, float] = {}  # e.g. {"period": 14, "lower": 30, "upper": 70}
+    resolution: str = "D"
+    days: int = Field(365 * 5, ge=30, le=365 * 30)
+    allow_short: bool = False
+    fee_bps: float = Field(1.0, ge=0)
+    slippage_bps: float = Field(2.0, ge=0)
+    initial_capital: float = Field(10_000.0, gt=0)
+    include_curve: bool = True
+
+class WalkForward(BaseModel):
+    train_bars: int = Field(..., ge=20)
+    test_bars: int = Field(..., ge=5)
+    step_bars: Optional[int] = Field(None, ge=1)  # defaults to test_bars
+
+class SweepRequest(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=500)
+    strategy: str
+    # name -> list of values, or {"min", "max"} (+ "step" for grids)
+    space: Dict[str, Any]  # e.g. {"period": {"min": 5, "max": 30, "step": 5}, "lower": [20, 25, 30]}
+    mode: Literal["grid", "random"] = "grid"
+    samples: int = Field(100, ge=1, le=10_000)  # random mode only
+    seed: Optional[int] = None
+    objective: Literal["sharpe_ratio", "total_return", "cagr", "max_drawdown"] = "sharpe_ratio"
+    walk_forward: Optional[WalkForward] = None
+    resolution: str = "D"
+    days: int = Field(365 * 5, ge=30, le=365 * 30)
+    allow_short: bool = False
+    fee_bps: float = Field(1.0, ge=0)
+    slippage_bps: float = Field(2.0, ge=0)
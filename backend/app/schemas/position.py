@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class Position(BaseModel):
+    symbol: str
+    quantity: float  # negative when short
+    cost_basis: float
+    average_cost: Optional[float] = None  # None when flat
+    realized_pnl: float
+    trade_count: int
+    traded_value: float
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
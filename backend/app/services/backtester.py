@@ -0,0 +1,303 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.bar_series import BarSeries, format_dates
+from app.services.risk_management import RiskManagement
+from app.services.technical_analysis import bollinger, ema, macd, rsi
+
+YEAR_NS = 365.25 * 86_400 * 10**9
+
+
+# ------------------------------------------------------------
+# SIGNAL -> POSITION HELPERS
+# ------------------------------------------------------------
+def _ffill(events: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value forward; 0 before the first one."""
+    rows = np.where(np.isnan(events), 0, np.arange(len(events)))
+    filled = events[np.maximum.accumulate(rows)] if len(events) else events
+    return np.nan_to_num(filled)
+
+
+def _hold(enter: np.ndarray, exit: np.ndarray, side: float) -> np.ndarray:
+    """`side` from each `enter` bar until the next `exit` bar, flat otherwise."""
+    events = np.full(len(enter), np.nan)
+    events[exit] = 0.0
+    events[enter] = side
+    return _ffill(events)
+
+
+def _legs(
+    long_enter: np.ndarray,
+    long_exit: np.ndarray,
+    short_enter: np.ndarray,
+    short_exit: np.ndarray,
+    allow_short: bool
+) -> np.ndarray:
+    target = _hold(long_enter, long_exit, 1.0)
+    if allow_short:
+        target += _hold(short_enter, short_exit, -1.0)
+    return target
+
+
+# ------------------------------------------------------------
+# STRATEGIES
+# Each maps bars + params to the target position (-1, 0, 1)
+# held after each bar's close.
+# ------------------------------------------------------------
+def rsi_strategy(bars: BarSeries, params: Dict[str, float], allow_short: bool) -> np.ndarray:
+    """Long below `lower` until above `upper` (short the reverse)."""
+    values = rsi(bars.close, int(params["period"]))
+    with np.errstate(invalid="ignore"):
+        oversold, overbought = values < params["lower"], values > params["upper"]
+    return _legs(oversold, overbought, overbought, oversold, allow_short)
+
+
+def macd_cross_strategy(bars: BarSeries, params: Dict[str, float], allow_short: bool) -> np.ndarray:
+    """Long from a bullish MACD/signal cross to the next bearish one (short the reverse)."""
+    line, signal, _ = macd(bars.close, int(params["fast"]), int(params["slow"]), int(params["signal"]))
+    with np.errstate(invalid="ignore"):
+        above = line > signal
+    crossed_up = np.zeros(len(above), dtype=bool)
+    crossed_down = np.zeros(len(above), dtype=bool)
+    crossed_up[1:] = above[1:] & ~above[:-1] & ~np.isnan(signal[:-1])
+    crossed_down[1:] = ~above[1:] & above[:-1] & ~np.isnan(signal[1:])
+    return _legs(crossed_up, crossed_down, crossed_down, crossed_up, allow_short)
+
+
+def ema_cross_strategy(bars: BarSeries, params: Dict[str, float], allow_short: bool) -> np.ndarray:
+    """Long while the fast EMA is above the slow EMA (short while below)."""
+    fast, slow = ema(bars.close, int(params["fast"])), ema(bars.close, int(params["slow"]))
+    with np.errstate(invalid="ignore"):
+        above, below = fast > slow, fast < slow
+    return _legs(above, below, below, above, allow_short)
+
+
+def bollinger_strategy(bars: BarSeries, params: Dict[str, float], allow_short: bool) -> np.ndarray:
+    """Mean reversion: long below the lower band until back at the middle (short above the upper)."""
+    upper, middle, lower = bollinger(bars.close, int(params["period"]), params["std"])
+    close = bars.close
+    with np.errstate(invalid="ignore"):
+        return _legs(close < lower, close >= middle, close > upper, close <= middle, allow_short)
+
+
+# name -> (signal function, default parameters)
+STRATEGIES: Dict[str, Tuple[Callable[[BarSeries, Dict[str, float], bool], np.ndarray], Dict[str, float]]] = {
+    "rsi": (rsi_strategy, {"period": 14, "lower": 30, "upper": 70}),
+    "macd_cross": (macd_cross_strategy, {"fast": 12, "slow": 26, "signal": 9}),
+    "ema_cross": (ema_cross_strategy, {"fast": 20, "slow": 50}),
+    "bollinger": (bollinger_strategy, {"period": 20, "std": 2.0}),
+}
+
+
+# name -> window parameters (whole bar counts) and the fewest bars each
+# needs; a rolling sample std needs two
+WINDOWS: Dict[str, Dict[str, int]] = {
+    "rsi": {"period": 1},
+    "macd_cross": {"fast": 1, "slow": 1, "signal": 1},
+    "ema_cross": {"fast": 1, "slow": 1},
+    "bollinger": {"period": 2},
+}
+
+
+class ParameterConflict(ValueError):
+    """Parameters valid one by one that do not work together (fast >= slow, lower >= upper)."""
+
+
+def strategy_params(strategy: str, params: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    Defaults overridden by `params`. ValueError for unknown strategies or
+    parameters and bad values; ParameterConflict (a ValueError) when
+    otherwise valid values contradict each other.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Available: {', '.join(STRATEGIES)}")
+    defaults = STRATEGIES[strategy][1]
+    unknown = set(params or {}) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown {strategy} parameter(s) {', '.join(sorted(unknown))}. Available: {', '.join(defaults)}")
+    merged = {**defaults, **(params or {})}
+
+    for name, least in WINDOWS[strategy].items():
+        value = merged[name]
+        if not value >= least or not float(value).is_integer():
+            raise ValueError(f"{strategy} '{name}' must be a whole number >= {least}, got {value}")
+    if strategy == "rsi":
+        for name in ("lower", "upper"):
+            if not 0 <= merged[name] <= 100:
+                raise ValueError(f"rsi '{name}' must be between 0 and 100, got {merged[name]}")
+    if strategy == "bollinger" and not 0 < merged["std"] < float("inf"):
+        raise ValueError(f"bollinger 'std' must be a positive number, got {merged['std']}")
+
+    if "fast" in merged and merged["fast"] >= merged["slow"]:
+        raise ParameterConflict(f"{strategy} 'fast' must be less than 'slow', got {merged['fast']} >= {merged['slow']}")
+    if strategy == "rsi" and merged["lower"] >= merged["upper"]:
+        raise ParameterConflict(f"rsi 'lower' must be less than 'upper', got {merged['lower']} >= {merged['upper']}")
+    return merged
+
+
+def strategy_positions(bars: BarSeries, strategy: str, params: Optional[Dict[str, float]] = None, allow_short: bool = False) -> np.ndarray:
+    """Target position after each bar's close for a named strategy."""
+    return STRATEGIES[strategy][0](bars, strategy_params(strategy, params), allow_short)
+
+
+# ------------------------------------------------------------
+# SIMULATION
+# ------------------------------------------------------------
+def simulate(
+    close: np.ndarray,
+    target: np.ndarray,
+    fee_bps: float = 1.0,
+    slippage_bps: float = 2.0,
+    initial_capital: float = 10_000.0
+) -> Dict[str, np.ndarray]:
+    """
+    Equity of trading `target` (position after each close, as a fraction
+    of equity) at the close, with fees and slippage charged on turnover.
+
+    The position set at bar t earns bar t+1's return, so a signal never
+    trades on the close that produced it. `target` may be (T,) or
+    (T, K) to simulate K variants of one series at once.
+    """
+    close = np.asarray(close, dtype=float)
+    target = np.asarray(target, dtype=float)
+    if target.ndim == 2:
+        close = close[:, None]
+
+    returns = np.zeros(target.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = close[1:] / close[:-1] - 1
+    # A missing or zero close earns nothing rather than poisoning the curve
+    returns[~np.isfinite(returns)] = 0.0
+
+    held = np.zeros(target.shape)
+    held[1:] = target[:-1]
+
+    turnover = np.abs(np.diff(target, axis=0, prepend=0.0))
+    costs = turnover * (fee_bps + slippage_bps) / 10_000
+
+    net = held * returns - costs
+    equity = initial_capital * np.cumprod(1 + net, axis=0)
+    return {"returns": net, "equity": equity, "held": held, "turnover": turnover, "asset_returns": returns}
+
+
+def extract_trades(
+    bars: BarSeries,
+    target: np.ndarray,
+    equity: np.ndarray,
+    fee_bps: float,
+    slippage_bps: float,
+    initial_capital: float
+) -> List[Dict[str, Any]]:
+    """One dict per round trip: a run of constant non-zero target position."""
+    n = len(target)
+    if n == 0:
+        return []
+
+    starts = np.flatnonzero(np.diff(target, prepend=0.0))
+    ends = np.r_[starts[1:], n]
+    sides = target[starts]
+    keep = sides != 0
+    starts, ends, sides = starts[keep], ends[keep], sides[keep]
+    if len(starts) == 0:
+        return []
+
+    is_open = ends >= n
+    exits = np.minimum(ends, n - 1)
+    slip, fee = slippage_bps / 10_000, fee_bps / 10_000
+
+    entry_price = bars.close[starts] * (1 + sides * slip)
+    exit_price = bars.close[exits] * (1 - sides * slip)
+    trade_return = sides * (exit_price / entry_price - 1) - 2 * fee
+    equity_before = np.where(starts > 0, equity[np.maximum(starts - 1, 0)], initial_capital)
+    pnl = trade_return * equity_before
+
+    entry_dates = format_dates(bars.ts[starts], bars.tz)
+    exit_dates = format_dates(bars.ts[exits], bars.tz)
+    return [
+        {
+            "side": "long" if side > 0 else "short",
+            "entry_date": entry_date,
+            "exit_date": exit_date,
+            "entry_price": entry,
+            "exit_price": exit_,
+            "bars_held": bars_held,
+            "return": ret,
+            "pnl": trade_pnl,
+            "open": still_open,
+        }
+        for side, entry_date, exit_date, entry, exit_, bars_held, ret, trade_pnl, still_open in zip(
+            sides.tolist(), entry_dates, exit_dates, entry_price.tolist(), exit_price.tolist(),
+            (exits - starts).tolist(), trade_return.tolist(), pnl.tolist(), is_open.tolist(),
+        )
+    ]
+
+
+def run_backtest(
+    bars: BarSeries,
+    strategy: str,
+    params: Optional[Dict[str, float]] = None,
+    allow_short: bool = False,
+    fee_bps: float = 1.0,
+    slippage_bps: float = 2.0,
+    initial_capital: float = 10_000.0,
+    include_curve: bool = True
+) -> Dict[str, Any]:
+    """
+    Backtest a named strategy over `bars`. Returns summary metrics (Sharpe,
+    drawdown and win rate from RiskManagement), the trade list and, with
+    `include_curve`, the equity curve.
+    """
+    params = strategy_params(strategy, params)
+    target = strategy_positions(bars, strategy, params, allow_short)
+    sim = simulate(bars.close, target, fee_bps, slippage_bps, initial_capital)
+    equity = sim["equity"]
+
+    trades = extract_trades(bars, target, equity, fee_bps, slippage_bps, initial_capital)
+    metrics = backtest_metrics(bars, sim, trades, initial_capital)
+
+    result = {
+        "strategy": strategy,
+        "params": params,
+        "allow_short": allow_short,
+        "fee_bps": fee_bps,
+        "slippage_bps": slippage_bps,
+        "initial_capital": initial_capital,
+        "bars": len(bars),
+        "metrics": metrics,
+        "trades": trades,
+    }
+    if include_curve:
+        result["equity_curve"] = {
+            "date": bars.date_strings(),
+            "equity": equity.tolist(),
+            "position": sim["held"].tolist(),
+        }
+    return result
+
+
+def backtest_metrics(
+    bars: BarSeries,
+    sim: Dict[str, np.ndarray],
+    trades: List[Dict[str, Any]],
+    initial_capital: float
+) -> Dict[str, Any]:
+    equity = sim["equity"]
+    if len(equity) == 0:
+        return {"total_return": 0.0, "trades": 0}
+
+    total_return = float(equity[-1] / initial_capital - 1)
+    years = (bars.ts[-1] - bars.ts[0]) / YEAR_NS if len(bars) > 1 else 0
+    cagr = (equity[-1] / initial_capital) ** (1 / years) - 1 if years > 0 and equity[-1] > 0 else 0.0
+
+    return {
+        "total_return": total_return,
+        "cagr": float(cagr),
+        "buy_and_hold_return": float(np.prod(1 + sim["asset_returns"]) - 1),
+        "sharpe_ratio": RiskManagement.calculate_sharpe_ratio(sim["returns"]),
+        "max_drawdown": RiskManagement.calculate_max_drawdown(equity),
+        "win_rate": RiskManagement.calculate_win_rate(trades),
+        "exposure": float(np.mean(sim["held"] != 0)),
+        "turnover": float(sim["turnover"].sum()),
+        "final_equity": float(equity[-1]),
+    }
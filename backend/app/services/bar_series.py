@@ -0,0 +1,181 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.ohlcv_cache import OHLCV_COLUMNS
+
+DAY_NS = 86_400 * 10**9
+
+
+def _readonly(values, dtype) -> np.ndarray:
+    """Contiguous array of `dtype`, no copy when `values` already is one, flagged read-only."""
+    arr = np.ascontiguousarray(values, dtype=dtype)
+    if arr.flags.writeable:
+        arr = arr.view()
+        arr.flags.writeable = False
+    return arr
+
+
+def ffill_rows(values: np.ndarray) -> np.ndarray:
+    """Carry each column's last non-NaN value down the rows of a (T, S) matrix."""
+    rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return np.take_along_axis(values, rows, axis=0)
+
+
+def format_dates(ts: np.ndarray, tz: Optional[str] = None) -> List[str]:
+    """Epoch-ns timestamps as the API has always rendered them ("2024-01-02", or with time and offset)."""
+    if tz is None and not (ts % DAY_NS).any():
+        return np.datetime_as_string(ts.view("datetime64[ns]"), unit="D").tolist()
+    dates = pd.DatetimeIndex(ts.view("datetime64[ns]"))
+    if tz:
+        dates = dates.tz_localize("UTC").tz_convert(tz)
+    return dates.astype(str).tolist()
+
+
+class BarSeries:
+    """
+    Columnar OHLCV bars: int64 epoch-nanosecond timestamps (UTC) plus one
+    float array per field, oldest bar first.
+
+    Arrays are read-only views, usually of the cached series itself, so
+    indicators, risk metrics and serializers share them without copying.
+    Dates only become strings at the JSON edge (`date_strings`, `to_records`).
+    """
+
+    __slots__ = ("symbol", "interval", "tz", "ts", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        ts: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        symbol: str = "",
+        interval: str = "1d",
+        tz: Optional[str] = None,
+        dtype=np.float64
+    ):
+        self.symbol = symbol
+        self.interval = interval
+        self.tz = tz
+        self.ts = _readonly(ts, np.int64)
+        self.open = _readonly(open, dtype)
+        self.high = _readonly(high, dtype)
+        self.low = _readonly(low, dtype)
+        self.close = _readonly(close, dtype)
+        self.volume = _readonly(volume, dtype)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, symbol: str = "", interval: str = "1d", dtype=np.float64) -> "BarSeries":
+        """Wrap a normalized OHLCV frame (datetime `date` column)."""
+        if df is None or df.empty:
+            return cls.empty(symbol, interval)
+
+        dates = df["date"].array.as_unit("ns")
+        return cls(
+            dates.asi8,
+            *(df[col].to_numpy() for col in OHLCV_COLUMNS),
+            symbol=symbol,
+            interval=interval,
+            tz=str(dates.tz) if dates.tz is not None else None,
+            dtype=dtype,
+        )
+
+    @classmethod
+    def empty(cls, symbol: str = "", interval: str = "1d") -> "BarSeries":
+        nothing = np.empty(0)
+        return cls(np.empty(0, dtype=np.int64), nothing, nothing, nothing, nothing, nothing, symbol, interval)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, index: slice) -> "BarSeries":
+        """Slice of bars (a view, not a copy)."""
+        if not isinstance(index, slice):
+            raise TypeError("BarSeries only supports slicing")
+        return BarSeries(
+            self.ts[index], self.open[index], self.high[index], self.low[index],
+            self.close[index], self.volume[index],
+            symbol=self.symbol, interval=self.interval, tz=self.tz, dtype=self.close.dtype,
+        )
+
+    def tail(self, n: int) -> "BarSeries":
+        return self[max(0, len(self) - n):]
+
+    def astype(self, dtype) -> "BarSeries":
+        """Same bars with float32/float64 price and volume arrays."""
+        return BarSeries(
+            self.ts, self.open, self.high, self.low, self.close, self.volume,
+            symbol=self.symbol, interval=self.interval, tz=self.tz, dtype=dtype,
+        )
+
+    # ------------------------------------------------------------
+    # JSON EDGE
+    # ------------------------------------------------------------
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        dates = pd.DatetimeIndex(self.ts.view("datetime64[ns]"))
+        return dates.tz_localize("UTC").tz_convert(self.tz) if self.tz else dates
+
+    def date_strings(self) -> List[str]:
+        return format_dates(self.ts, self.tz)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """List of candle dicts for the frontend."""
+        columns = [self.date_strings()] + [getattr(self, col).tolist() for col in OHLCV_COLUMNS]
+        keys = ["date"] + OHLCV_COLUMNS
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Legacy DataFrame view (datetime dates) for code that still needs one."""
+        return pd.DataFrame({"date": self.dates, **{col: getattr(self, col) for col in OHLCV_COLUMNS}})
+
+
+class BarPanel:
+    """
+    Several BarSeries aligned on their union timeline: `ts` is (T,) and each
+    field a read-only (T, S) matrix, one column per symbol in `symbols`
+    order, NaN where a symbol has no bar.
+    """
+
+    __slots__ = ("symbols", "interval", "tz", "ts", "open", "high", "low", "close", "volume")
+
+    def __init__(self, symbols: List[str], ts: np.ndarray, fields: Dict[str, np.ndarray], interval: str = "1d", tz: Optional[str] = None):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.tz = tz
+        self.ts = _readonly(ts, np.int64)
+        for col in OHLCV_COLUMNS:
+            setattr(self, col, _readonly(fields[col], np.float64))
+
+    @classmethod
+    def from_series(cls, series: Dict[str, BarSeries], interval: str = "1d") -> "BarPanel":
+        symbols = [symbol for symbol, bars in series.items() if len(bars)]
+        if not symbols:
+            return cls([], np.empty(0, dtype=np.int64), {col: np.empty((0, 0)) for col in OHLCV_COLUMNS}, interval)
+
+        ts = np.unique(np.concatenate([series[s].ts for s in symbols]))
+        fields = {col: np.full((len(ts), len(symbols)), np.nan) for col in OHLCV_COLUMNS}
+        for j, symbol in enumerate(symbols):
+            bars = series[symbol]
+            rows = np.searchsorted(ts, bars.ts)
+            for col in OHLCV_COLUMNS:
+                fields[col][rows, j] = getattr(bars, col)
+
+        return cls(symbols, ts, fields, interval, tz=series[symbols[0]].tz)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def column(self, symbol: str) -> BarSeries:
+        """One symbol's own bars (rows where it has data)."""
+        j = self.symbols.index(symbol)
+        rows = ~np.isnan(self.close[:, j])
+        return BarSeries(
+            self.ts[rows], *(getattr(self, col)[rows, j] for col in OHLCV_COLUMNS),
+            symbol=symbol, interval=self.interval, tz=self.tz,
+        )
@@ -1,15 +1,25 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import structlog
-import httpx
 
 from app.core.config import settings
+from app.core.http import http_clients
+from app.core.rate_limiter import (
+    rate_limiter,
+    retry_after_seconds,
+    Priority,
+    RateLimitExceeded,
+    UpstreamRateLimited,
+)
 
 logger = structlog.get_logger()
 
 
 class TradingCopilot:
     """Trading Copilot using direct Gemini REST API for maximum reliability"""
+
+    # Same-model retries after a 429 before giving up
+    RATE_LIMIT_RETRIES = 2
     
     def __init__(self):
         self.api_key = settings.GEMINI_API_KEY
@@ -26,39 +36,39 @@ class TradingCopilot:
     async def _initialize_models(self):
         """Fetch and set available models from API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.base_url,
-                    params={"key": self.api_key},
-                    timeout=10.0
-                )
+            client = http_clients.get("gemini")
+            response = await client.get(
+                self.base_url,
+                params={"key": self.api_key},
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                
+                # Extract models that support generateContent
+                available_models = [
+                    model["name"].replace("models/", "")
+                    for model in data.get("models", [])
+                    if "generateContent" in model.get("supportedGenerationMethods", [])
+                ]
+                
+                # Prioritize flash models for free tier
+                flash_models = [m for m in available_models if "flash" in m.lower()]
+                other_models = [m for m in available_models if "flash" not in m.lower()]
+                
+                self.models = flash_models + other_models
+                self.current_model = self.models[0] if self.models else None
+                
+                logger.info("✅ Available models fetched", 
+                           count=len(self.models), 
+                           current=self.current_model,
+                           all_models=self.models[:5])  # Log first 5
+            else:
+                logger.warning("Failed to fetch models", status=response.status_code)
+                self.models = ["gemini-1.5-flash-latest"]
+                self.current_model = self.models[0]
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Extract models that support generateContent
-                    available_models = [
-                        model["name"].replace("models/", "")
-                        for model in data.get("models", [])
-                        if "generateContent" in model.get("supportedGenerationMethods", [])
-                    ]
-                    
-                    # Prioritize flash models for free tier
-                    flash_models = [m for m in available_models if "flash" in m.lower()]
-                    other_models = [m for m in available_models if "flash" not in m.lower()]
-                    
-                    self.models = flash_models + other_models
-                    self.current_model = self.models[0] if self.models else None
-                    
-                    logger.info("✅ Available models fetched", 
-                               count=len(self.models), 
-                               current=self.current_model,
-                               all_models=self.models[:5])  # Log first 5
-                else:
-                    logger.warning("Failed to fetch models", status=response.status_code)
-                    self.models = ["gemini-1.5-flash-latest"]
-                    self.current_model = self.models[0]
-                    
         except Exception as e:
             logger.error("Error fetching models", error=str(e))
             self.models = ["gemini-1.5-flash-latest"]
@@ -93,18 +103,32 @@ class TradingCopilot:
         if not self.models:
             return self._error_response("No models available. Please check your API key and region.")
 
-        # Try each model until one works
+        # Try each model until one works.
+        # A 429 is a quota problem, not a model problem: back off and retry
+        # the same model instead of walking through every fallback.
         last_error = None
         for model in self.models:
-            try:
-                result = await self._generate_content(query, model)
-                if result:
-                    self.current_model = model  # Remember working model
-                    return result
-            except Exception as e:
-                last_error = str(e)
-                logger.warning(f"⚠️ Model {model} failed, trying next", error=str(e))
-                continue
+            retries = 0
+            while True:
+                try:
+                    await rate_limiter.acquire("gemini", Priority.INTERACTIVE)
+                    result = await self._generate_content(query, model)
+                    if result:
+                        self.current_model = model  # Remember working model
+                        return result
+                    break
+                except UpstreamRateLimited as e:
+                    last_error = str(e)
+                    rate_limiter.penalize("gemini", e.retry_after)
+                    if retries >= self.RATE_LIMIT_RETRIES:
+                        return self._error_response(f"Gemini quota exhausted. Last error: {last_error}")
+                    retries += 1
+                except RateLimitExceeded as e:
+                    return self._error_response(str(e))
+                except Exception as e:
+                    last_error = str(e)
+                    logger.warning(f"⚠️ Model {model} failed, trying next", error=str(e))
+                    break
         
         # All models failed
         return self._error_response(f"All models failed. Last error: {last_error}")
@@ -126,37 +150,39 @@ class TradingCopilot:
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                params={"key": self.api_key},
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30.0
-            )
-            
-            # Check for errors
-            if response.status_code != 200:
-                error_detail = response.json() if response.text else "Unknown error"
-                raise Exception(f"{response.status_code} - {error_detail}")
-            
-            data = response.json()
-            
-            # Extract the answer
-            if "candidates" not in data or not data["candidates"]:
-                raise Exception("No candidates in response")
-            
-            answer = data["candidates"][0]["content"]["parts"][0]["text"]
-            
-            logger.info("✅ Copilot response generated", model=model, chars=len(answer))
-            
-            return {
-                "answer": answer.strip(),
-                "model": model,
-                "market_bias": "neutral",  # TODO: Implement sentiment analysis
-                "sentiment_score": 0,
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
+        client = http_clients.get("gemini")
+        response = await client.post(
+            url,
+            params={"key": self.api_key},
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=30.0
+        )
+        
+        # Check for errors
+        if response.status_code == 429:
+            raise UpstreamRateLimited("gemini", retry_after_seconds(response))
+        if response.status_code != 200:
+            error_detail = response.json() if response.text else "Unknown error"
+            raise Exception(f"{response.status_code} - {error_detail}")
+        
+        data = response.json()
+        
+        # Extract the answer
+        if "candidates" not in data or not data["candidates"]:
+            raise Exception("No candidates in response")
+        
+        answer = data["candidates"][0]["content"]["parts"][0]["text"]
+        
+        logger.info("✅ Copilot response generated", model=model, chars=len(answer))
+        
+        return {
+            "answer": answer.strip(),
+            "model": model,
+            "market_bias": "neutral",  # TODO: Implement sentiment analysis
+            "sentiment_score": 0,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
 
     def _error_response(self, error_message: str) -> Dict[str, Any]:
         """Return a standardized error response"""
@@ -176,24 +202,24 @@ class TradingCopilot:
         
         try:
             url = f"{self.base_url}"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    params={"key": self.api_key},
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                models = [
-                    model["name"].replace("models/", "")
-                    for model in data.get("models", [])
-                    if "generateContent" in model.get("supportedGenerationMethods", [])
-                ]
-                
-                logger.info("📋 Available models", count=len(models), models=models)
-                return models
-                
+            client = http_clients.get("gemini")
+            response = await client.get(
+                url,
+                params={"key": self.api_key},
+                timeout=10.0
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            models = [
+                model["name"].replace("models/", "")
+                for model in data.get("models", [])
+                if "generateContent" in model.get("supportedGenerationMethods", [])
+            ]
+            
+            logger.info("📋 Available models", count=len(models), models=models)
+            return models
+            
         except Exception as e:
             logger.error("Failed to list models", error=str(e))
             return []
@@ -1,94 +1,285 @@
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 import pandas as pd
-import yfinance as yf
-import httpx
-from app.core.config import settings
+from app.core.rate_limiter import Priority
+from app.core.singleflight import SingleFlight
+from app.providers import get_market_data_provider
 from app.utils.twitter_api import TwitterAPI
-from app.utils.rss_parser import get_financial_news
+from app.services.ohlcv_cache import ohlcv_cache, slice_days
+from app.services.bar_series import BarSeries
+from app.services.resampler import resample_ohlcv, resample_source
 import structlog
 
 logger = structlog.get_logger()
 
+# Shared by every DataFetcher instance (routes create one per request)
+market_data_flights = SingleFlight("market_data")
+
 
 class DataFetcher:
-    FINNHUB_URL = "https://finnhub.io/api/v1"
+    # Map resolution
+    INTERVAL_MAP = {
+        "1": "1m",
+        "5": "5m",
+        "15": "15m",
+        "30": "30m",
+        "60": "60m",
+        "D": "1d",
+        "W": "1wk",
+        "M": "1mo"
+    }
 
     def __init__(self):
         self.twitter_api = TwitterAPI()
+        self.provider = get_market_data_provider()
 
     # ------------------------------------------------------------
-    # REAL-TIME PRICE (Finnhub)
+    # REAL-TIME PRICE (Finnhub / replay)
     # ------------------------------------------------------------
-    async def get_realtime_price(self, symbol: str) -> Dict[str, Any]:
+    async def get_realtime_price(self, symbol: str, priority: Priority = Priority.INTERACTIVE) -> Dict[str, Any]:
         """
         Free tier API: works only for quote endpoint.
+        Concurrent requests for the same symbol share one upstream call.
         """
+        symbol = symbol.upper()
         try:
-            async with httpx.AsyncClient() as client:
-                res = await client.get(
-                    f"{self.FINNHUB_URL}/quote",
-                    params={"symbol": symbol.upper(), "token": settings.FINNHUB_API_KEY}
-                )
-            return res.json()
+            quote = await market_data_flights.do(
+                (self.provider.name, symbol, "quote", None),
+                lambda: self.provider.fetch_quote(symbol, priority)
+            )
+            return dict(quote)
         except Exception as e:
             logger.error("❌ Finnhub realtime error:", error=str(e))
             return {}
 
     # ------------------------------------------------------------
-    # HISTORICAL CANDLES (Yahoo Finance)
+    # QUOTES (used by price / volume alerts)
+    # ------------------------------------------------------------
+    async def get_current_price(self, symbol: str, priority: Priority = Priority.BACKGROUND) -> Optional[float]:
+        """Latest trade price: live stream first, then cached Finnhub quote."""
+        from app.services.quote_service import quote_service
+        return await quote_service.get_current_price(symbol, priority=priority)
+
+    async def get_volume_data(self, symbol: str, bars: int = 20, priority: Priority = Priority.BACKGROUND) -> List[float]:
+        """Recent daily volumes, oldest first."""
+        from app.services.quote_service import quote_service
+        return await quote_service.get_volume_data(symbol, bars=bars, priority=priority)
+
+    # ------------------------------------------------------------
+    # HISTORICAL CANDLES (Yahoo Finance / replay)
     # ------------------------------------------------------------
-    async def get_ohlcv_series(self, symbol: str, resolution="1d", days=180):
+    async def get_ohlcv_series(self, symbol: str, resolution="1d", days=180, priority: Priority = Priority.INTERACTIVE):
         """
         Main OHLC fetcher for charts + technical analysis.
-        Works fully free using Yahoo Finance.
+        Works fully free using Yahoo Finance (or recorded fixtures in replay mode).
+        Served from the shared OHLCV cache while the series is fresh;
+        concurrent misses for the same series share one download.
+        Weekly/monthly and 5m-60m bars are resampled from cached daily/1m bars.
+
+        Returns a private DataFrame copy with string dates; prefer
+        get_bar_series for read-only analytics.
         """
 
         try:
-            # Map resolution
-            interval_map = {
-                "1": "1m",
-                "5": "5m",
-                "15": "15m",
-                "30": "30m",
-                "60": "60m",
-                "D": "1d",
-                "W": "1wk",
-                "M": "1mo"
-            }
+            df = await self._get_frame(symbol, resolution, days, priority)
+            if df.empty:
+                logger.warning(f"⚠ {self.provider.name} returned empty OHLC for {symbol}")
+                return pd.DataFrame()
+
+            return self._to_output_frame(df)
 
-            yf_interval = interval_map.get(resolution, "1d")
+        except Exception as e:
+            logger.error("❌ OHLCV error:", error=str(e), provider=self.provider.name)
+            return pd.DataFrame()
 
-            df = yf.download(
+    async def get_bar_series(self, symbol: str, resolution="D", days=180, priority: Priority = Priority.INTERACTIVE) -> BarSeries:
+        """
+        Same bars as get_ohlcv_series as a read-only BarSeries sharing the
+        cached arrays (no copy, no string dates). Empty on failure.
+        """
+        symbol = symbol.upper().strip()
+        yf_interval = self.INTERVAL_MAP.get(resolution, "1d")
+
+        try:
+            df = await self._get_frame(symbol, resolution, days, priority)
+            if df.empty:
+                logger.warning(f"⚠ {self.provider.name} returned empty OHLC for {symbol}")
+            return BarSeries.from_frame(df, symbol, yf_interval)
+
+        except Exception as e:
+            logger.error("❌ OHLCV error:", error=str(e), provider=self.provider.name)
+            return BarSeries.empty(symbol, yf_interval)
+
+    async def _get_frame(self, symbol: str, resolution: str, days: int, priority: Priority) -> pd.DataFrame:
+        """Bars at `resolution`, resampled locally where possible. Result is shared, do not mutate."""
+        yf_interval = self.INTERVAL_MAP.get(resolution, "1d")
+
+        source = resample_source(yf_interval, days)
+        if source is not None:
+            return resample_ohlcv(await self._get_bars(symbol, source, days, priority), yf_interval)
+        return await self._get_bars(symbol, yf_interval, days, priority)
+
+    async def _get_bars(self, symbol: str, yf_interval: str, days: int, priority: Priority) -> pd.DataFrame:
+        """Cached or freshly fetched bars for one series. Result is shared, do not mutate."""
+        cached = ohlcv_cache.get(symbol, yf_interval, days)
+        if cached is not None:
+            return cached
+
+        return await market_data_flights.do(
+            (self.provider.name, symbol.upper().strip(), yf_interval, days),
+            lambda: self._load_ohlcv(symbol, yf_interval, days, priority)
+        )
+
+    async def _load_ohlcv(self, symbol: str, yf_interval: str, days: int, priority: Priority) -> pd.DataFrame:
+        """Fetch a cache miss from the provider and store it. Result is shared, do not mutate."""
+
+        # Warm symbol: only fetch bars from the last stored one onwards
+        base = ohlcv_cache.peek(symbol, yf_interval)
+        if base is not None and base.days >= days:
+            tail = await self.provider.fetch_ohlcv(
                 symbol,
-                period=f"{days}d",
-                interval=yf_interval,
-                progress=False
+                yf_interval,
+                priority,
+                start=ohlcv_cache.last_bar(symbol, yf_interval),
+                end=pd.Timestamp.now() + pd.Timedelta(days=1),
             )
+            merged = ohlcv_cache.merge_tail(symbol, yf_interval, tail)
+            if merged is not None and not merged.empty:
+                return slice_days(merged, days)
 
-            if df.empty:
-                logger.warning(f"⚠ Yahoo returned empty OHLC for {symbol}")
-                return pd.DataFrame()
+        df = await self.provider.fetch_ohlcv(symbol, yf_interval, priority, period=f"{days}d")
+        ohlcv_cache.put(symbol, yf_interval, days, df)
+        return df
+
+    # ------------------------------------------------------------
+    # BATCHED CANDLES (one provider call for many tickers)
+    # ------------------------------------------------------------
+    async def get_ohlcv_batch(
+        self,
+        symbols: List[str],
+        resolution="D",
+        days=180,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Dict[str, Any]:
+        """
+        OHLCV for a whole watchlist.
 
-            df = df.reset_index()
+        Fresh symbols come from the cache, warm-but-stale symbols share one
+        tail download and cold symbols share one full download, so a batch
+        costs at most two upstream round-trips. Resampled resolutions
+        batch-load their source bars and aggregate locally.
 
-            # Standardize column names
-            df.rename(columns={
-                "Date": "date",
-                "Open": "open",
-                "High": "high",
-                "Low": "low",
-                "Close": "close",
-                "Volume": "volume",
-            }, inplace=True)
+        Returns:
+            {"series": {symbol: DataFrame}, "errors": {symbol: reason}}
+        """
+        series, errors = await self._get_batch_frames(symbols, resolution, days, priority)
+        return {
+            "series": {symbol: self._to_output_frame(df) for symbol, df in series.items()},
+            "errors": errors,
+        }
 
-            df["date"] = df["date"].astype(str)
-            return df
+    async def get_bar_series_batch(
+        self,
+        symbols: List[str],
+        resolution="D",
+        days=180,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Dict[str, Any]:
+        """
+        get_ohlcv_batch returning read-only BarSeries.
 
-        except Exception as e:
-            logger.error("❌ Yahoo OHLCV error:", error=str(e))
-            return pd.DataFrame()
+        Returns:
+            {"series": {symbol: BarSeries}, "errors": {symbol: reason}}
+        """
+        yf_interval = self.INTERVAL_MAP.get(resolution, "1d")
+        series, errors = await self._get_batch_frames(symbols, resolution, days, priority)
+        return {
+            "series": {symbol: BarSeries.from_frame(df, symbol, yf_interval) for symbol, df in series.items()},
+            "errors": errors,
+        }
+
+    async def _get_batch_frames(
+        self,
+        symbols: List[str],
+        resolution: str,
+        days: int,
+        priority: Priority
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        yf_interval = self.INTERVAL_MAP.get(resolution, "1d")
+        symbols = list(dict.fromkeys(s.upper().strip() for s in symbols if s and s.strip()))
+
+        source = resample_source(yf_interval, days)
+        series, errors = await self._get_batch_bars(symbols, source or yf_interval, days, priority)
+        if source is not None:
+            series = {symbol: resample_ohlcv(df, yf_interval) for symbol, df in series.items()}
+        return series, errors
+
+    async def _get_batch_bars(
+        self,
+        symbols: List[str],
+        yf_interval: str,
+        days: int,
+        priority: Priority
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """Shared (do not mutate) bars per symbol, in `symbols` order, plus errors."""
+
+        series: Dict[str, pd.DataFrame] = {}
+        errors: Dict[str, str] = {}
+        warm, cold = [], []
+
+        for symbol in symbols:
+            cached = ohlcv_cache.get(symbol, yf_interval, days)
+            if cached is not None:
+                series[symbol] = cached
+                continue
+            base = ohlcv_cache.peek(symbol, yf_interval)
+            (warm if base is not None and base.days >= days else cold).append(symbol)
+
+        if warm:
+            try:
+                tails = await self.provider.fetch_ohlcv_batch(
+                    warm,
+                    yf_interval,
+                    priority,
+                    start=min(ohlcv_cache.last_bar(s, yf_interval) for s in warm),
+                    end=pd.Timestamp.now() + pd.Timedelta(days=1),
+                )
+            except Exception as e:
+                logger.error("❌ Batch tail error:", error=str(e), symbols=warm)
+                tails = {}
+
+            for symbol in warm:
+                merged = ohlcv_cache.merge_tail(symbol, yf_interval, tails.get(symbol))
+                if merged is not None and not merged.empty:
+                    series[symbol] = slice_days(merged, days)
+                else:
+                    cold.append(symbol)
+
+        if cold:
+            try:
+                frames = await self.provider.fetch_ohlcv_batch(cold, yf_interval, priority, period=f"{days}d")
+            except Exception as e:
+                logger.error("❌ Batch OHLCV error:", error=str(e), symbols=cold)
+                frames = {}
+                errors.update({symbol: str(e) for symbol in cold})
+
+            for symbol in cold:
+                df = frames.get(symbol)
+                if df is None or df.empty:
+                    errors.setdefault(symbol, "No OHLC data returned")
+                    continue
+                ohlcv_cache.put(symbol, yf_interval, days, df)
+                series[symbol] = df
+
+        return {s: series[s] for s in symbols if s in series}, errors
+
+    @staticmethod
+    def _to_output_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Copy for callers (they mutate it) with the legacy string dates."""
+        out = df.copy()
+        out["date"] = out["date"].astype(str)
+        return out
 
     # ------------------------------------------------------------
     # FOR TECHNICAL ANALYSIS COMPATIBILITY
@@ -104,7 +295,7 @@ class DataFetcher:
     # ------------------------------------------------------------
     async def get_comprehensive_stock_data(self, symbol: str) -> Dict[str, Any]:
         twitter_task = self.twitter_api.get_sentiment_data(symbol)
-        news_task = get_financial_news()
+        news_task = self.provider.fetch_news()
 
         twitter_sentiment, news = await asyncio.gather(
             twitter_task,
@@ -125,7 +316,7 @@ class DataFetcher:
         ⚠️ For new code, use get_rss_articles() instead for better accuracy
         """
         try:
-            articles = await get_financial_news()
+            articles = await self.provider.fetch_news()
             if not articles:
                 return "No RSS data available"
 
@@ -192,7 +383,7 @@ class DataFetcher:
         """
         try:
             # Get raw articles from your RSS parser
-            raw_articles = await get_financial_news()
+            raw_articles = await self.provider.fetch_news()
             
             if not raw_articles:
                 logger.warning("No RSS articles available")
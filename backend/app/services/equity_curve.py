@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.rate_limiter import Priority
+from app.services.bar_series import DAY_NS, BarPanel, ffill_rows
+from app.services.data_fetcher import data_fetcher
+from app.services.lot_matching import user_trade_arrays
+from app.services.ohlcv_cache import ohlcv_cache
+
+Curve = Dict[str, np.ndarray]
+
+
+# ------------------------------------------------------------
+# BUILDER
+# ------------------------------------------------------------
+def build_equity_curve(trades: Dict[str, np.ndarray], panel: BarPanel) -> Curve:
+    """
+    Daily mark-to-market curve of a trade history.
+
+    `trades` are the column arrays of lot_matching.user_trade_arrays and
+    `panel` daily bars for the traded symbols. Rows are the panel's days
+    from the first trade onwards plus any trade day it lacks. A trade
+    counts from the close of its own day (the next close for trades on
+    days without one). Each held symbol is marked at its latest close,
+    or at its latest trade price when that is more recent or no close
+    exists.
+
+    Returns ts (days), equity (cash from trades plus market value, i.e.
+    total PnL), market_value, gross_exposure (sum of |position| x mark)
+    and returns (len(ts) - 1 daily PnL changes over the larger gross
+    exposure of the two days, 0 while flat).
+    """
+    if not len(trades["id"]):
+        empty = np.empty(0)
+        return {"ts": np.empty(0, dtype=np.int64), "equity": empty, "market_value": empty, "gross_exposure": empty, "returns": empty}
+
+    code, names = pd.factorize(trades["symbol"], sort=True)
+    signed = np.where(trades["side"] > 0, 1.0, -1.0) * trades["quantity"]
+    trade_day = trades["ts"] - trades["ts"] % DAY_NS
+
+    ts = np.union1d(panel.ts[panel.ts >= trade_day.min()], trade_day)
+    row = np.searchsorted(ts, trade_day)
+    width = len(names)
+
+    # Marks: a close where the panel has one, else the day's last trade price
+    observed = np.full((len(ts), width), np.nan)
+    last = np.lexsort((trades["id"], trades["ts"]))[::-1]
+    cell = row[last] * width + code[last]
+    _, latest = np.unique(cell, return_index=True)
+    observed.flat[cell[latest]] = trades["price"][last[latest]]
+
+    columns = pd.Index(names).get_indexer(panel.symbols)
+    keep = columns >= 0
+    days = np.searchsorted(ts, panel.ts)
+    inside = (days < len(ts)) & (ts[np.minimum(days, len(ts) - 1)] == panel.ts)
+    closes = panel.close[np.ix_(inside, keep)]
+    target = observed[np.ix_(days[inside], columns[keep])]
+    observed[np.ix_(days[inside], columns[keep])] = np.where(np.isnan(closes), target, closes)
+    marks = np.nan_to_num(ffill_rows(observed))
+
+    held = np.zeros((len(ts), width))
+    np.add.at(held, (row, code), signed)
+    np.cumsum(held, axis=0, out=held)
+    cash = np.cumsum(np.bincount(row, -signed * trades["price"], minlength=len(ts)))
+
+    market_value = (held * marks).sum(axis=1)
+    gross = (np.abs(held) * marks).sum(axis=1)
+    equity = cash + market_value
+
+    base = np.maximum(gross[:-1], gross[1:])
+    returns = np.divide(np.diff(equity), base, out=np.zeros(len(base)), where=base > 0)
+    return {"ts": ts, "equity": equity, "market_value": market_value, "gross_exposure": gross, "returns": returns}
+
+
+# ------------------------------------------------------------
+# PER-USER CACHE
+# ------------------------------------------------------------
+class EquityCurveCache:
+    """
+    Built curves per user. Trade changes call invalidate(); entries also
+    expire with the daily-bar TTL so new closes get marked. A build
+    records the generation it started from and is dropped if trades
+    changed while it ran.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 900):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def get(self, user_id: int) -> Optional[Curve]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            built_at, curve = entry
+            if time.monotonic() - built_at > self.ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return curve
+
+    def put(self, user_id: int, generation: int, curve: Curve) -> Curve:
+        for values in curve.values():
+            values.flags.writeable = False
+        with self._lock:
+            if self._generations.get(user_id, 0) == generation:
+                self._entries[user_id] = (time.monotonic(), curve)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return curve
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+equity_curves = EquityCurveCache(max_entries=settings.equity_curve_cache_size, ttl=ohlcv_cache.ttl_for("1d"))
+
+
+async def user_equity_curve(db: Session, user_id: int) -> Curve:
+    """The user's cached curve, else trades plus daily closes for every traded symbol, built and cached."""
+    cached = equity_curves.get(user_id)
+    if cached is not None:
+        return cached
+
+    generation = equity_curves.generation(user_id)
+    trades = user_trade_arrays(db, user_id)
+    series = {}
+    if len(trades["id"]):
+        first = pd.Timestamp(int(trades["ts"].min()), unit="ns", tz="UTC")
+        days = min((pd.Timestamp.now(tz="UTC") - first).days + 7, settings.equity_curve_max_days)
+        batch = await data_fetcher.get_bar_series_batch(np.unique(trades["symbol"]).tolist(), "D", days, Priority.BACKGROUND)
+        series = batch["series"]
+
+    curve = build_equity_curve(trades, BarPanel.from_series(series))
+    return equity_curves.put(user_id, generation, curve)
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.bar_series import BarSeries
+from app.services.ohlcv_cache import OHLCV_COLUMNS
+
+Indicators = Dict[str, np.ndarray]
+
+
+def fingerprint(bars: BarSeries) -> str:
+    """Content hash of every bar array; any revised bar changes it."""
+    digest = hashlib.blake2b(digest_size=16)
+    for col in ["ts"] + OHLCV_COLUMNS:
+        digest.update(getattr(bars, col).data)
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Memoized indicator arrays, keyed by the series they were computed from
+    (symbol, interval, last bar, content hash) and the indicator parameters.
+
+    An LRU bounded by the bytes held in arrays rather than by entry count,
+    since a 1m series and a monthly one differ in size by orders of magnitude.
+    Stored arrays are read-only and shared by every hit.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Indicators]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "oversized": 0}
+
+    # ------------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------------
+    def get_or_compute(
+        self,
+        bars: BarSeries,
+        params: Dict[str, Any],
+        compute: Callable[[], Indicators]
+    ) -> Indicators:
+        """Cached indicators for `bars` + `params`, else `compute()` and store."""
+        key = self.key(bars, params)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        return self.put(key, compute())
+
+    @staticmethod
+    def key(bars: BarSeries, params: Dict[str, Any]) -> tuple:
+        last_ts = int(bars.ts[-1]) if len(bars) else None
+        return (
+            bars.symbol,
+            bars.interval,
+            last_ts,
+            len(bars),
+            fingerprint(bars),
+            tuple(sorted(params.items())),
+        )
+
+    def get(self, key: tuple) -> Optional[Indicators]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            self._stats["hits" if entry is not None else "misses"] += 1
+            return entry
+
+    def put(self, key: tuple, indicators: Indicators) -> Indicators:
+        """Store read-only views of the arrays; returns the stored dict."""
+        entry = {name: self._readonly(values) for name, values in indicators.items()}
+        size = self._size(entry)
+
+        with self._lock:
+            if size > self.max_bytes:
+                self._stats["oversized"] += 1
+                return entry
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._size(previous)
+
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted)
+                self._stats["evictions"] += 1
+
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    # ------------------------------------------------------------
+    # INTERNALS
+    # ------------------------------------------------------------
+    @staticmethod
+    def _readonly(values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values).view()
+        values.flags.writeable = False
+        return values
+
+    @staticmethod
+    def _size(entry: Indicators) -> int:
+        return sum(values.nbytes for values in entry.values())
+
+
+# Shared across requests (routes build a fresh TechnicalAnalysis per call)
+indicator_cache = IndicatorCache(max_bytes=settings.indicator_cache_max_bytes)
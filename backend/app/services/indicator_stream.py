@@ -0,0 +1,354 @@
+import math
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import structlog
+
+from app.core.config import settings
+from app.core.rate_limiter import Priority
+from app.core.singleflight import SingleFlight
+from app.services.bar_series import BarSeries
+from app.services.data_fetcher import DataFetcher
+from app.services.ohlcv_cache import ohlcv_cache
+
+logger = structlog.get_logger()
+
+# Daily bars are dated by the exchange's calendar day
+EXCHANGE_TZ = ZoneInfo("America/New_York")
+
+DAY_NS = 86_400 * 10**9
+MINUTE_NS = 60 * 10**9
+
+# Streamable timeframes: bar length in ns and calendar days of history to seed from
+TIMEFRAMES = {
+    "1m": (MINUTE_NS, 5),
+    "5m": (5 * MINUTE_NS, 30),
+    "15m": (15 * MINUTE_NS, 30),
+    "30m": (30 * MINUTE_NS, 30),
+    "60m": (60 * MINUTE_NS, 60),
+    "1d": (DAY_NS, 180),
+}
+
+NAN = float("nan")
+
+
+# ------------------------------------------------------------
+# INCREMENTAL KERNELS
+# `push` commits a closed bar, `peek` evaluates the forming bar
+# without changing state. Both are O(1) and agree with the array
+# kernels in services/technical_analysis.py.
+# ------------------------------------------------------------
+class _EMA:
+    """pandas ewm(span=period) with adjust=True: weighted sum / weight sum."""
+
+    __slots__ = ("decay", "num", "den", "count")
+
+    def __init__(self, period: int):
+        self.decay = 1 - 2 / (period + 1)
+        self.num = 0.0
+        self.den = 0.0
+        self.count = 0
+
+    def peek(self, x: float) -> float:
+        return (x + self.decay * self.num) / (1 + self.decay * self.den)
+
+    def push(self, x: float) -> None:
+        self.num = x + self.decay * self.num
+        self.den = 1 + self.decay * self.den
+        self.count += 1
+
+
+class _RollingWindow:
+    """Mean and sample std of the last `period` values via running sum / sum of squares."""
+
+    __slots__ = ("period", "values", "total", "total_sq", "pushes")
+
+    # Re-add the window exactly now and then so rounding does not accumulate
+    RESUM_EVERY = 1000
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values: deque = deque(maxlen=period - 1)  # committed part of the window
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.pushes = 0
+
+    def peek(self, x: float) -> Tuple[float, float]:
+        if len(self.values) < self.period - 1:
+            return NAN, NAN
+        total = self.total + x
+        mean = total / self.period
+        var = (self.total_sq + x * x - total * mean) / (self.period - 1)
+        return mean, math.sqrt(max(var, 0.0))
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.values.maxlen:
+            oldest = self.values[0]
+            self.total -= oldest
+            self.total_sq -= oldest * oldest
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+
+        self.pushes += 1
+        if self.pushes % self.RESUM_EVERY == 0:
+            self.total = sum(self.values)
+            self.total_sq = sum(v * v for v in self.values)
+
+
+class _WilderRSI:
+    """RSI seeded with the mean of the first `period` changes, then Wilder-smoothed."""
+
+    __slots__ = ("period", "prev", "changes", "avg_gain", "avg_loss")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev: Optional[float] = None
+        self.changes = 0
+        self.avg_gain = 0.0  # running sums until seeded
+        self.avg_loss = 0.0
+
+    def _averages(self, x: float) -> Tuple[int, float, float]:
+        change = x - self.prev
+        gain = change if change > 0 else 0.0
+        loss = 0.0 if change > 0 else -change
+        changes = self.changes + 1
+        if changes < self.period:
+            return changes, self.avg_gain + gain, self.avg_loss + loss
+        if changes == self.period:
+            return changes, (self.avg_gain + gain) / self.period, (self.avg_loss + loss) / self.period
+        p = self.period
+        return changes, (self.avg_gain * (p - 1) + gain) / p, (self.avg_loss * (p - 1) + loss) / p
+
+    def peek(self, x: float) -> float:
+        if self.prev is None:
+            return NAN
+        changes, avg_gain, avg_loss = self._averages(x)
+        if changes < self.period:
+            return NAN
+        return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def push(self, x: float) -> None:
+        if self.prev is not None:
+            self.changes, self.avg_gain, self.avg_loss = self._averages(x)
+        self.prev = x
+
+
+class IndicatorState:
+    """
+    Live RSI / EMA / MACD / SMA / Bollinger for one (symbol, timeframe).
+
+    Closed bars are folded into the incremental kernels once; each tick only
+    re-evaluates the forming bar, so an update costs O(1) regardless of how
+    much history the state was seeded with.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        interval: str,
+        rsi_period: int = 14,
+        ema_period: int = 20,
+        macd_periods: Tuple[int, int, int] = (12, 26, 9),
+        bb_period: int = 20,
+        bb_std: float = 2.0
+    ):
+        self.symbol = symbol
+        self.interval = interval
+        self.step = TIMEFRAMES[interval][0]
+        self.ema_period = ema_period
+        self.slow_period = macd_periods[1]
+        self.bb_std = bb_std
+
+        self._rsi = _WilderRSI(rsi_period)
+        self._ema = _EMA(ema_period)
+        self._fast = _EMA(macd_periods[0])
+        self._slow = _EMA(macd_periods[1])
+        self._signal = _EMA(macd_periods[2])
+        self._window = _RollingWindow(bb_period)
+
+        self.bar_start: Optional[int] = None  # bucket of the forming bar (ns)
+        self.close: Optional[float] = None
+        self.bars = 0  # committed bars
+        self.ticks = 0
+        self.updated_at = 0.0
+        self.values: Dict[str, float] = {}
+
+    # ------------------------------------------------------------
+    # FEED
+    # ------------------------------------------------------------
+    def seed(self, bars: BarSeries) -> None:
+        """Fold history in; the last bar stays open for ticks to update."""
+        if len(bars) == 0:
+            return
+        for close in bars.close[:-1].tolist():
+            self._commit(close)
+        self.bar_start = int(bars.ts[-1])
+        self.close = float(bars.close[-1])
+        self._refresh()
+
+    def on_tick(self, price: float, ts_ms: float) -> None:
+        bucket = self._bucket(ts_ms)
+        if self.bar_start is None:
+            self.bar_start = bucket
+        elif bucket < self.bar_start:
+            return  # belongs to a bar that is already closed
+        elif bucket > self.bar_start:
+            self._commit(self.close)
+            self.bar_start = bucket
+
+        self.close = float(price)
+        self.ticks += 1
+        self._refresh()
+
+    def _bucket(self, ts_ms: float) -> int:
+        if self.step == DAY_NS:
+            day = datetime.fromtimestamp(ts_ms / 1000, tz=EXCHANGE_TZ).date()
+            return (day.toordinal() - 719163) * DAY_NS  # 719163 = date(1970, 1, 1).toordinal()
+
+        ts = int(ts_ms * 10**6)
+        if self.bar_start is None:
+            return ts - ts % self.step
+        # Continue the seeded grid so buckets stay anchored at the session open
+        return self.bar_start + (ts - self.bar_start) // self.step * self.step
+
+    def _commit(self, close: float) -> None:
+        line = self._fast.peek(close) - self._slow.peek(close)
+        self._rsi.push(close)
+        self._ema.push(close)
+        self._fast.push(close)
+        self._slow.push(close)
+        self._signal.push(line)
+        self._window.push(close)
+        self.bars += 1
+
+    def _refresh(self) -> None:
+        x = self.close
+        count = self.bars + 1
+
+        line = self._fast.peek(x) - self._slow.peek(x)
+        signal = self._signal.peek(line)
+        macd_ready = count >= self.slow_period
+        mean, std = self._window.peek(x)
+
+        self.values = {
+            "rsi": self._rsi.peek(x),
+            "ema": self._ema.peek(x) if count >= self.ema_period else NAN,
+            "macd": line if macd_ready else NAN,
+            "macd_signal": signal if macd_ready else NAN,
+            "macd_histogram": line - signal if macd_ready else NAN,
+            "sma": mean,
+            "bollinger_upper": mean + self.bb_std * std,
+            "bollinger_lower": mean - self.bb_std * std,
+        }
+        self.updated_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "interval": self.interval,
+            "bar_start": self.bar_start,
+            "close": self.close,
+            "bars": self.bars + (self.bar_start is not None),
+            "ticks": self.ticks,
+            "updated_at": self.updated_at,
+            "indicators": {k: (None if math.isnan(v) else v) for k, v in self.values.items()},
+        }
+
+
+class IndicatorEngine:
+    """
+    IndicatorState per (symbol, timeframe), seeded from the cached series on
+    first use and kept current by the price stream. Reads never recompute.
+    Series nobody has read for `idle_ttl` seconds stop being tracked, as do
+    the least recently read ones beyond `max_tracked`.
+    """
+
+    def __init__(self, max_tracked: int = 512, idle_ttl: float = 1800.0):
+        self.max_tracked = max_tracked
+        self.idle_ttl = idle_ttl
+        # Least recently read first
+        self._states: "OrderedDict[Tuple[str, str], IndicatorState]" = OrderedDict()
+        self._read_at: Dict[Tuple[str, str], float] = {}
+        self._by_symbol: Dict[str, List[IndicatorState]] = {}
+        self._seeds = SingleFlight("indicator_seed")
+        self._stats = {"ticks": 0, "seeds": 0, "evicted": 0}
+
+    async def get(self, symbol: str, interval: str = "1d", priority: Priority = Priority.INTERACTIVE) -> IndicatorState:
+        """
+        Tracked state for a series. Seeded (or re-seeded, if no tick arrived
+        within the cache TTL) from the cached bars.
+        """
+        if interval not in TIMEFRAMES:
+            raise ValueError(f"Streaming indicators are not available for interval {interval}")
+
+        symbol = symbol.upper().strip()
+        now = time.time()
+        self._evict(now)
+        state = self._states.get((symbol, interval))
+        if state is not None:
+            self._touch((symbol, interval), now)
+            if now - state.updated_at < ohlcv_cache.ttl_for(interval):
+                return state
+
+        return await self._seeds.do((symbol, interval), lambda: self._seed(symbol, interval, priority))
+
+    async def _seed(self, symbol: str, interval: str, priority: Priority) -> IndicatorState:
+        resolution = next(r for r, i in DataFetcher.INTERVAL_MAP.items() if i == interval)
+        bars = await DataFetcher().get_bar_series(symbol, resolution, days=TIMEFRAMES[interval][1], priority=priority)
+
+        state = IndicatorState(symbol, interval)
+        state.seed(bars)
+        self._stats["seeds"] += 1
+
+        previous = self._states.get((symbol, interval))
+        self._states[(symbol, interval)] = state
+        self._touch((symbol, interval), time.time())
+        tracked = self._by_symbol.setdefault(symbol, [])
+        if previous in tracked:
+            tracked.remove(previous)
+        tracked.append(state)
+        self._evict(time.time())
+        return state
+
+    def _touch(self, key: Tuple[str, str], now: float) -> None:
+        self._read_at[key] = now
+        self._states.move_to_end(key)
+
+    def _evict(self, now: float) -> None:
+        """Drop idle series, then the least recently read ones over the cap."""
+        while self._states:
+            key, state = next(iter(self._states.items()))
+            if len(self._states) <= self.max_tracked and now - self._read_at[key] < self.idle_ttl:
+                break
+            del self._states[key], self._read_at[key]
+            tracked = self._by_symbol[key[0]]
+            tracked.remove(state)
+            if not tracked:
+                del self._by_symbol[key[0]]
+            self._stats["evicted"] += 1
+
+    def on_trades(self, trades: Iterable[Dict[str, Any]]) -> None:
+        """Apply Finnhub trade messages ({"s", "p", "t"}) to every tracked timeframe."""
+        self._evict(time.time())
+        for trade in trades:
+            states = self._by_symbol.get(trade.get("s"))
+            if not states or trade.get("p") is None:
+                continue
+            ts_ms = trade.get("t") or time.time() * 1000
+            for state in states:
+                state.on_tick(trade["p"], ts_ms)
+            self._stats["ticks"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "tracked": len(self._states)}
+
+
+# Shared by the price stream (writes) and analytics routes (reads)
+indicator_engine = IndicatorEngine(
+    max_tracked=settings.indicator_stream_max_tracked,
+    idle_ttl=settings.indicator_stream_idle_ttl
+)
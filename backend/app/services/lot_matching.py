@@ -0,0 +1,339 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.models import Trade
+
+METHODS = ("fifo", "lifo", "average")
+
+# Quantities are matched as integer micro-units so positions net to exactly zero
+QTY_SCALE = 10**6
+
+NS_PER_DAY = 86_400 * 10**9
+
+
+def _is_sorted(*keys: np.ndarray) -> bool:
+    """Whether rows are already in lexicographic order of `keys` (most significant first)."""
+    ordered = np.ones(max(len(keys[0]) - 1, 0), dtype=bool)
+    tied = ordered.copy()
+    for key in keys:
+        step = np.diff(key)
+        ordered &= ~tied | (step >= 0)
+        tied &= step == 0
+    return bool(ordered.all())
+
+
+# ------------------------------------------------------------
+# LEGS AND ROUND TRIPS
+# A trade that flips the position (long -> short) is split into a
+# closing leg and an opening leg. A round trip runs from flat to
+# flat; inside one, legs away from zero open and legs toward it close.
+# ------------------------------------------------------------
+def _legs(trades: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    keep = trades["quantity"] > 0
+    t = {name: values[keep] for name, values in trades.items()}
+    code, names = pd.factorize(t.pop("symbol"), sort=True)
+    if not _is_sorted(code, t["ts"], t["id"]):
+        order = np.lexsort((t["id"], t["ts"], code))
+        t = {name: values[order] for name, values in t.items()}
+        code = code[order]
+    signed = np.where(t["side"] > 0, 1, -1) * np.rint(t["quantity"] * QTY_SCALE).astype(np.int64)
+
+    # Position after each trade, restarting at every symbol
+    after = np.cumsum(signed)
+    first = np.ones(len(code), dtype=bool)
+    first[1:] = code[1:] != code[:-1]
+    after -= np.repeat(after[first] - signed[first], np.diff(np.r_[np.flatnonzero(first), len(code)]))
+    before = after - signed
+
+    flips = (before != 0) & (after != 0) & ((before > 0) != (after > 0))
+    trade = np.repeat(np.arange(len(code)), 1 + flips)
+    second = np.zeros(len(trade), dtype=bool)
+    second[1:] = trade[1:] == trade[:-1]
+
+    leg_before = np.where(second, 0, before[trade])
+    leg_after = after[trade].copy()
+    leg_after[:-1][second[1:]] = 0  # closing half of a flip ends flat
+
+    starts = leg_before == 0
+    trip = np.cumsum(starts) - 1
+    direction = np.sign(leg_after[starts])
+    return {
+        "code": code[trade],
+        "names": np.asarray(names, dtype=str),
+        "id": t["id"][trade],
+        "ts": t["ts"][trade],
+        "price": t["price"][trade].astype(float),
+        "level": np.abs(leg_after),
+        "qty": np.abs(leg_after - leg_before),
+        "opens": np.abs(leg_after) > np.abs(leg_before),
+        "trip": trip,
+        "trip_direction": direction,
+        "trip_first": np.flatnonzero(starts),
+        "trip_last": np.flatnonzero(np.r_[starts[1:], True][:len(starts)]),
+    }
+
+
+# ------------------------------------------------------------
+# MATCHING
+# Each returns (open leg, close leg or -1, quantity) per matched
+# piece; close -1 marks units still open.
+# ------------------------------------------------------------
+def _fifo(legs: Dict[str, np.ndarray]):
+    """Units close in the order they opened: intersect cumulative opened and closed quantity."""
+    opens, closes = np.flatnonzero(legs["opens"]), np.flatnonzero(~legs["opens"])
+    trips = len(legs["trip_first"])
+    unclosed = (
+        np.bincount(legs["trip"][opens], legs["qty"][opens], minlength=trips)
+        - np.bincount(legs["trip"][closes], legs["qty"][closes], minlength=trips)
+    ).astype(np.int64)
+
+    # Units left open close against a virtual leg at the end of their trip
+    virtual = np.flatnonzero(unclosed > 0)
+    close_key = np.r_[closes, legs["trip_last"][virtual] + 0.5]
+    close_qty = np.r_[legs["qty"][closes], unclosed[virtual]]
+    close_leg = np.r_[closes, np.full(len(virtual), -1)]
+    order = np.argsort(close_key, kind="stable")
+    close_qty, close_leg = close_qty[order], close_leg[order]
+
+    cum_open = np.cumsum(legs["qty"][opens])
+    cum_close = np.cumsum(close_qty)
+    # Both runs are sorted, so a stable sort merges them in linear time
+    bounds = np.sort(np.r_[cum_open, cum_close], kind="stable")
+    bounds = bounds[np.r_[True, bounds[1:] != bounds[:-1]][:len(bounds)]]
+    qty = np.diff(np.r_[0, bounds])
+    return opens[np.searchsorted(cum_open, bounds)], close_leg[np.searchsorted(cum_close, bounds)], qty
+
+
+def _next_at_or_below(values: np.ndarray, bound: np.ndarray) -> np.ndarray:
+    """
+    For each row i, the first row j > i with values[j] <= bound[i]; -1
+    when none. Every row climbs a bottom-up min tree until a right
+    sibling holds a low enough value, then descends into it, so all rows
+    resolve in 2 * log2(n) vectorized steps with O(n) memory.
+    """
+    n = len(values)
+    size = 1 << max(n - 1, 1).bit_length()
+    tree = np.full(2 * size, np.iinfo(np.int64).max)
+    tree[size:size + n] = values
+    for start in range(size.bit_length() - 2, -1, -1):
+        lo = 1 << start
+        tree[lo:2 * lo] = np.minimum(tree[2 * lo:4 * lo:2], tree[2 * lo + 1:4 * lo:2])
+
+    found = np.full(n, -1)
+    rows = np.arange(n)
+    node = rows + size
+    while len(rows):
+        hit = (node % 2 == 0) & (tree[node | 1] <= bound[rows])
+        found[rows[hit]] = node[hit] + 1
+        node = node // 2
+        keep = ~hit & (node > 1)
+        rows, node = rows[keep], node[keep]
+
+    rows = np.flatnonzero(found >= 0)
+    node = found[rows]
+    for _ in range(size.bit_length() - 1):
+        inner = node < size
+        left = 2 * node[inner]
+        node[inner] = np.where(tree[left] <= bound[rows[inner]], left, left + 1)
+    found[rows] = node - size
+    return found
+
+
+def _lifo(legs: Dict[str, np.ndarray]):
+    """
+    Units close newest first, which makes a unit's identity its height in
+    the position: the band a leg lifts the position through is closed by
+    the first later leg that brings it back down, whoever opened the
+    units below. Every level then yields at most one piece: opened by the
+    leg after its previous lower level, closed by its next lower-or-equal
+    level within the same round trip.
+    """
+    n = len(legs["qty"])
+    # A zero-level start node before every trip's first leg
+    node = np.arange(n) + np.searchsorted(legs["trip_first"], np.arange(n), side="right")
+    levels = np.zeros(n + len(legs["trip_first"]), dtype=np.int64)
+    node_leg = np.full(len(levels), -1)
+    node_trip = np.repeat(np.arange(len(legs["trip_first"])), np.diff(np.r_[legs["trip_first"], n]) + 1)
+    levels[node], node_leg[node] = legs["level"], np.arange(n)
+
+    # Levels are integer micro-units, so "strictly below" is "at or below level - 1"
+    last = len(levels) - 1
+    prev_lower = _next_at_or_below(levels[::-1], levels[::-1] - 1)[::-1]
+    prev_lower = np.where(prev_lower >= 0, last - prev_lower, -1)
+    next_lower = _next_at_or_below(levels, levels)
+    closed = (next_lower >= 0) & (node_trip[np.maximum(next_lower, 0)] == node_trip)
+
+    floor = levels[np.maximum(prev_lower, 0)]
+    floor = np.where(closed, np.maximum(floor, levels[np.maximum(next_lower, 0)]), floor)
+    qty = levels - floor
+    piece = (node_leg >= 0) & (qty > 0)
+
+    open_leg = node_leg[prev_lower[piece] + 1]
+    close_leg = np.where(closed[piece], node_leg[np.maximum(next_lower[piece], 0)], -1)
+    return open_leg, close_leg, qty[piece]
+
+
+def _affine_scan(weight: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    """x[i] = weight[i] * x[i-1] + offset[i] (x[-1] = 0) by prefix doubling."""
+    w, b = weight.astype(float), offset.astype(float)
+    step = 1
+    while step < len(w):
+        b[step:] = w[step:] * b[:-step] + b[step:]
+        w[step:] = w[step:] * w[:-step]
+        step *= 2
+    return b
+
+
+def _average(legs: Dict[str, np.ndarray]):
+    """
+    Average cost: opening legs blend into the running cost per unit,
+    closing legs realize against it. The running average (and the
+    quantity-weighted open time, used for holding periods) follows
+    avg = held_before / held_after * avg + qty / held_after * price,
+    which resets by itself at each trip start.
+    """
+    opens = legs["opens"]
+    held_after = legs["level"].astype(float)
+    held_before = np.where(opens, held_after - legs["qty"], 0)
+    weight = np.where(opens, held_before / np.where(opens, held_after, 1), 1.0)
+    share = np.where(opens, legs["qty"] / np.where(opens, held_after, 1), 0.0)
+
+    avg_price = _affine_scan(weight, share * legs["price"])
+    # Offsets from each trip's first leg keep timestamps well inside float precision
+    origin = legs["ts"][legs["trip_first"]][legs["trip"]]
+    avg_ts = origin + np.rint(_affine_scan(weight, share * (legs["ts"] - origin))).astype(np.int64)
+
+    closes = np.flatnonzero(~opens)
+    return closes, avg_price[closes - 1], avg_ts[closes - 1]
+
+
+# ------------------------------------------------------------
+# ENGINE
+# ------------------------------------------------------------
+class LotMatch:
+    """
+    Lot-level and round-trip results of matching a trade history.
+
+    `lots` and `round_trips` are dicts of equal-length arrays. A lot is a
+    quantity opened by one leg and closed by another, or still held
+    (`closed` False). Under average cost a lot is what a closing leg takes
+    off at the running average price and average open time, and held
+    units are not listed.
+    """
+
+    def __init__(self, method: str, symbols: np.ndarray, lots: Dict[str, np.ndarray], round_trips: Dict[str, np.ndarray]):
+        self.method = method
+        self.symbols = symbols
+        self.lots = lots
+        self.round_trips = round_trips
+
+    def win_rate_records(self) -> List[Dict[str, Any]]:
+        """Closed round trips as trade dicts for RiskManagement.calculate_win_rate."""
+        closed = self.round_trips["closed"]
+        return [
+            {"symbol": symbol, "pnl": pnl}
+            for symbol, pnl in zip(self.symbols[self.round_trips["symbol"][closed]].tolist(), self.round_trips["pnl"][closed].tolist())
+        ]
+
+    def realized_by_symbol(self) -> Dict[str, float]:
+        totals = np.bincount(self.lots["symbol"], self.lots["pnl"], minlength=len(self.symbols))
+        return dict(zip(self.symbols.tolist(), totals.tolist()))
+
+
+def match_lots(trades: Dict[str, np.ndarray], method: str = "fifo") -> LotMatch:
+    """
+    Match buys against sells per symbol with FIFO, LIFO or average cost.
+
+    `trades` holds equal-length arrays: id, symbol, side (+1 buy, -1 sell),
+    quantity, price and ts (epoch ns), in any order; each symbol is
+    replayed by time, then id. Long and short round trips are both
+    supported, including trades that flip one into the other.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown lot matching method '{method}'. Available: {', '.join(METHODS)}")
+
+    legs = _legs(trades)
+    trips = len(legs["trip_first"])
+    if method == "average":
+        close_leg, open_price, open_ts = _average(legs)
+        qty = legs["qty"][close_leg]
+        trip = legs["trip"][close_leg]
+        open_id = np.full(len(close_leg), -1)
+        closed = np.ones(len(close_leg), dtype=bool)
+        close_price, close_ts = legs["price"][close_leg], legs["ts"][close_leg]
+        close_id = legs["id"][close_leg]
+        symbol = legs["code"][close_leg]
+    else:
+        open_leg, close_leg, qty = (_fifo if method == "fifo" else _lifo)(legs)
+        closed = close_leg >= 0
+        close_at = np.where(closed, close_leg, open_leg)
+        trip = legs["trip"][open_leg]
+        open_price, open_ts, open_id = legs["price"][open_leg], legs["ts"][open_leg], legs["id"][open_leg]
+        close_price = np.where(closed, legs["price"][close_at], np.nan)
+        close_ts = np.where(closed, legs["ts"][close_at], -1)
+        close_id = np.where(closed, legs["id"][close_at], -1)
+        symbol = legs["code"][open_leg]
+
+    direction = legs["trip_direction"][trip]
+    quantity = qty / QTY_SCALE
+    pnl = np.where(closed, quantity * (close_price - open_price) * direction, 0.0)
+    lots = {
+        "symbol": symbol,
+        "side": direction,
+        "quantity": quantity,
+        "open_id": open_id,
+        "close_id": close_id,
+        "open_ts": open_ts,
+        "close_ts": close_ts,
+        "open_price": open_price,
+        "close_price": close_price,
+        "pnl": pnl,
+        "holding_days": np.where(closed, (close_ts - open_ts) / NS_PER_DAY, np.nan),
+        "closed": closed,
+        "trip": trip,
+    }
+
+    last_leg = legs["trip_last"]
+    trip_closed = legs["level"][last_leg] == 0
+    peak = np.zeros(trips, dtype=np.int64)
+    np.maximum.at(peak, legs["trip"], legs["level"])
+    round_trips = {
+        "symbol": legs["code"][legs["trip_first"]],
+        "side": legs["trip_direction"],
+        "open_ts": legs["ts"][legs["trip_first"]],
+        "close_ts": np.where(trip_closed, legs["ts"][last_leg], -1),
+        "peak_quantity": peak / QTY_SCALE,
+        "legs": last_leg - legs["trip_first"] + 1,
+        "pnl": np.bincount(trip, pnl, minlength=trips),
+        "closed": trip_closed,
+    }
+    return LotMatch(method, legs["names"], lots, round_trips)
+
+
+def user_trade_arrays(db: Session, user_id: int) -> Dict[str, np.ndarray]:
+    """A user's buy and sell trades as the column arrays match_lots takes."""
+    rows = (
+        db.query(Trade.id, Trade.symbol, Trade.trade_type, Trade.quantity, Trade.price, Trade.timestamp)
+        .filter(Trade.user_id == user_id, Trade.trade_type.in_(("buy", "sell")))
+        .order_by(Trade.symbol, Trade.timestamp, Trade.id)
+        .all()
+    )
+    ids, symbols, types, quantities, prices, timestamps = zip(*rows) if rows else ((),) * 6
+    return {
+        "id": np.array(ids, dtype=np.int64),
+        "symbol": np.array(symbols, dtype=object).astype(str),
+        "side": np.where(np.array(types, dtype=object) == "buy", 1, -1).astype(np.int8),
+        "quantity": np.array(quantities, dtype=float),
+        "price": np.array(prices, dtype=float),
+        "ts": _epoch_ns(timestamps),
+    }
+
+
+def _epoch_ns(timestamps) -> np.ndarray:
+    if not timestamps:
+        return np.empty(0, dtype=np.int64)
+    dates = pd.DatetimeIndex(pd.to_datetime(list(timestamps), utc=True)).as_unit("ns")
+    return dates.asi8
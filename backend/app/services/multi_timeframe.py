@@ -0,0 +1,91 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.bar_series import BarSeries
+from app.services.resampler import resample_bars
+from app.services.technical_analysis import DEFAULT_INDICATORS, compute_indicators, resolve_indicators, session_anchors
+
+# Intervals from finest to coarsest; each can be resampled from any finer one
+TIMEFRAME_ORDER = ["1m", "5m", "15m", "30m", "60m", "1d", "1wk", "1mo"]
+
+
+def finest_interval(intervals: Sequence[str]) -> str:
+    """The interval to fetch so every other one can be resampled from it."""
+    unknown = [i for i in intervals if i not in TIMEFRAME_ORDER]
+    if unknown:
+        raise ValueError(f"Unknown interval(s) {', '.join(unknown)}")
+    return min(intervals, key=TIMEFRAME_ORDER.index)
+
+
+def timeframe_bars(bars: BarSeries, intervals: Sequence[str]) -> Dict[str, tuple]:
+    """
+    interval -> (bars, end rows) for each interval built from `bars`, the
+    finest one. End rows give the `bars` row at which each bar closes.
+    """
+    out = {}
+    for interval in intervals:
+        if interval == bars.interval:
+            out[interval] = (bars, np.arange(len(bars)))
+        elif TIMEFRAME_ORDER.index(interval) < TIMEFRAME_ORDER.index(bars.interval):
+            raise ValueError(f"Cannot build {interval} bars from coarser {bars.interval} bars")
+        else:
+            out[interval] = resample_bars(bars, interval)
+    return out
+
+
+def _anchors(bars: BarSeries) -> np.ndarray:
+    """VWAP anchors: sessions intraday, one running period daily and up."""
+    anchors = session_anchors(bars.ts, bars.interval)
+    return np.zeros(len(bars)) if anchors is None else anchors.astype(float)
+
+
+def _stack(columns: List[np.ndarray]) -> np.ndarray:
+    """(T_max, K) matrix holding column k from row 0, NaN-padded below."""
+    out = np.full((max(len(c) for c in columns), len(columns)), np.nan)
+    for k, values in enumerate(columns):
+        out[:len(values), k] = values
+    return out
+
+
+def multi_timeframe_indicators(
+    bars: BarSeries,
+    intervals: Sequence[str],
+    indicators: Optional[Sequence[str]] = None,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Indicators for several timeframes from one series of the finest bars,
+    aligned on that series' timeline.
+
+    Each timeframe is resampled locally, then all of them are computed in
+    one pass as columns of a padded matrix (columns start at row 0, so each
+    warms up exactly as on its own). On every row of `bars`, a timeframe
+    shows its latest bar that had closed by then; the still-forming bar
+    at the very end counts as of the last row, as in a single-timeframe
+    request. Returns interval -> {"ts": label of the bar in use (-1 before
+    the first), **indicators}.
+    """
+    outputs = resolve_indicators(indicators) if indicators else DEFAULT_INDICATORS
+    frames = timeframe_bars(bars, intervals)
+    series = [frames[interval][0] for interval in intervals]
+    if len(bars) == 0:
+        return {interval: {"ts": np.empty(0, dtype=np.int64), **{o: np.empty(0) for o in outputs}} for interval in intervals}
+
+    fields = {col: _stack([getattr(s, col) for s in series]) for col in ("high", "low", "close", "volume")}
+    anchors = _stack([_anchors(s) for s in series])
+    computed = compute_indicators(fields, outputs, params, anchors)
+
+    rows = np.arange(len(bars))
+    aligned = {}
+    for k, interval in enumerate(intervals):
+        tf_bars, ends = frames[interval]
+        # Latest bar closed by each source row (-1 before the first one closes)
+        idx = np.searchsorted(ends, rows, side="right") - 1
+        have = idx >= 0
+        take = np.maximum(idx, 0)
+        aligned[interval] = {
+            "ts": np.where(have, tf_bars.ts[take], -1),
+            **{name: np.where(have, values[take, k], np.nan) for name, values in computed.items()},
+        }
+    return aligned
@@ -0,0 +1,347 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Seconds a cached series is considered fresh, keyed by yfinance interval.
+# Intraday bars go stale quickly; weekly/monthly bars barely move intraday.
+DEFAULT_TTLS = {
+    "1m": 30,
+    "5m": 60,
+    "15m": 120,
+    "30m": 300,
+    "60m": 300,
+    "1d": 900,
+    "1wk": 3600,
+    "1mo": 6 * 3600,
+}
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# On-disk layout: one structured array per (symbol, interval), loadable with mmap.
+BAR_DTYPE = np.dtype(
+    [("ts", "<i8")] + [(col, "<f8") for col in OHLCV_COLUMNS]
+)
+
+
+def slice_days(frame: pd.DataFrame, days: int) -> pd.DataFrame:
+    """Bars from the last `days` calendar days (same window as period=f"{days}d")."""
+    dates = frame["date"]
+    tz = getattr(dates.dtype, "tz", None)
+    now = pd.Timestamp.now(tz=tz)
+    if tz is None:
+        now = now.normalize()
+    # Bars are stored oldest first, so the window is a suffix
+    start = int(dates.searchsorted(now - pd.Timedelta(days=days)))
+    return frame.iloc[start:].reset_index(drop=True)
+
+
+class CacheEntry:
+    __slots__ = ("frame", "fetched_at", "days")
+
+    def __init__(self, frame: pd.DataFrame, fetched_at: float, days: int):
+        self.frame = frame
+        self.fetched_at = fetched_at
+        self.days = days
+
+
+class OHLCVCache:
+    """
+    Two-tier OHLCV cache.
+
+    Tier 1 is an in-process LRU with per-interval TTLs.
+    Tier 2 is a columnar on-disk store (memory-mapped NumPy files keyed by
+    symbol/interval) so warm series survive restarts. Disk writes happen on
+    a background writer thread, so `put` never blocks the event loop on
+    file I/O; repeated writes of one key coalesce to the latest entry.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: int = 256,
+        ttls: Optional[Dict[str, int]] = None
+    ):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._entries: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Disk writes queued for the writer thread, plus how many are in flight
+        self._pending: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._writing = 0
+        self._writes = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "writes": 0,
+            "incremental_updates": 0,
+            "disk_errors": 0,
+        }
+
+    # ------------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------------
+    def get(self, symbol: str, interval: str, days: int) -> Optional[pd.DataFrame]:
+        """
+        Return a fresh copy of the cached series covering `days`, or None.
+        """
+        key = self._key(symbol, interval)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            source = "memory"
+
+        if entry is None:
+            entry = self._load_from_disk(key)
+            source = "disk"
+            if entry is not None:
+                self._store(key, entry)
+
+        with self._lock:
+            if entry is None or entry.days < days:
+                self._stats["misses"] += 1
+                return None
+            if not self._is_fresh(entry, interval):
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits" if source == "memory" else "disk_hits"] += 1
+
+        return slice_days(entry.frame, days)
+
+    def put(self, symbol: str, interval: str, days: int, frame: pd.DataFrame) -> None:
+        """Store a normalized OHLCV frame in memory and queue its disk write."""
+        if frame is None or frame.empty:
+            return
+
+        key = self._key(symbol, interval)
+        entry = CacheEntry(frame.copy(), time.time(), days)
+        self._store(key, entry)
+        self._queue_write(key, entry)
+
+        with self._lock:
+            self._stats["writes"] += 1
+
+    def peek(self, symbol: str, interval: str) -> Optional[CacheEntry]:
+        """
+        Return the stored entry even if it has expired (no copy, no stats).
+        Used as the base for incremental refreshes.
+        """
+        key = self._key(symbol, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self._store(key, entry)
+        return entry
+
+    def last_bar(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest stored bar for (symbol, interval)."""
+        entry = self.peek(symbol, interval)
+        if entry is None or entry.frame.empty:
+            return None
+        return entry.frame["date"].iloc[-1]
+
+    def merge_tail(self, symbol: str, interval: str, tail: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Merge newly fetched bars into the stored series.
+
+        Bars at or after the first tail timestamp are replaced, so the
+        still-forming last candle is overwritten rather than duplicated.
+        Bars that fall out of the stored window are trimmed.
+        """
+        entry = self.peek(symbol, interval)
+        if entry is None:
+            return None
+
+        base = entry.frame
+        if tail is not None and not tail.empty:
+            base = base.loc[base["date"] < tail["date"].iloc[0]]
+            base = pd.concat([base, tail], ignore_index=True)
+
+        merged = slice_days(base, entry.days)
+        self.put(symbol, interval, entry.days, merged)
+
+        with self._lock:
+            self._stats["incremental_updates"] += 1
+
+        return merged
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued disk writes to finish; False if `timeout` ran out first."""
+        with self._writes:
+            return self._writes.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def ttl_for(self, interval: str) -> int:
+        return self.ttls.get(interval, DEFAULT_TTLS["1d"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters plus current size, for capacity sizing."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = self._stats["hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": int(sum(
+                    e.frame.memory_usage(deep=False).sum() for e in self._entries.values()
+                )),
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "disk_enabled": bool(self.cache_dir),
+                "pending_writes": len(self._pending) + self._writing,
+            }
+
+    # ------------------------------------------------------------
+    # INTERNALS
+    # ------------------------------------------------------------
+    @staticmethod
+    def _key(symbol: str, interval: str) -> tuple:
+        return (symbol.upper().strip(), interval)
+
+    def _is_fresh(self, entry: CacheEntry, interval: str) -> bool:
+        return (time.time() - entry.fetched_at) < self.ttl_for(interval)
+
+    def _store(self, key: tuple, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _paths(self, key: tuple) -> tuple:
+        symbol, interval = key
+        # Keep symbols like BRK/A or ^GSPC filesystem safe
+        safe_symbol = "".join(c if c.isalnum() or c in "-_." else "_" for c in symbol)
+        base = os.path.join(self.cache_dir, safe_symbol)
+        return base, os.path.join(base, f"{interval}.npy"), os.path.join(base, f"{interval}.json")
+
+    def _queue_write(self, key: tuple, entry: CacheEntry) -> None:
+        if not self.cache_dir:
+            return
+        with self._writes:
+            self._pending[key] = entry
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="ohlcv-cache-writer", daemon=True)
+                self._writer.start()
+            self._writes.notify_all()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._writes:
+                self._writes.wait_for(lambda: self._pending)
+                key, entry = self._pending.popitem(last=False)
+                self._writing += 1
+            try:
+                self._write_to_disk(key, entry)
+            finally:
+                with self._writes:
+                    self._writing -= 1
+                    self._writes.notify_all()
+
+    def _write_to_disk(self, key: tuple, entry: CacheEntry) -> None:
+        if not self.cache_dir:
+            return
+
+        try:
+            base, data_path, meta_path = self._paths(key)
+            os.makedirs(base, exist_ok=True)
+
+            dates = pd.DatetimeIndex(entry.frame["date"])
+            bars = np.empty(len(entry.frame), dtype=BAR_DTYPE)
+            bars["ts"] = dates.as_unit("ns").asi8
+            for col in OHLCV_COLUMNS:
+                bars[col] = entry.frame[col].to_numpy(dtype="f8")
+
+            meta = {
+                "fetched_at": entry.fetched_at,
+                "days": entry.days,
+                "tz": str(dates.tz) if dates.tz is not None else None,
+            }
+
+            # Write-then-rename so readers never see a half-written file
+            tmp_data = data_path + ".tmp"
+            with open(tmp_data, "wb") as fh:
+                np.save(fh, bars)
+            os.replace(tmp_data, data_path)
+
+            tmp_meta = meta_path + ".tmp"
+            with open(tmp_meta, "w") as fh:
+                json.dump(meta, fh)
+            os.replace(tmp_meta, meta_path)
+
+        except Exception as e:
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            logger.warning("⚠ OHLCV cache disk write failed", key=key, error=str(e))
+
+    def _load_from_disk(self, key: tuple) -> Optional[CacheEntry]:
+        if not self.cache_dir:
+            return None
+
+        # Evicted from memory before the writer got to it
+        with self._writes:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+
+        _, data_path, meta_path = self._paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+
+        try:
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+            bars = np.load(data_path, mmap_mode="r")
+
+            if meta.get("tz"):
+                dates = pd.to_datetime(bars["ts"], unit="ns", utc=True).tz_convert(meta["tz"])
+            else:
+                dates = pd.to_datetime(bars["ts"], unit="ns")
+
+            frame = pd.DataFrame({"date": dates})
+            for col in OHLCV_COLUMNS:
+                frame[col] = np.asarray(bars[col])
+
+            return CacheEntry(frame, float(meta["fetched_at"]), int(meta["days"]))
+
+        except Exception as e:
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            logger.warning("⚠ OHLCV cache disk read failed", key=key, error=str(e))
+            return None
+
+
+# Shared across requests (routes build a fresh DataFetcher per call)
+ohlcv_cache = OHLCVCache(
+    # Replayed bars must never mix with real ones on disk
+    cache_dir=(
+        os.path.join(settings.ohlcv_cache_dir, "replay")
+        if settings.market_data_provider == "replay"
+        else settings.ohlcv_cache_dir
+    ),
+    max_entries=settings.ohlcv_cache_max_entries
+)
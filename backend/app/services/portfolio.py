@@ -0,0 +1,101 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.models import Position
+from app.services.bar_series import format_dates
+from app.services.lot_matching import NS_PER_DAY, LotMatch
+from app.services.risk_management import RiskManagement
+
+
+def portfolio_summary(positions: List[Position]) -> Dict[str, Any]:
+    """
+    Trade count, traded value and realized PnL from the positions
+    projection (one row per symbol); win rate is the share of symbols
+    with a realized gain.
+    """
+    if not positions:
+        return {
+            "total_trades": 0,
+            "total_value": 0,
+            "win_rate": 0,
+            "total_pnl": 0,
+            "sharpe_ratio": 0,
+            "open_positions": 0
+        }
+
+    total_trades = sum(p.trade_count for p in positions)
+    total_value = sum(p.traded_value for p in positions)
+    pnl = sum(p.realized_pnl for p in positions)
+    winning_symbols = sum(1 for p in positions if p.realized_pnl > 0)
+
+    win_rate = (winning_symbols / len(positions)) * 100
+    sharpe_ratio = pnl / total_value if total_value > 0 else 0
+
+    return {
+        "total_trades": total_trades,
+        "total_value": round(total_value, 2),
+        "win_rate": round(win_rate, 2),
+        "total_pnl": round(pnl, 2),
+        "sharpe_ratio": round(sharpe_ratio, 4),
+        "open_positions": sum(1 for p in positions if p.quantity != 0)
+    }
+
+
+def realized_pnl_report(match: LotMatch, recent_lots: int = 100) -> Dict[str, Any]:
+    """
+    Realized PnL, holding periods and round-trip win rate from matched
+    lots, with totals per symbol and the most recently closed lots.
+    """
+    lots, trips = match.lots, match.round_trips
+    closed_lots = np.flatnonzero(lots["closed"])
+    closed_trips = trips["closed"]
+    holding = lots["holding_days"][closed_lots]
+    trip_days = (trips["close_ts"][closed_trips] - trips["open_ts"][closed_trips]) / NS_PER_DAY
+
+    count = len(match.symbols)
+    realized = np.bincount(lots["symbol"], lots["pnl"], minlength=count)
+    trip_count = np.bincount(trips["symbol"][closed_trips], minlength=count)
+    trip_wins = np.bincount(trips["symbol"][closed_trips & (trips["pnl"] > 0)], minlength=count)
+
+    recent = closed_lots[np.argsort(lots["close_ts"][closed_lots], kind="stable")[::-1][:recent_lots]]
+    opened = format_dates(lots["open_ts"][recent])
+    closed = format_dates(lots["close_ts"][recent])
+    return {
+        "method": match.method,
+        "total_pnl": round(float(realized.sum()), 2),
+        "win_rate": RiskManagement.calculate_win_rate(match.win_rate_records()),
+        "closed_lots": len(closed_lots),
+        "open_lots": int((~lots["closed"]).sum()),
+        "open_round_trips": int((~closed_trips).sum()),
+        "holding_days": {
+            "lot_mean": round(float(holding.mean()), 2) if len(holding) else 0,
+            "lot_median": round(float(np.median(holding)), 2) if len(holding) else 0,
+            "round_trip_mean": round(float(trip_days.mean()), 2) if len(trip_days) else 0,
+        },
+        "by_symbol": [
+            {
+                "symbol": symbol,
+                "realized_pnl": round(float(realized[i]), 2),
+                "round_trips": int(trip_count[i]),
+                "winning_round_trips": int(trip_wins[i]),
+            }
+            for i, symbol in enumerate(match.symbols.tolist())
+        ],
+        "recent_lots": [
+            {
+                "symbol": match.symbols[lots["symbol"][i]],
+                "side": "long" if lots["side"][i] > 0 else "short",
+                "quantity": float(lots["quantity"][i]),
+                "open_trade_id": int(lots["open_id"][i]) if lots["open_id"][i] >= 0 else None,
+                "close_trade_id": int(lots["close_id"][i]),
+                "opened": opened[k],
+                "closed": closed[k],
+                "open_price": round(float(lots["open_price"][i]), 4),
+                "close_price": round(float(lots["close_price"][i]), 4),
+                "pnl": round(float(lots["pnl"][i]), 2),
+                "holding_days": round(float(lots["holding_days"][i]), 2),
+            }
+            for k, i in enumerate(recent.tolist())
+        ],
+    }
@@ -0,0 +1,160 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Position, Trade
+
+# Quantities this close to zero are treated as flat (float residue of partial closes)
+FLAT_EPSILON = 1e-9
+
+# Dialect -> INSERT construct supporting ON CONFLICT DO NOTHING
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+# ------------------------------------------------------------
+# AVERAGE-COST BOOKKEEPING
+# ------------------------------------------------------------
+def apply_trade(position: Position, trade_type: str, quantity: float, price: float) -> None:
+    """
+    Fold one trade into `position` at average cost. Trades against the open
+    side realize PnL on the closed quantity; any excess opens the other
+    side at the trade price.
+    """
+    position.trade_count = (position.trade_count or 0) + 1
+    position.traded_value = (position.traded_value or 0.0) + quantity * price
+    if trade_type not in ("buy", "sell"):
+        return
+
+    signed = quantity if trade_type == "buy" else -quantity
+    open_qty, cost = position.quantity or 0.0, position.cost_basis or 0.0
+
+    if open_qty == 0 or (open_qty > 0) == (signed > 0):
+        open_qty += signed
+        cost += signed * price
+    else:
+        closed = min(abs(signed), abs(open_qty))
+        direction = 1.0 if open_qty > 0 else -1.0
+        average = cost / open_qty
+        position.realized_pnl = (position.realized_pnl or 0.0) + closed * (price - average) * direction
+        open_qty -= closed * direction
+        cost -= closed * average * direction
+
+        remainder = abs(signed) - closed
+        if remainder > FLAT_EPSILON:
+            open_qty = -direction * remainder
+            cost = open_qty * price
+
+    if abs(open_qty) < FLAT_EPSILON:
+        open_qty, cost = 0.0, 0.0
+    position.quantity = open_qty
+    position.cost_basis = cost
+
+
+def _reset(position: Position) -> None:
+    position.quantity = 0.0
+    position.cost_basis = 0.0
+    position.realized_pnl = 0.0
+    position.trade_count = 0
+    position.traded_value = 0.0
+
+
+# ------------------------------------------------------------
+# TRANSACTIONAL UPDATES
+# Called inside the request's transaction, before commit, so the
+# projection commits or rolls back together with the trades.
+# ------------------------------------------------------------
+def _locked_positions(db: Session, user_id: int, symbols: Iterable[str]) -> Dict[str, Position]:
+    """
+    Rows for `symbols`, locked for update. Missing rows are inserted
+    first (ON CONFLICT DO NOTHING) so that two requests opening the same
+    new symbol both end up locking the one row instead of racing to
+    insert it.
+    """
+    symbols = sorted(set(symbols))
+    if not symbols:
+        return {}
+    insert = _UPSERTS[db.get_bind().dialect.name]
+    db.execute(
+        insert(Position)
+        .values([{"user_id": user_id, "symbol": symbol} for symbol in symbols])
+        .on_conflict_do_nothing(index_elements=["user_id", "symbol"])
+    )
+    rows = (
+        db.query(Position)
+        .filter(Position.user_id == user_id, Position.symbol.in_(symbols))
+        .with_for_update()
+        .all()
+    )
+    return {row.symbol: row for row in rows}
+
+
+def record_trades(db: Session, user_id: int, trades: List[Trade]) -> None:
+    """
+    Apply newly inserted trades, oldest first. New trades are always the
+    latest (timestamps default to now), so folding them onto the current
+    state equals a full replay.
+    """
+    if not trades:
+        return
+    positions = _locked_positions(db, user_id, (t.symbol for t in trades))
+    for trade in trades:
+        apply_trade(positions[trade.symbol], trade.trade_type, trade.quantity, trade.price)
+
+
+def recompute_symbols(db: Session, user_id: int, symbols: Iterable[str]) -> None:
+    """
+    Replay the trade log of `symbols` after an edit or delete (average cost
+    depends on order, so history cannot be patched in place). Pending
+    changes are flushed first; symbols left without trades are removed.
+    """
+    db.flush()
+    positions = _locked_positions(db, user_id, symbols)
+    for position in positions.values():
+        _reset(position)
+
+    trades = (
+        db.query(Trade.symbol, Trade.trade_type, Trade.quantity, Trade.price)
+        .filter(Trade.user_id == user_id, Trade.symbol.in_(list(positions)))
+        .order_by(Trade.timestamp, Trade.id)
+    )
+    for symbol, trade_type, quantity, price in trades:
+        apply_trade(positions[symbol], trade_type, quantity, price)
+
+    for position in positions.values():
+        if position.trade_count == 0:
+            db.delete(position)
+
+
+# ------------------------------------------------------------
+# REBUILD
+# ------------------------------------------------------------
+def rebuild_positions(db: Session, user_id: Optional[int] = None, batch_size: int = 10_000) -> int:
+    """
+    Recompute the projection from the trade log for one user or everyone,
+    replacing existing rows in one transaction. Returns the rows written.
+    """
+    stale = db.query(Position)
+    trades = db.query(Trade.user_id, Trade.symbol, Trade.trade_type, Trade.quantity, Trade.price)
+    if user_id is not None:
+        stale = stale.filter(Position.user_id == user_id)
+        trades = trades.filter(Trade.user_id == user_id)
+    stale.delete(synchronize_session=False)
+
+    positions: Dict[tuple, Position] = {}
+    ordered = trades.order_by(Trade.user_id, Trade.symbol, Trade.timestamp, Trade.id).yield_per(batch_size)
+    for owner, symbol, trade_type, quantity, price in ordered:
+        position = positions.get((owner, symbol))
+        if position is None:
+            position = positions[(owner, symbol)] = Position(user_id=owner, symbol=symbol)
+            _reset(position)
+        apply_trade(position, trade_type, quantity, price)
+
+    db.add_all(positions.values())
+    db.commit()
+    return len(positions)
+
+
+def load_positions(db: Session, user_id: int) -> List[Position]:
+    """The user's positions, one row per traded symbol."""
+    return db.query(Position).filter(Position.user_id == user_id).order_by(Position.symbol).all()
@@ -1,25 +1,16 @@
 # backend/app/services/price_stream.py
-import asyncio
-import websockets
-import json
-import os
+from app.providers import get_market_data_provider
+from app.services.quote_service import quote_service
+from app.services.indicator_stream import indicator_engine
 
-FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
 
 async def stream_prices(symbols, callback):
-    url = f"wss://ws.finnhub.io?token={FINNHUB_API_KEY}"
-
-    async with websockets.connect(url) as ws:
-        # Subscribe to each symbol
-        for symbol in symbols:
-            await ws.send(json.dumps({"type": "subscribe", "symbol": symbol}))
-
-        while True:
-            try:
-                msg = await ws.recv()
-                data = json.loads(msg)
-                if "data" in data:
-                    await callback(data["data"])
-            except Exception as e:
-                print("Error:", e)
-                await asyncio.sleep(3)
+    """
+    Forward live trades (Finnhub websocket, or recorded ticks in replay
+    mode) to `callback`.
+    """
+    async for trades in get_market_data_provider().stream_ticks(symbols):
+        # Keep the shared last-trade table current for quote lookups
+        quote_service.record_trades(trades)
+        indicator_engine.on_trades(trades)
+        await callback(trades)
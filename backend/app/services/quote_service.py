@@ -0,0 +1,156 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import structlog
+
+from app.core.config import settings
+from app.core.rate_limiter import Priority
+
+logger = structlog.get_logger()
+
+
+class QuoteService:
+    """
+    Latest price and recent volume per symbol.
+
+    Lookup order for a quote:
+      1. last-trade table fed by the Finnhub websocket stream
+      2. micro-TTL cache of Finnhub /quote responses
+      3. a (coalesced) Finnhub /quote call
+    """
+
+    def __init__(self, quote_ttl: float = 2.0, stream_max_age: float = 15.0):
+        self.quote_ttl = quote_ttl
+        self.stream_max_age = stream_max_age
+        self._last_trades: Dict[str, Dict[str, Any]] = {}
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._stats = {
+            "ticks": 0,
+            "stream_hits": 0,
+            "cache_hits": 0,
+            "upstream_fetches": 0,
+            "upstream_failures": 0,
+        }
+
+    # ------------------------------------------------------------
+    # STREAM INGEST
+    # ------------------------------------------------------------
+    def record_trades(self, trades: Iterable[Dict[str, Any]]) -> None:
+        """
+        Update the last-trade table from Finnhub trade messages
+        ({"s": symbol, "p": price, "v": volume, "t": epoch ms}).
+        """
+        for trade in trades:
+            symbol = trade.get("s")
+            price = trade.get("p")
+            if not symbol or price is None:
+                continue
+
+            ts = trade.get("t") or time.time() * 1000
+            last = self._last_trades.get(symbol)
+            if last is not None and last["t"] > ts:
+                continue  # out-of-order tick
+
+            self._last_trades[symbol] = {
+                "price": float(price),
+                "volume": float(trade.get("v") or 0),
+                "t": ts,
+                "received_at": time.time(),
+            }
+            self._stats["ticks"] += 1
+
+    # ------------------------------------------------------------
+    # QUOTES
+    # ------------------------------------------------------------
+    async def get_quote(self, symbol: str, priority: Priority = Priority.INTERACTIVE) -> Optional[Dict[str, Any]]:
+        symbol = symbol.upper().strip()
+
+        trade = self._last_trades.get(symbol)
+        if trade is not None and time.time() - trade["received_at"] < self.stream_max_age:
+            self._stats["stream_hits"] += 1
+            return {
+                "symbol": symbol,
+                "price": trade["price"],
+                "timestamp": trade["t"] / 1000,
+                "source": "stream",
+            }
+
+        cached = self._quotes.get(symbol)
+        if cached is not None and time.time() - cached["fetched_at"] < self.quote_ttl:
+            self._stats["cache_hits"] += 1
+            return cached["quote"]
+
+        quote = await self._fetch_quote(symbol, priority)
+        if quote is not None:
+            self._quotes[symbol] = {"quote": quote, "fetched_at": time.time()}
+        return quote
+
+    async def get_quotes(
+        self,
+        symbols: Iterable[str],
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Batch lookup; table/cache hits are free, misses are fetched concurrently."""
+        unique = list(dict.fromkeys(s.upper().strip() for s in symbols if s))
+        quotes = await asyncio.gather(*(self.get_quote(s, priority) for s in unique))
+        return dict(zip(unique, quotes))
+
+    async def get_current_price(self, symbol: str, priority: Priority = Priority.INTERACTIVE) -> Optional[float]:
+        quote = await self.get_quote(symbol, priority)
+        return quote["price"] if quote else None
+
+    async def _fetch_quote(self, symbol: str, priority: Priority) -> Optional[Dict[str, Any]]:
+        # Imported here: data_fetcher delegates back to this service
+        from app.services.data_fetcher import DataFetcher
+
+        self._stats["upstream_fetches"] += 1
+        data = await DataFetcher().get_realtime_price(symbol, priority=priority)
+
+        # Finnhub answers unknown symbols with c == 0
+        if not data or not data.get("c"):
+            self._stats["upstream_failures"] += 1
+            return None
+
+        return {
+            "symbol": symbol,
+            "price": float(data["c"]),
+            "previous_close": data.get("pc"),
+            "timestamp": data.get("t"),
+            "source": "finnhub",
+        }
+
+    # ------------------------------------------------------------
+    # VOLUME
+    # ------------------------------------------------------------
+    async def get_volume_data(
+        self,
+        symbol: str,
+        bars: int = 20,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> List[float]:
+        """
+        Recent daily volumes, oldest first, from the cached OHLCV series.
+        The last element is today's (still forming) bar.
+        """
+        from app.services.data_fetcher import DataFetcher
+
+        # Calendar days: leave room for weekends and holidays
+        df = await DataFetcher().get_ohlcv_series(symbol, resolution="D", days=bars * 2, priority=priority)
+        if df is None or df.empty:
+            return []
+        return df["volume"].astype(float).tail(bars).tolist()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "streamed_symbols": len(self._last_trades),
+            "cached_quotes": len(self._quotes),
+        }
+
+
+# Shared last-trade table, fed by services/price_stream.py
+quote_service = QuoteService(
+    quote_ttl=settings.quote_cache_ttl,
+    stream_max_age=settings.quote_stream_max_age
+)
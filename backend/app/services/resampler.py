@@ -0,0 +1,133 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.bar_series import BarSeries
+from app.services.ohlcv_cache import OHLCV_COLUMNS
+
+# Higher timeframes built locally, keyed by yfinance interval -> source interval
+RESAMPLE_SOURCES = {
+    "1wk": "1d",
+    "1mo": "1d",
+    "5m": "1m",
+    "15m": "1m",
+    "30m": "1m",
+    "60m": "1m",
+}
+
+# Yahoo only serves about a week of 1m bars; longer intraday windows are fetched natively
+MAX_1M_DAYS = 7
+
+MINUTES = {"5m": 5, "15m": 15, "30m": 30, "60m": 60}
+
+DAY_NS = 86_400 * 10**9
+MINUTE_NS = 60 * 10**9
+
+
+def resample_source(interval: str, days: int) -> Optional[str]:
+    """Interval to build `interval` from, or None when it must be fetched as is."""
+    source = RESAMPLE_SOURCES.get(interval)
+    if source == "1m" and days > MAX_1M_DAYS:
+        return None
+    return source
+
+
+def _bucket_keys(ts: np.ndarray, local: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Bucket of each bar: the local-midnight day, Monday or first of month
+    for 1d/1wk/1mo, the UTC start of the session-anchored bucket intraday.
+    """
+    if interval == "1d":
+        return local // DAY_NS * DAY_NS
+    if interval == "1wk":
+        day = local // DAY_NS
+        # 1970-01-01 was a Thursday: (day + 3) % 7 == 0 on Mondays
+        return (day - (day + 3) % 7) * DAY_NS
+    if interval == "1mo":
+        return local.astype("datetime64[ns]").astype("datetime64[M]").astype("datetime64[ns]").astype(np.int64)
+    if interval in MINUTES:
+        step = MINUTES[interval] * MINUTE_NS
+        day = local // DAY_NS
+        day_starts = np.r_[0, np.flatnonzero(np.diff(day)) + 1]
+        session_open = np.repeat(ts[day_starts], np.diff(np.r_[day_starts, len(ts)]))
+        return session_open + (ts - session_open) // step * step
+    raise ValueError(f"Cannot resample to interval {interval}")
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate a normalized OHLCV frame (oldest first) into `interval` bars:
+    open = first, high = max, low = min, close = last, volume = sum.
+
+    Weekly bars are labelled with their Monday and monthly bars with the
+    first of the month. Intraday buckets are anchored at each session's
+    first bar, so 60m bars start at 9:30 like Yahoo's.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["date"] + OHLCV_COLUMNS)
+
+    dates = pd.DatetimeIndex(df["date"]).as_unit("ns")
+    ts = dates.asi8
+    # Wall-clock time decides which day/week/month a bar belongs to
+    local = dates.tz_localize(None).asi8 if dates.tz is not None else ts
+    keys = _bucket_keys(ts, local, interval)
+
+    starts = np.r_[0, np.flatnonzero(np.diff(keys)) + 1]
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    labels = keys[starts]
+    if interval in MINUTES:
+        out_dates = pd.to_datetime(labels, unit="ns", utc=dates.tz is not None)
+        if dates.tz is not None:
+            out_dates = out_dates.tz_convert(dates.tz)
+    else:
+        out_dates = pd.to_datetime(labels, unit="ns")
+        if dates.tz is not None:
+            out_dates = out_dates.tz_localize(dates.tz)
+
+    return pd.DataFrame({
+        "date": out_dates,
+        "open": df["open"].to_numpy(dtype=float)[starts],
+        "high": np.maximum.reduceat(df["high"].to_numpy(dtype=float), starts),
+        "low": np.minimum.reduceat(df["low"].to_numpy(dtype=float), starts),
+        "close": df["close"].to_numpy(dtype=float)[ends],
+        "volume": np.add.reduceat(df["volume"].to_numpy(dtype=float), starts),
+    })
+
+
+def resample_bars(bars: BarSeries, interval: str) -> Tuple[BarSeries, np.ndarray]:
+    """
+    resample_ohlcv for a BarSeries. Also returns, for each new bar, the row
+    of the last source bar it covers, i.e. the source bar at whose close
+    the resampled bar's current values are known.
+    """
+    if len(bars) == 0:
+        return BarSeries.empty(bars.symbol, interval), np.empty(0, dtype=np.int64)
+
+    ts = bars.ts
+    local = ts
+    if bars.tz:
+        local = pd.DatetimeIndex(ts.view("datetime64[ns]")).tz_localize("UTC").tz_convert(bars.tz).tz_localize(None).asi8
+    keys = _bucket_keys(ts, local, interval)
+
+    starts = np.r_[0, np.flatnonzero(np.diff(keys)) + 1]
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    labels = keys[starts]
+    if bars.tz and interval not in MINUTES:
+        # Day/week/month labels are local midnights
+        labels = pd.to_datetime(labels, unit="ns").tz_localize(bars.tz).as_unit("ns").asi8
+
+    resampled = BarSeries(
+        labels,
+        bars.open[starts],
+        np.maximum.reduceat(bars.high, starts),
+        np.minimum.reduceat(bars.low, starts),
+        bars.close[ends],
+        np.add.reduceat(bars.volume, starts),
+        symbol=bars.symbol,
+        interval=interval,
+        tz=bars.tz,
+    )
+    return resampled, ends
@@ -1,14 +1,18 @@
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Union
+
+# Plain lists or read-only BarSeries arrays (used as is, not copied)
+Prices = Union[Sequence[float], np.ndarray]
 
 class RiskManagement:
     
     @staticmethod
-    def calculate_max_drawdown(prices: List[float]) -> Dict[str, Any]:
+    def calculate_max_drawdown(prices: Prices) -> Dict[str, Any]:
         if len(prices) < 2:
-            return {"max_drawdown": 0, "peak": prices[0] if prices else 0, "trough": prices[0] if prices else 0}
+            first = float(prices[0]) if len(prices) else 0
+            return {"max_drawdown": 0, "peak": first, "trough": first}
 
-        prices_array = np.array(prices)
+        prices_array = np.asarray(prices, dtype=float)
         cumulative = np.maximum.accumulate(prices_array)
         drawdowns = (cumulative - prices_array) / cumulative
 
@@ -19,15 +23,15 @@ class RiskManagement:
             "max_drawdown": float(drawdowns[max_drawdown_idx]),
             "peak": float(prices_array[peak_idx]),
             "trough": float(prices_array[max_drawdown_idx]),
-            "drawdown_period": max_drawdown_idx - peak_idx,
+            "drawdown_period": int(max_drawdown_idx - peak_idx),
         }
 
     @staticmethod
-    def calculate_sharpe_ratio(returns: List[float], risk_free_rate: float = 0.02) -> float:
+    def calculate_sharpe_ratio(returns: Prices, risk_free_rate: float = 0.02) -> float:
         if len(returns) < 2:
             return 0.0
 
-        returns_array = np.array(returns)
+        returns_array = np.asarray(returns, dtype=float)
         excess_returns = returns_array - risk_free_rate / 252  # Assuming daily returns
         avg_excess_return = np.mean(excess_returns)
         std_excess_return = np.std(excess_returns)
@@ -53,20 +57,19 @@ class RiskManagement:
         }
 
     @staticmethod
-    def calculate_portfolio_metrics(prices: List[float], trades: List[Dict[str, Any]]) -> Dict[str, Any]:
-        returns = []
-        for i in range(1, len(prices)):
-            returns.append((prices[i] - prices[i-1]) / prices[i-1])
+    def calculate_portfolio_metrics(prices: Prices, trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+        prices = np.asarray(prices, dtype=float)
+        returns = np.diff(prices) / prices[:-1] if len(prices) > 1 else np.empty(0)
 
         return {
             "max_drawdown": RiskManagement.calculate_max_drawdown(prices),
             "sharpe_ratio": RiskManagement.calculate_sharpe_ratio(returns),
             "win_rate": RiskManagement.calculate_win_rate(trades),
-            "total_return": (prices[-1] - prices[0]) / prices[0] if prices else 0,
-            "volatility": float(np.std(returns)) * np.sqrt(252) if returns else 0,
+            "total_return": float((prices[-1] - prices[0]) / prices[0]) if len(prices) else 0,
+            "volatility": float(np.std(returns)) * np.sqrt(252) if len(returns) else 0,
         }
         
-    def calculate_risk_metrics(self, returns: List[float]) -> Dict[str, float]:
+    def calculate_risk_metrics(self, returns: Prices) -> Dict[str, float]:
         """
         Simple risk metric wrapper to maintain compatibility
         with /analytics/risk-metrics endpoint.
@@ -79,16 +82,19 @@ class RiskManagement:
                 "sharpe_ratio": 0,
                 "volatility": 0,
                 "var_95": 0,
+                "cvar_95": 0,
             }
 
         # Convert returns to numpy
-        r = np.array(returns)
+        r = np.asarray(returns, dtype=float)
 
         sharpe = self.calculate_sharpe_ratio(r)
         volatility = float(np.std(r) * np.sqrt(252))
 
-        # Value-at-Risk (95%) using normal distribution
+        # Value-at-Risk (95%): historical 5th percentile of returns
         var_95 = float(np.percentile(r, 5))
+        # Expected shortfall: mean of the returns at or below it
+        cvar_95 = float(r[r <= var_95].mean())
 
         # To compute drawdown we need a price series
         # So reconstruct a pseudo price series (cumulative product)
@@ -101,6 +107,7 @@ class RiskManagement:
             "sharpe_ratio": float(sharpe),
             "volatility": float(volatility),
             "var_95": float(var_95),
+            "cvar_95": cvar_95,
         }
 
 risk_management = RiskManagement()
@@ -0,0 +1,248 @@
+import ast
+import asyncio
+import math
+import operator
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.executor import cpu_pool
+from app.services.bar_series import BarPanel, BarSeries
+from app.services.technical_analysis import TechnicalAnalysis
+
+# Price fields, then indicator fields, usable in expressions
+PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+INDICATOR_FIELDS = [
+    "rsi", "macd", "macd_signal", "macd_histogram", "sma", "ema",
+    "bollinger_upper", "bollinger_middle", "bollinger_lower",
+]
+FIELDS = PRICE_FIELDS + INDICATOR_FIELDS
+
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_ARITHMETIC = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+class ScreenerExpressionError(ValueError):
+    """The filter or ranking expression is not valid screener syntax."""
+
+
+class Expression:
+    """
+    A screener expression, evaluated for every symbol at once.
+
+        rsi < 30 and close > sma
+        close > bollinger_upper                  (breakout)
+        crosses_above(macd, macd_signal)         (bullish MACD cross)
+        close / prev(close) - 1 > 0.05
+
+    Names are FIELDS at each symbol's latest bar. prev(x) is x one bar
+    earlier; crosses_above / crosses_below compare the last two bars.
+    Only this grammar is accepted: no attribute access, no other calls.
+    """
+
+    FUNCTIONS = {"prev": 1, "abs": 1, "crosses_above": 2, "crosses_below": 2}
+    # Bounds on user input: parsing and evaluation both recurse on the tree
+    MAX_LENGTH = 1000
+    MAX_DEPTH = 50
+
+    def __init__(self, text: str):
+        self.text = text
+        if len(text) > self.MAX_LENGTH:
+            raise ScreenerExpressionError(f"Expression is longer than {self.MAX_LENGTH} characters")
+        try:
+            self.tree = ast.parse(text.strip(), mode="eval").body
+            self._check(self.tree)
+        except SyntaxError as e:
+            raise ScreenerExpressionError(f"Invalid expression: {e.msg}") from None
+        except (RecursionError, MemoryError):
+            raise ScreenerExpressionError("Expression is nested too deeply") from None
+
+    def _check(self, node: ast.AST, depth: int = 0) -> None:
+        if depth > self.MAX_DEPTH:
+            raise ScreenerExpressionError(f"Expression is nested more than {self.MAX_DEPTH} levels deep")
+        if isinstance(node, ast.BoolOp):
+            pass
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub, ast.UAdd)):
+            pass
+        elif isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            pass
+        elif isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            pass
+        elif isinstance(node, ast.Name):
+            if node.id not in FIELDS:
+                raise ScreenerExpressionError(f"Unknown field '{node.id}'. Available: {', '.join(FIELDS)}")
+        elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            pass
+        elif isinstance(node, ast.Call):
+            name = getattr(node.func, "id", None)
+            if name not in self.FUNCTIONS or node.keywords or len(node.args) != self.FUNCTIONS[name]:
+                raise ScreenerExpressionError(
+                    "Unsupported call. Available: prev(x), abs(x), crosses_above(a, b), crosses_below(a, b)"
+                )
+            for arg in node.args:
+                self._check(arg, depth + 1)
+            return
+        else:
+            raise ScreenerExpressionError(f"Unsupported syntax: {ast.dump(node)[:60]}")
+
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, (ast.operator, ast.unaryop, ast.boolop, ast.cmpop, ast.expr_context)):
+                self._check(child, depth + 1)
+
+    def evaluate(self, fields: Callable[[str, int], np.ndarray]) -> np.ndarray:
+        """`fields(name, lag)` returns one value per symbol, `lag` bars back."""
+        return self._eval(self.tree, fields, 0)
+
+    def _eval(self, node: ast.AST, fields: Callable[[str, int], np.ndarray], lag: int):
+        ev = lambda child, lag=lag: self._eval(child, fields, lag)
+
+        if isinstance(node, ast.Constant):
+            return float(node.value)
+        if isinstance(node, ast.Name):
+            return fields(node.id, lag)
+        if isinstance(node, ast.BoolOp):
+            values = [np.asarray(ev(v), dtype=bool) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = values[0]
+            for value in values[1:]:
+                result = combine(result, value)
+            return result
+        if isinstance(node, ast.UnaryOp):
+            operand = ev(node.operand)
+            if isinstance(node.op, ast.Not):
+                return ~np.asarray(operand, dtype=bool)
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return _ARITHMETIC[type(node.op)](ev(node.left), ev(node.right))
+        if isinstance(node, ast.Compare):
+            left, result = ev(node.left), True
+            with np.errstate(invalid="ignore"):
+                for op, comparator in zip(node.ops, node.comparators):
+                    right = ev(comparator)
+                    result = np.logical_and(result, _COMPARE[type(op)](left, right))
+                    left = right
+            return result
+
+        # Calls (validated in _check)
+        name, args = node.func.id, node.args
+        if name == "prev":
+            return ev(args[0], lag + 1)
+        if name == "abs":
+            return np.abs(ev(args[0]))
+        a_now, b_now = ev(args[0]), ev(args[1])
+        a_then, b_then = ev(args[0], lag + 1), ev(args[1], lag + 1)
+        with np.errstate(invalid="ignore"):
+            if name == "crosses_above":
+                return (a_now > b_now) & (a_then <= b_then)
+            return (a_now < b_now) & (a_then >= b_then)
+
+
+# ------------------------------------------------------------
+# SHARD WORKER (runs in a worker process)
+# ------------------------------------------------------------
+def screen_shard(panel: BarPanel, expression: str, rank_by: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Evaluate `expression` over one shard of symbols. Returns the matches
+    with their latest field values and rank value.
+    """
+    if not panel.symbols:
+        return []
+
+    indicators = TechnicalAnalysis().calculate_panel_indicators(panel, INDICATOR_FIELDS)
+
+    # Lags count each symbol's own bars, not panel rows: histories may end on
+    # different days and calendars differ, so the union timeline has gaps.
+    # bar_rows[k, j] is the panel row of symbol j's k-th bar.
+    valid = ~np.isnan(panel.close)
+    cols = np.arange(len(panel.symbols))
+    bar_rows = np.argsort(~valid, axis=0, kind="stable")
+    last = valid.sum(axis=0) - 1
+
+    def fields(name: str, lag: int) -> np.ndarray:
+        matrix = indicators[name] if name in indicators else getattr(panel, name)
+        bars = last - lag
+        rows = bar_rows[np.maximum(bars, 0), cols]
+        return np.where(bars >= 0, matrix[rows, cols], np.nan)
+
+    matched = np.asarray(Expression(expression).evaluate(fields), dtype=bool)
+    matched = np.broadcast_to(matched, cols.shape)
+    rank = Expression(rank_by).evaluate(fields) if rank_by else np.full(len(cols), np.nan)
+    rank = np.broadcast_to(np.asarray(rank, dtype=float), cols.shape)
+
+    latest = {name: fields(name, 0) for name in FIELDS}
+    return [
+        {
+            "symbol": panel.symbols[j],
+            "rank": _json_float(rank[j]),
+            **{name: _json_float(values[j]) for name, values in latest.items()},
+        }
+        for j in np.flatnonzero(matched)
+    ]
+
+
+def _json_float(value: float) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+# ------------------------------------------------------------
+# SCAN
+# ------------------------------------------------------------
+def load_universe() -> List[str]:
+    """Configured screener universe: settings.screener_universe_file, else settings.screener_universe."""
+    path = settings.screener_universe_file
+    if path and os.path.exists(path):
+        with open(path) as f:
+            symbols = [line.split("#")[0].strip().upper() for line in f]
+        return list(dict.fromkeys(s for s in symbols if s))
+    return list(dict.fromkeys(s.upper() for s in settings.screener_universe))
+
+
+def validate(expression: str, rank_by: Optional[str] = None) -> None:
+    """Raise ScreenerExpressionError for bad input before any data is fetched."""
+    Expression(expression)
+    if rank_by:
+        Expression(rank_by)
+
+
+async def run_screen(
+    series: Dict[str, BarSeries],
+    expression: str,
+    rank_by: Optional[str] = None,
+    descending: bool = False,
+    shard_size: int = settings.screener_shard_size
+) -> List[Dict[str, Any]]:
+    """
+    Screen `series` by symbol shard on the process pool and rank the matches
+    (symbols without a rank value go last, then alphabetical).
+    """
+    validate(expression, rank_by)
+
+    # Shards travel as aligned panels: a few large arrays pickle far
+    # faster than hundreds of small BarSeries
+    symbols = list(series)
+    shards = [
+        BarPanel.from_series({s: series[s] for s in symbols[i:i + shard_size]})
+        for i in range(0, len(symbols), shard_size)
+    ]
+    results = await asyncio.gather(*(cpu_pool.run(screen_shard, shard, expression, rank_by) for shard in shards))
+
+    matches = [match for shard in results for match in shard]
+    sign = -1 if descending else 1
+    matches.sort(key=lambda m: (m["rank"] is None, sign * (m["rank"] or 0), m["symbol"]))
+    return matches
@@ -1,10 +1,12 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import structlog
-import httpx
 import asyncio
 import json
 
+from app.core.http import http_clients
+from app.core.rate_limiter import rate_limiter, Priority, retry_after_seconds as _retry_after
+
 logger = structlog.get_logger()
 
 class SentimentAnalysis:
@@ -54,15 +56,18 @@ class SentimentAnalysis:
             "generationConfig": {"response_mime_type": "application/json"}
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(url, json=payload, timeout=10.0)
-                if response.status_code == 200:
-                    raw_text = response.json()["candidates"][0]["content"]["parts"][0]["text"]
-                    return json.loads(raw_text)
-            except Exception as e:
-                logger.error(f"Gemini call failed: {e}")
-            return {"score": 0, "sentiment": "neutral"}
+        try:
+            # Sentiment scans are background work: chat requests go first
+            await rate_limiter.acquire("gemini", Priority.BACKGROUND)
+            response = await http_clients.get("gemini").post(url, json=payload, timeout=10.0)
+            if response.status_code == 429:
+                rate_limiter.penalize("gemini", _retry_after(response))
+            if response.status_code == 200:
+                raw_text = response.json()["candidates"][0]["content"]["parts"][0]["text"]
+                return json.loads(raw_text)
+        except Exception as e:
+            logger.error(f"Gemini call failed: {e}")
+        return {"score": 0, "sentiment": "neutral"}
 
     def _fallback_sentiment(self):
         return {"score": 0, "sentiment": "neutral", "confidence": 0, "article_count": 0, "timestamp": datetime.now(timezone.utc).isoformat()}
\ No newline at end of file
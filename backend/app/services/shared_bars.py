@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from app.services.bar_series import BarSeries
+from app.services.ohlcv_cache import OHLCV_COLUMNS
+
+FIELDS = ["ts"] + OHLCV_COLUMNS
+
+
+class SharedBars:
+    """
+    Many BarSeries packed into one shared memory block for worker processes.
+
+    The block holds six back-to-back columns (ts then OHLCV), each the
+    concatenation of every symbol's bars. Only `handle` (block name plus
+    per-symbol offsets) is pickled; workers `attach` and get read-only
+    BarSeries views over the block, so bar data is never copied per task.
+    The creating process owns the block and must `close` it.
+    """
+
+    def __init__(self, shm: SharedMemory, handle: Dict[str, Any]):
+        self.shm = shm
+        self.handle = handle
+
+    @classmethod
+    def create(cls, series: Dict[str, BarSeries]) -> "SharedBars":
+        symbols = [symbol for symbol, bars in series.items() if len(bars)]
+        lengths = [len(series[s]) for s in symbols]
+        total = sum(lengths)
+        offsets = np.r_[0, np.cumsum(lengths)].tolist()
+
+        shm = SharedMemory(create=True, size=max(total, 1) * 8 * len(FIELDS))
+        columns = _columns(shm, total)
+        for i, symbol in enumerate(symbols):
+            bars = series[symbol]
+            for field in FIELDS:
+                columns[field][offsets[i]:offsets[i + 1]] = getattr(bars, field)
+
+        first = series[symbols[0]] if symbols else None
+        handle = {
+            "name": shm.name,
+            "total": total,
+            "symbols": {s: (offsets[i], offsets[i + 1]) for i, s in enumerate(symbols)},
+            "interval": first.interval if first else "1d",
+            "tz": first.tz if first else None,
+        }
+        return cls(shm, handle)
+
+    def subset(self, symbols: List[str]) -> Dict[str, Any]:
+        """Handle limited to `symbols`, so a task pickles only its own offsets."""
+        return {**self.handle, "symbols": {s: self.handle["symbols"][s] for s in symbols}}
+
+    @property
+    def nbytes(self) -> int:
+        return self.shm.size
+
+    def close(self) -> None:
+        """Release and remove the block (owner only)."""
+        if self.shm.name in _attached:
+            _close_quietly(_attached.pop(self.shm.name)[0])
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        _close_quietly(self.shm)
+
+
+def _columns(shm: SharedMemory, total: int) -> Dict[str, np.ndarray]:
+    columns = {}
+    for i, field in enumerate(FIELDS):
+        dtype = np.int64 if field == "ts" else np.float64
+        columns[field] = np.ndarray((total,), dtype=dtype, buffer=shm.buf, offset=i * total * 8)
+    return columns
+
+
+# ------------------------------------------------------------
+# WORKER SIDE
+# Mappings are kept per process so every task of a job reuses
+# one attach; the oldest are dropped beyond a few jobs.
+# ------------------------------------------------------------
+_attached: "OrderedDict[str, Tuple[SharedMemory, Dict[str, np.ndarray]]]" = OrderedDict()
+MAX_ATTACHED = 4
+
+
+def attach(handle: Dict[str, Any]) -> Dict[str, BarSeries]:
+    """Read-only BarSeries views over a SharedBars block for the handle's symbols."""
+    name = handle["name"]
+    if name in _attached:
+        _attached.move_to_end(name)
+    else:
+        # Pool workers share the creator's resource tracker, so attaching
+        # does not hand ownership (or the unlink) to the worker
+        shm = SharedMemory(name=name)
+        _attached[name] = (shm, _columns(shm, handle["total"]))
+        while len(_attached) > MAX_ATTACHED:
+            _, (old_shm, _) = _attached.popitem(last=False)
+            _close_quietly(old_shm)
+
+    columns = _attached[name][1]
+    return {
+        symbol: BarSeries(
+            *(columns[field][start:end] for field in FIELDS),
+            symbol=symbol, interval=handle["interval"], tz=handle["tz"],
+        )
+        for symbol, (start, end) in handle["symbols"].items()
+    }
+
+
+def _close_quietly(shm: SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # A view is still referenced somewhere; the mapping goes with the process
+        pass
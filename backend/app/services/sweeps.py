@@ -0,0 +1,402 @@
+import asyncio
+import itertools
+import math
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.core.executor import cpu_pool
+from app.services.backtester import STRATEGIES, YEAR_NS, ParameterConflict, simulate, strategy_params
+from app.services.bar_series import BarSeries, format_dates
+from app.services.shared_bars import SharedBars, attach
+
+logger = structlog.get_logger()
+
+# Metric -> direction (1 = higher is better) usable as a sweep objective
+OBJECTIVES = {"sharpe_ratio": 1, "total_return": 1, "cagr": 1, "max_drawdown": -1}
+
+# Candidates simulated together as one (T, K) target matrix
+CANDIDATE_BATCH = 256
+
+
+class SweepError(ValueError):
+    """Invalid sweep specification (space, objective or walk-forward windows)."""
+
+
+# ------------------------------------------------------------
+# PARAMETER SPACES
+# A space maps each parameter to a list of values or a range
+# {"min", "max"} (plus "step" for grids).
+# ------------------------------------------------------------
+def _grid_values(name: str, spec: Any) -> List[float]:
+    if isinstance(spec, dict):
+        if "step" not in spec:
+            raise SweepError(f"Grid range for '{name}' needs a step")
+        lo, hi, step = spec["min"], spec["max"], spec["step"]
+        if step <= 0 or hi < lo:
+            raise SweepError(f"Bad range for '{name}': need min <= max and step > 0")
+        values = np.round(np.arange(lo, hi + step / 2, step), 10).tolist()
+        return [int(v) for v in values] if all(float(x).is_integer() for x in (lo, step)) else values
+    return list(spec)
+
+
+def parameter_grid(space: Dict[str, Any]) -> List[Dict[str, float]]:
+    """Every combination of the space's values."""
+    names = list(space)
+    axes = [_grid_values(name, space[name]) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*axes)]
+
+
+def parameter_samples(space: Dict[str, Any], samples: int, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    `samples` random draws: lists are sampled uniformly, ranges uniformly
+    between min and max (whole numbers when both bounds are). Duplicate
+    draws are dropped, so small spaces may yield fewer candidates.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, spec in space.items():
+        if isinstance(spec, dict):
+            lo, hi = spec["min"], spec["max"]
+            if hi < lo:
+                raise SweepError(f"Bad range for '{name}': need min <= max")
+            if float(lo).is_integer() and float(hi).is_integer():
+                columns[name] = rng.integers(int(lo), int(hi) + 1, samples).tolist()
+            else:
+                columns[name] = rng.uniform(lo, hi, samples).tolist()
+        else:
+            values = list(spec)
+            if not values:
+                raise SweepError(f"No values for '{name}'")
+            columns[name] = [values[i] for i in rng.integers(0, len(values), samples)]
+
+    unique = OrderedDict()
+    for i in range(samples):
+        candidate = {name: columns[name][i] for name in space}
+        unique.setdefault(tuple(candidate.items()), candidate)
+    return list(unique.values())
+
+
+def build_candidates(
+    strategy: str,
+    space: Dict[str, Any],
+    mode: str = "grid",
+    samples: int = 100,
+    seed: Optional[int] = None
+) -> List[Dict[str, float]]:
+    """
+    Full parameter sets (defaults filled in) for a grid or random sweep,
+    without the combinations whose values conflict (a random sweep can so
+    return fewer than `samples`). Raises SweepError for unknown
+    strategies/parameters, bad values, or when no combination is left.
+    """
+    if mode not in ("grid", "random"):
+        raise SweepError(f"Unknown sweep mode '{mode}'. Available: grid, random")
+    try:
+        # Names first, so an unknown parameter fails before the space is expanded
+        defaults = strategy_params(strategy)
+        strategy_params(strategy, {name: defaults.get(name) for name in space})
+        partial = parameter_grid(space) if mode == "grid" else parameter_samples(space, samples, seed)
+
+        # Bad values fail the sweep; combinations that only contradict each
+        # other (fast >= slow from overlapping ranges) are skipped
+        candidates, conflict = [], None
+        for params in partial:
+            try:
+                candidates.append(strategy_params(strategy, params))
+            except ParameterConflict as e:
+                conflict = e
+    except ValueError as e:
+        raise SweepError(str(e))
+    if not candidates and conflict is not None:
+        raise SweepError(f"No valid parameter combination: {conflict}")
+    return candidates
+
+
+# ------------------------------------------------------------
+# WORKER TASKS
+# Run in the process pool; bars come from shared memory, so a
+# task pickles only symbol offsets and parameter dicts.
+# ------------------------------------------------------------
+def _targets(bars: BarSeries, strategy: str, candidates: List[Dict[str, float]], allow_short: bool) -> np.ndarray:
+    """(T, K) target positions, one column per candidate."""
+    fn = STRATEGIES[strategy][0]
+    return np.column_stack([fn(bars, params, allow_short) for params in candidates])
+
+
+def sweep_metrics(ts: np.ndarray, sim: Dict[str, np.ndarray], target: np.ndarray, initial_capital: float) -> Dict[str, np.ndarray]:
+    """
+    Per-column backtest metrics of a (T, K) simulation; Sharpe and drawdown
+    follow RiskManagement's definitions.
+    """
+    equity, returns = sim["equity"], sim["returns"]
+    total = equity[-1] / initial_capital
+    years = (ts[-1] - ts[0]) / YEAR_NS if len(ts) > 1 else 0
+    cagr = sharpe = np.zeros(target.shape[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if years > 0:
+            cagr = np.where(total > 0, total ** (1 / years) - 1, 0.0)
+        if len(ts) > 1:
+            excess = returns - 0.02 / 252
+            std = excess.std(axis=0)
+            # Rounding leaves a never-invested column a tiny non-zero std
+            sharpe = np.where(std > 1e-12, excess.mean(axis=0) / std * np.sqrt(252), 0.0)
+
+        peaks = np.maximum.accumulate(equity, axis=0)
+        drawdown = ((peaks - equity) / peaks).max(axis=0)
+
+    entries = (np.diff(target, axis=0, prepend=0.0) != 0) & (target != 0)
+    return {
+        "total_return": total - 1,
+        "cagr": cagr,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": drawdown,
+        "trades": entries.sum(axis=0),
+        "exposure": (sim["held"] != 0).mean(axis=0),
+    }
+
+
+def _evaluate(
+    ts: np.ndarray,
+    close: np.ndarray,
+    target: np.ndarray,
+    fee_bps: float,
+    slippage_bps: float
+) -> Dict[str, np.ndarray]:
+    sim = simulate(close, target, fee_bps, slippage_bps, initial_capital=1.0)
+    return sweep_metrics(ts, sim, target, initial_capital=1.0)
+
+
+def _row(metrics: Dict[str, np.ndarray], k: int) -> Dict[str, Any]:
+    return {name: (int(values[k]) if name == "trades" else float(values[k])) for name, values in metrics.items()}
+
+
+def walk_forward_windows(n: int, train_bars: int, test_bars: int, step_bars: Optional[int] = None) -> List[tuple]:
+    """(train_start, test_start, test_end) bar indices of rolling windows over n bars."""
+    step = step_bars or test_bars
+    return [
+        (start, start + train_bars, start + train_bars + test_bars)
+        for start in range(0, n - train_bars - test_bars + 1, step)
+    ]
+
+
+def sweep_chunk(
+    handle: Dict[str, Any],
+    strategy: str,
+    candidates: List[Dict[str, float]],
+    allow_short: bool,
+    fee_bps: float,
+    slippage_bps: float
+) -> List[Dict[str, Any]]:
+    """Metrics of every candidate on every symbol in the handle."""
+    rows = []
+    for symbol, bars in attach(handle).items():
+        for lo in range(0, len(candidates), CANDIDATE_BATCH):
+            batch = candidates[lo:lo + CANDIDATE_BATCH]
+            metrics = _evaluate(bars.ts, bars.close, _targets(bars, strategy, batch, allow_short), fee_bps, slippage_bps)
+            rows.extend({"symbol": symbol, "params": params, **_row(metrics, k)} for k, params in enumerate(batch))
+    return rows
+
+
+def walk_forward_chunk(
+    handle: Dict[str, Any],
+    strategy: str,
+    candidates: List[Dict[str, float]],
+    allow_short: bool,
+    fee_bps: float,
+    slippage_bps: float,
+    objective: str,
+    train_bars: int,
+    test_bars: int,
+    step_bars: Optional[int]
+) -> List[Dict[str, Any]]:
+    """
+    Per symbol and window: the candidate with the best in-sample `objective`
+    on the train bars, then its out-of-sample metrics on the test bars.
+
+    Signals are computed once over the full series; every indicator is
+    causal, so a window sees only bars up to its own close and the test
+    slice starts with warmed-up indicators and the position held at the
+    end of training.
+    """
+    sign = OBJECTIVES[objective]
+    rows = []
+    for symbol, bars in attach(handle).items():
+        windows = walk_forward_windows(len(bars), train_bars, test_bars, step_bars)
+        if not windows:
+            continue
+        target = _targets(bars, strategy, candidates, allow_short)
+        dates = format_dates(bars.ts, bars.tz)
+
+        for window, (start, split, end) in enumerate(windows):
+            train = _evaluate(bars.ts[start:split], bars.close[start:split], target[start:split], fee_bps, slippage_bps)
+            scores = sign * train[objective]
+            best = int(np.argmax(np.where(np.isnan(scores), -np.inf, scores)))
+
+            # The test slice opens on the last training close with the position held there
+            test_target = target[split - 1:end, best:best + 1]
+            test = _evaluate(bars.ts[split - 1:end], bars.close[split - 1:end], test_target, fee_bps, slippage_bps)
+            rows.append({
+                "symbol": symbol,
+                "window": window,
+                "train_start": dates[start],
+                "train_end": dates[split - 1],
+                "test_start": dates[split],
+                "test_end": dates[end - 1],
+                "params": candidates[best],
+                "in_sample": _row(train, best),
+                "out_of_sample": _row(test, 0),
+            })
+    return rows
+
+
+# ------------------------------------------------------------
+# JOBS
+# A sweep runs as a background task on the API loop, fanning
+# symbol chunks out to the process pool and appending results
+# as each chunk completes.
+# ------------------------------------------------------------
+class SweepJob:
+    def __init__(self, owner_id: int, spec: Dict[str, Any], candidates: List[Dict[str, float]], symbols: List[str]):
+        self.id = uuid.uuid4().hex
+        self.owner_id = owner_id
+        self.spec = spec
+        self.candidates = candidates
+        self.symbols = symbols
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.results: List[Dict[str, Any]] = []
+        self.errors: Dict[str, str] = {}
+        self.chunks_total = 0
+        self.chunks_done = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def _notify(self) -> None:
+        # Wake every waiting streamer, then arm a fresh event for the next change
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, seen: int, timeout: float = 15.0) -> None:
+        """Until there are more than `seen` results, the job ends, or `timeout` passes."""
+        if len(self.results) > seen or self.done:
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def best(self, n: int = 10) -> List[Dict[str, Any]]:
+        """Top results by the objective (out-of-sample for walk-forward)."""
+        objective = self.spec["objective"]
+        sign = OBJECTIVES[objective]
+        walk_forward = bool(self.spec.get("walk_forward"))
+
+        def score(row):
+            value = (row["out_of_sample"] if walk_forward else row)[objective]
+            return -math.inf if math.isnan(value) else sign * value
+
+        return sorted(self.results, key=score, reverse=True)[:n]
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "strategy": self.spec["strategy"],
+            "mode": self.spec["mode"],
+            "objective": self.spec["objective"],
+            "walk_forward": self.spec.get("walk_forward"),
+            "symbols": len(self.symbols),
+            "candidates": len(self.candidates),
+            "chunks_total": self.chunks_total,
+            "chunks_done": self.chunks_done,
+            "result_count": len(self.results),
+            "errors": self.errors,
+            "error": self.error,
+            "elapsed_seconds": round((self.finished_at or time.time()) - self.created_at, 3),
+        }
+
+
+class SweepManager:
+    """Running and recently finished sweep jobs, oldest finished dropped first."""
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, SweepJob]" = OrderedDict()
+
+    def get(self, job_id: str, owner_id: int) -> Optional[SweepJob]:
+        job = self._jobs.get(job_id)
+        return job if job is not None and job.owner_id == owner_id else None
+
+    def submit(self, job: SweepJob, fetch) -> SweepJob:
+        """Start `job`; `fetch(symbols)` is awaited for {"series", "errors"}."""
+        self._jobs[job.id] = job
+        self._evict()
+        job.task = asyncio.create_task(self._run(job, fetch))
+        return job
+
+    def cancel(self, job: SweepJob) -> None:
+        if not job.done and job.task is not None:
+            job.task.cancel()
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        while len(self._jobs) > self.max_jobs and finished:
+            self._jobs.pop(finished.pop(0))
+
+    async def _run(self, job: SweepJob, fetch) -> None:
+        shared = None
+        job.status = "running"
+        try:
+            fetched = await fetch(job.symbols)
+            job.errors = fetched["errors"]
+            series = {s: bars for s, bars in fetched["series"].items() if len(bars) >= 2}
+
+            shared = SharedBars.create(series)
+            symbols = list(shared.handle["symbols"])
+            size = settings.sweep_chunk_symbols
+            chunks = [shared.subset(symbols[i:i + size]) for i in range(0, len(symbols), size)]
+            job.chunks_total = len(chunks)
+            job._notify()
+
+            spec = job.spec
+            costs = (spec["allow_short"], spec["fee_bps"], spec["slippage_bps"])
+            window = spec.get("walk_forward")
+            if window:
+                args = costs + (spec["objective"], window["train_bars"], window["test_bars"], window.get("step_bars"))
+                calls = [cpu_pool.run(walk_forward_chunk, chunk, spec["strategy"], job.candidates, *args) for chunk in chunks]
+            else:
+                calls = [cpu_pool.run(sweep_chunk, chunk, spec["strategy"], job.candidates, *costs) for chunk in chunks]
+
+            for finished in asyncio.as_completed(calls):
+                job.results.extend(await finished)
+                job.chunks_done += 1
+                job._notify()
+
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error("❌ Sweep failed", job=job.id, error=str(e))
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            if shared is not None:
+                shared.close()
+            job.finished_at = time.time()
+            job._notify()
+            logger.info("🧪 Sweep finished", job=job.id, status=job.status, results=len(job.results))
+
+
+sweep_jobs = SweepManager(max_jobs=settings.sweep_max_jobs)
@@ -1,83 +1,412 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union
 
-class TechnicalAnalysis:
-    @staticmethod
-    def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
-        if len(prices) < period:
-            return []
+from app.services.bar_series import BarPanel, BarSeries
+
+# 1-D (time) or 2-D (time x symbol) price arrays; lists are accepted too
+Prices = Union[Sequence[float], np.ndarray]
+
+DAY_NS = 86_400 * 10**9
+
+# Indicator groups: the outputs each computes and the parameters it reads
+INDICATOR_GROUPS = {
+    "rsi": (["rsi"], ["rsi_period"]),
+    "macd": (["macd", "macd_signal", "macd_histogram"], ["macd_fast", "macd_slow", "macd_signal_period"]),
+    "bollinger": (["bollinger_upper", "bollinger_middle", "bollinger_lower"], ["bb_period", "bb_std"]),
+    "sma": (["sma"], ["sma_period"]),
+    "ema": (["ema"], ["ema_period"]),
+    "atr": (["atr"], ["atr_period"]),
+    "vwap": (["vwap"], []),
+    "obv": (["obv"], []),
+    "stochastic": (["stoch_k", "stoch_d"], ["stoch_k_period", "stoch_d_period"]),
+}
+INDICATOR_OUTPUTS = {output: group for group, (outputs, _) in INDICATOR_GROUPS.items() for output in outputs}
+
+# What calculate_bar_indicators / calculate_panel_indicators return by default
+DEFAULT_INDICATORS = ["rsi", "macd", "macd_signal", "bollinger_upper", "bollinger_lower", "sma", "ema"]
+
+DEFAULT_INDICATOR_PARAMS = {
+    "rsi_period": 14,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal_period": 9,
+    "bb_period": 20,
+    "bb_std": 2.0,
+    "sma_period": 20,
+    "ema_period": 20,
+    "atr_period": 14,
+    "stoch_k_period": 14,
+    "stoch_d_period": 3,
+}
+
+
+# ------------------------------------------------------------
+# KERNELS
+# Array in, array out: same length as the input, NaN until an
+# indicator is defined. 2-D (time x symbol) input is computed for
+# all columns at once.
+# ------------------------------------------------------------
+def _as_array(values: Prices) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _ewm(values: np.ndarray, alpha: float, adjust: bool = True) -> np.ndarray:
+    """pandas ewm(alpha=..., adjust=...).mean() for 1-D or 2-D arrays."""
+    if values.ndim == 1:
+        # pandas' compiled loop is fastest along one long series
+        return pd.Series(values, copy=False).ewm(alpha=alpha, adjust=adjust).mean().to_numpy()
+
+    # Panels: step through time once, updating every symbol per step
+    # (same recurrence and NaN handling as pandas' ewm kernel)
+    out = np.empty(values.shape)
+    weighted = values[0].copy()
+    old_wt = np.ones(values.shape[1])
+    decay = 1 - alpha
+    new_wt = 1.0 if adjust else alpha
+    out[0] = weighted
+
+    for i in range(1, len(values)):
+        cur = values[i]
+        started = ~np.isnan(weighted)
+        observed = ~np.isnan(cur)
+        old_wt = np.where(started, old_wt * decay, old_wt)
+
+        update = started & observed
+        with np.errstate(invalid="ignore"):
+            blended = np.where(weighted != cur, (old_wt * weighted + new_wt * cur) / (old_wt + new_wt), weighted)
+        weighted = np.where(update, blended, np.where(observed & ~started, cur, weighted))
+        old_wt = np.where(update, old_wt + new_wt if adjust else 1.0, old_wt)
+        out[i] = weighted
+
+    return out
+
+
+def _rolling_mean_std(values: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and sample std; NaN until `period` values (any NaN in the window gives NaN)."""
+    if values.ndim == 1:
+        window = pd.Series(values, copy=False).rolling(window=period)
+        return window.mean().to_numpy(), window.std().to_numpy()
+
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    n = len(values) - period + 1
+    if n <= 0 or period < 2:
+        return mean, std
+
+    # Two passes over `period` shifted slices: exact, and no (T, S, period) temporary
+    total = np.zeros((n,) + values.shape[1:])
+    for k in range(period):
+        total += values[k:k + n]
+    mean[period - 1:] = total / period
+
+    squares = np.zeros_like(total)
+    for k in range(period):
+        squares += (values[k:k + n] - mean[period - 1:]) ** 2
+    std[period - 1:] = np.sqrt(squares / (period - 1))
+    return mean, std
+
+
+def sma(values: Prices, period: int) -> np.ndarray:
+    """Simple moving average over `period` bars."""
+    return _rolling_mean_std(_as_array(values), period)[0]
+
+
+def ema(values: Prices, period: int) -> np.ndarray:
+    """Exponential moving average, span `period`, bias-adjusted from the first bar."""
+    values = _as_array(values)
+    out = _ewm(values, 2 / (period + 1))
+    if len(values) < period:
+        out[:] = np.nan
+    return out
+
+
+def rsi(values: Prices, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI: average gain/loss seeded with the simple mean of the first
+    `period` changes, then smoothed with alpha = 1 / period. 100 when there
+    are no losses.
+    """
+    values = _as_array(values)
+    out = np.full(values.shape, np.nan)
+    if len(values) <= period:
+        return out
+
+    change = np.diff(values, axis=0)
+    gains = np.where(change > 0, change, 0.0)
+    losses = np.where(change > 0, 0.0, -change)
+
+    # Seed in place of the period-th change; ewm(adjust=False) is then Wilder's recursion
+    seed_gain, seed_loss = gains[:period].mean(axis=0), losses[:period].mean(axis=0)
+    gains, losses = gains[period - 1:], losses[period - 1:]
+    gains[0], losses[0] = seed_gain, seed_loss
+
+    avg_gain = _ewm(gains, 1 / period, adjust=False)
+    avg_loss = _ewm(losses, 1 / period, adjust=False)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[period:] = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    return out
+
+
+def macd(
+    values: Prices,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(macd, signal, histogram)."""
+    values = _as_array(values)
+    if len(values) < slow_period:
+        nothing = np.full(values.shape, np.nan)
+        return nothing, nothing.copy(), nothing.copy()
+
+    line = _ewm(values, 2 / (fast_period + 1)) - _ewm(values, 2 / (slow_period + 1))
+    signal = _ewm(line, 2 / (signal_period + 1))
+    return line, signal, line - signal
+
+
+def bollinger(values: Prices, period: int = 20, std_dev: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(upper, middle, lower) bands around a `period` SMA, sample std."""
+    middle, std = _rolling_mean_std(_as_array(values), period)
+    return middle + std * std_dev, middle, middle - std * std_dev
+
+
+def atr(high: Prices, low: Prices, close: Prices, period: int = 14) -> np.ndarray:
+    """
+    Wilder average true range: the first value is the mean of the first
+    `period` true ranges, then smoothed with alpha = 1 / period.
+    """
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    out = np.full(close.shape, np.nan)
+    if len(close) < period:
+        return out
+
+    prev_close = np.concatenate([close[:1], close[:-1]])
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    true_range[0] = high[0] - low[0]
 
-        gains = []
-        losses = []
+    smoothed = true_range[period - 1:].copy()
+    smoothed[0] = true_range[:period].mean(axis=0)
+    out[period - 1:] = _ewm(smoothed, 1 / period, adjust=False)
+    return out
 
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
 
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
+def vwap(high: Prices, low: Prices, close: Prices, volume: Prices, anchors: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Volume-weighted typical price, accumulated from the first bar or, with
+    `anchors` (e.g. the session day of each row), restarted whenever the
+    anchor changes.
+    """
+    high, low, close, volume = _as_array(high), _as_array(low), _as_array(close), _as_array(volume)
+    missing = np.isnan(close) | np.isnan(volume)
+    weighted = np.where(missing, 0.0, (high + low + close) / 3 * volume)
+    volume = np.where(missing, 0.0, volume)
 
-        rsi_values = []
-        for i in range(period, len(prices)):
-            if i > period:
-                avg_gain = (avg_gain * (period - 1) + gains[i-1]) / period
-                avg_loss = (avg_loss * (period - 1) + losses[i-1]) / period
+    cum_pv, cum_v = weighted.cumsum(axis=0), volume.cumsum(axis=0)
+    if anchors is not None and len(close):
+        anchors = np.asarray(anchors, dtype=float)
+        if anchors.ndim < close.ndim:
+            anchors = anchors[:, None]
+        anchors = np.broadcast_to(anchors, close.shape)
+        starts = np.ones(close.shape, dtype=bool)
+        starts[1:] = anchors[1:] != anchors[:-1]
+        # Row where each bar's anchor period began; subtract the totals before it
+        rows = np.arange(len(close)).reshape((-1,) + (1,) * (close.ndim - 1))
+        first = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+        base_pv = np.take_along_axis(cum_pv - weighted, first, axis=0)
+        base_v = np.take_along_axis(cum_v - volume, first, axis=0)
+        cum_pv, cum_v = cum_pv - base_pv, cum_v - base_v
 
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = cum_pv / cum_v
+    out[missing | (cum_v == 0)] = np.nan
+    return out
 
-            rsi_values.append(rsi)
 
-        return rsi_values
+def obv(close: Prices, volume: Prices) -> np.ndarray:
+    """On-balance volume: running sum of volume signed by the close-to-close move, 0 at the first bar."""
+    close, volume = _as_array(close), _as_array(volume)
+    out = np.full(close.shape, np.nan)
+    if len(close) == 0:
+        return out
+
+    flow = np.zeros(close.shape)
+    flow[1:] = np.nan_to_num(np.sign(np.diff(close, axis=0)) * volume[1:])
+    out[:] = flow.cumsum(axis=0)
+    out[np.isnan(close)] = np.nan
+    return out
+
+
+def stochastic(
+    high: Prices,
+    low: Prices,
+    close: Prices,
+    k_period: int = 14,
+    d_period: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(%K, %D): close within the `k_period` high-low range, and its `d_period` SMA."""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    k = np.full(close.shape, np.nan)
+    if len(close) >= k_period:
+        # NaN anywhere in the window gives NaN, as with pandas rolling
+        highest = sliding_window_view(high, k_period, axis=0).max(axis=-1)
+        lowest = sliding_window_view(low, k_period, axis=0).min(axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k[k_period - 1:] = 100 * (close[k_period - 1:] - lowest) / (highest - lowest)
+
+    d = _rolling_mean_std(k, d_period)[0] if d_period > 1 else k.copy()
+    return k, d
+
+
+# ------------------------------------------------------------
+# SELECTION
+# ------------------------------------------------------------
+def resolve_indicators(names: Iterable[str]) -> List[str]:
+    """
+    Requested names -> output names. Output names are taken as is ("macd"
+    is the MACD line); "bollinger" and "stochastic" stand for all of their
+    outputs. Raises ValueError for unknown names.
+    """
+    outputs: List[str] = []
+    for name in names:
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name in INDICATOR_OUTPUTS:
+            outputs.append(name)
+        elif name in INDICATOR_GROUPS:
+            outputs.extend(INDICATOR_GROUPS[name][0])
+        else:
+            available = sorted(set(INDICATOR_GROUPS) | set(INDICATOR_OUTPUTS))
+            raise ValueError(f"Unknown indicator '{name}'. Available: {', '.join(available)}")
+    return list(dict.fromkeys(outputs))
+
+
+def indicator_params(outputs: Sequence[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Defaults overridden by `params`, limited to what `outputs` depend on."""
+    merged = {**DEFAULT_INDICATOR_PARAMS, **(params or {})}
+    groups = dict.fromkeys(INDICATOR_OUTPUTS[output] for output in outputs)
+    return {name: merged[name] for group in groups for name in INDICATOR_GROUPS[group][1]}
+
+
+def compute_indicators(
+    fields: Dict[str, np.ndarray],
+    outputs: Sequence[str],
+    params: Optional[Dict[str, Any]] = None,
+    anchors: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    `outputs` from OHLCV arrays (1-D or time x symbol). Groups are computed
+    once however many of their outputs are requested; `anchors` restarts VWAP.
+    """
+    p = {**DEFAULT_INDICATOR_PARAMS, **(params or {})}
+    close = fields["close"]
+    groups = dict.fromkeys(INDICATOR_OUTPUTS[output] for output in outputs)
+    computed: Dict[str, np.ndarray] = {}
+
+    if "rsi" in groups:
+        computed["rsi"] = rsi(close, p["rsi_period"])
+    if "macd" in groups:
+        line, signal, histogram = macd(close, p["macd_fast"], p["macd_slow"], p["macd_signal_period"])
+        computed.update(macd=line, macd_signal=signal, macd_histogram=histogram)
+    if "bollinger" in groups:
+        upper, middle, lower = bollinger(close, p["bb_period"], p["bb_std"])
+        computed.update(bollinger_upper=upper, bollinger_middle=middle, bollinger_lower=lower)
+    if "sma" in groups:
+        # Usually the Bollinger middle band; compute it once
+        same = "bollinger" in groups and p["sma_period"] == p["bb_period"]
+        computed["sma"] = computed["bollinger_middle"] if same else sma(close, p["sma_period"])
+    if "ema" in groups:
+        computed["ema"] = ema(close, p["ema_period"])
+    if "atr" in groups:
+        computed["atr"] = atr(fields["high"], fields["low"], close, p["atr_period"])
+    if "vwap" in groups:
+        computed["vwap"] = vwap(fields["high"], fields["low"], close, fields["volume"], anchors)
+    if "obv" in groups:
+        computed["obv"] = obv(close, fields["volume"])
+    if "stochastic" in groups:
+        computed["stoch_k"], computed["stoch_d"] = stochastic(
+            fields["high"], fields["low"], close, p["stoch_k_period"], p["stoch_d_period"]
+        )
+
+    return {output: computed[output] for output in outputs}
+
+
+def session_anchors(ts: np.ndarray, interval: str) -> Optional[np.ndarray]:
+    """VWAP anchors: the UTC day of each intraday bar (one US session); None for daily and up."""
+    if interval.endswith(("m", "h")):
+        return ts // DAY_NS
+    return None
+
+
+def _compaction(valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Where each symbol's own bars go in a compacted (depth, S) matrix: every
+    column's valid cells stacked from row 0 in time order, NaN-padded below.
+    Gaps in the shared timeline then never reach a kernel, so each column
+    is computed exactly as its symbol would be on its own. Returns the
+    (panel row, column, compacted row) of every valid cell.
+    """
+    rows, cols = np.nonzero(valid)
+    depth = np.cumsum(valid, axis=0)
+    return rows, cols, depth[rows, cols] - 1
+
+
+def _compact(panel: np.ndarray, index: Tuple[np.ndarray, np.ndarray, np.ndarray], depth: int) -> np.ndarray:
+    rows, cols, packed = index
+    out = np.full((depth, panel.shape[1]), np.nan)
+    out[packed, cols] = panel[rows, cols]
+    return out
+
+
+def _scatter(compacted: np.ndarray, index: Tuple[np.ndarray, np.ndarray, np.ndarray], shape: Tuple[int, int]) -> np.ndarray:
+    """Inverse of _compact: results back on the panel rows, NaN where a symbol has no bar."""
+    rows, cols, packed = index
+    out = np.full(shape, np.nan)
+    out[rows, cols] = compacted[packed, cols]
+    return out
+
+
+class TechnicalAnalysis:
+    @staticmethod
+    def calculate_rsi(prices: Prices, period: int = 14) -> List[float]:
+        """RSI from the `period`-th price on (len(prices) - period values); [] when too short."""
+        if len(prices) < period:
+            return []
+        return rsi(prices, period)[period:].tolist()
 
     @staticmethod
-    def calculate_macd(prices: List[float], fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, List[float]]:
+    def calculate_macd(prices: Prices, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, List[float]]:
+        """Full-length MACD, signal and histogram lists; empty when shorter than `slow_period`."""
         if len(prices) < slow_period:
             return {"macd": [], "signal": [], "histogram": []}
-
-        fast_ema = pd.Series(prices).ewm(span=fast_period).mean()
-        slow_ema = pd.Series(prices).ewm(span=slow_period).mean()
-        macd = fast_ema - slow_ema
-        signal = macd.ewm(span=signal_period).mean()
-        histogram = macd - signal
-
+        line, signal, histogram = macd(prices, fast_period, slow_period, signal_period)
         return {
-            "macd": macd.tolist(),
+            "macd": line.tolist(),
             "signal": signal.tolist(),
             "histogram": histogram.tolist(),
         }
 
     @staticmethod
-    def calculate_bollinger_bands(prices: List[float], period: int = 20, std_dev: float = 2) -> Dict[str, List[float]]:
+    def calculate_bollinger_bands(prices: Prices, period: int = 20, std_dev: float = 2) -> Dict[str, List[float]]:
+        """Full-length band lists (NaN until `period` prices); empty when too short."""
         if len(prices) < period:
             return {"upper": [], "middle": [], "lower": []}
-
-        sma = pd.Series(prices).rolling(window=period).mean()
-        std = pd.Series(prices).rolling(window=period).std()
-
-        upper = sma + (std * std_dev)
-        lower = sma - (std * std_dev)
-
+        upper, middle, lower = bollinger(prices, period, std_dev)
         return {
             "upper": upper.tolist(),
-            "middle": sma.tolist(),
+            "middle": middle.tolist(),
             "lower": lower.tolist(),
         }
 
     @staticmethod
-    def calculate_ema(prices: List[float], period: int) -> List[float]:
+    def calculate_ema(prices: Prices, period: int) -> List[float]:
+        """Full-length EMA list; [] when shorter than `period`."""
         if len(prices) < period:
             return []
-        return pd.Series(prices).ewm(span=period).mean().tolist()
+        return ema(prices, period).tolist()
 
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -96,30 +425,64 @@ class TechnicalAnalysis:
         for col in ["Open", "High", "Low", "Close", "Volume"]:
             df[col] = pd.to_numeric(df[col], errors='coerce')
 
-        # Calculate indicators
-        close_prices = df["Close"].tolist()
+        bars = BarSeries(
+            np.zeros(len(df), dtype=np.int64),
+            *(df[col].to_numpy(dtype=float) for col in ["Open", "High", "Low", "Close", "Volume"])
+        )
+        for name, values in self.calculate_bar_indicators(bars).items():
+            df[name] = values
 
-        # RSI
-        rsi_values = self.calculate_rsi(close_prices)
-        df["rsi"] = [np.nan] * (len(df) - len(rsi_values)) + rsi_values
+        return df
 
-        # MACD
-        macd_data = self.calculate_macd(close_prices)
-        df["macd"] = [np.nan] * (len(df) - len(macd_data["macd"])) + macd_data["macd"]
-        df["macd_signal"] = [np.nan] * (len(df) - len(macd_data["signal"])) + macd_data["signal"]
+    def calculate_bar_indicators(
+        self,
+        bars: BarSeries,
+        indicators: Optional[Sequence[str]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Indicator arrays aligned with `bars` (NaN where not yet defined).
+        `indicators` are output or group names (default DEFAULT_INDICATORS),
+        `params` override DEFAULT_INDICATOR_PARAMS. Reads the bar arrays in
+        place; needs 50+ bars.
+        """
+        if len(bars) < 50:
+            return {}
 
-        # Bollinger Bands
-        bb_data = self.calculate_bollinger_bands(close_prices)
-        df["bollinger_upper"] = [np.nan] * (len(df) - len(bb_data["upper"])) + bb_data["upper"]
-        df["bollinger_lower"] = [np.nan] * (len(df) - len(bb_data["lower"])) + bb_data["lower"]
+        outputs = resolve_indicators(indicators) if indicators else DEFAULT_INDICATORS
+        fields = {col: getattr(bars, col) for col in ("high", "low", "close", "volume")}
+        return compute_indicators(fields, outputs, params, session_anchors(bars.ts, bars.interval))
 
-        # Moving Averages
-        df["sma"] = pd.Series(close_prices).rolling(window=20).mean()
-        df["ema"] = self.calculate_ema(close_prices, 20)
+    def calculate_panel_indicators(
+        self,
+        panel: BarPanel,
+        indicators: Optional[Sequence[str]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        calculate_bar_indicators for every symbol of a panel in one pass.
+        Each result is a (T, S) matrix aligned with panel.ts / panel.symbols,
+        NaN on rows where a symbol has no bar; columns match what each
+        symbol gets on its own (panel.column), whatever calendars the other
+        symbols trade on.
+        """
+        if panel.close.size == 0:
+            return {}
 
-        return df
+        outputs = resolve_indicators(indicators) if indicators else DEFAULT_INDICATORS
+        valid = ~np.isnan(panel.close)
+        index = _compaction(valid)
+        depth = int(valid.sum(axis=0).max())
+        fields = {col: _compact(getattr(panel, col), index, depth) for col in ("high", "low", "close", "volume")}
+
+        anchors = session_anchors(panel.ts, panel.interval)
+        if anchors is not None:
+            anchors = _compact(np.broadcast_to(anchors[:, None].astype(float), valid.shape), index, depth)
+
+        computed = compute_indicators(fields, outputs, params, anchors)
+        return {name: _scatter(values, index, valid.shape) for name, values in computed.items()}
 
-    def analyze_stock(self, prices: List[float]) -> Dict[str, Any]:
+    def analyze_stock(self, prices: Prices) -> Dict[str, Any]:
         return {
             "rsi": self.calculate_rsi(prices),
             "macd": self.calculate_macd(prices),
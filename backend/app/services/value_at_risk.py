@@ -0,0 +1,261 @@
+import math
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.executor import cpu_pool
+from app.core.rate_limiter import Priority
+from app.services.bar_series import BarPanel, ffill_rows
+from app.services.data_fetcher import data_fetcher
+from app.services.positions import load_positions
+
+METHODS = ("historical", "parametric", "monte_carlo")
+DEFAULT_CONFIDENCES = (0.95, 0.99)
+DEFAULT_HORIZONS = (1, 10)
+
+# Request bounds: every horizon and confidence adds work per path, and the
+# tail kept per horizon grows as the lowest confidence falls
+MAX_HORIZONS = 10
+MAX_CONFIDENCES = 10
+MAX_HORIZON_DAYS = 252
+MIN_CONFIDENCE = 0.5
+
+# Simulated draws held in memory at once; Monte Carlo paths are generated
+# in chunks of at most this many bytes per working array
+CHUNK_BYTES = 16 * 1024 * 1024
+
+
+# ------------------------------------------------------------
+# TAIL STATISTICS
+# VaR and CVaR are reported as positive losses in currency.
+# ------------------------------------------------------------
+def tail_losses(pnl: np.ndarray, confidences: Sequence[float], samples: Optional[int] = None) -> List[Tuple[float, float]]:
+    """
+    (VaR, CVaR) per confidence from P&L samples: the loss quantile (linear
+    interpolation, as np.quantile) and the mean loss at or beyond it.
+    `pnl` may hold just the worst outcomes of `samples` draws, provided
+    it reaches down to every requested quantile (see tail_size).
+    """
+    losses = np.sort(-np.asarray(pnl, dtype=float))
+    n = samples or len(losses)
+    skipped = n - len(losses)
+    out = []
+    for confidence in confidences:
+        position = confidence * (n - 1)
+        below = math.floor(position)
+        low, high = losses[below - skipped], losses[min(below + 1, n - 1) - skipped]
+        var = float(low + (high - low) * (position - below))
+        out.append((var, float(losses[np.searchsorted(losses, var):].mean())))
+    return out
+
+
+def tail_size(samples: int, confidences: Sequence[float]) -> int:
+    """How many of the worst outcomes tail_losses needs for these confidences."""
+    return samples - math.floor(min(confidences) * (samples - 1))
+
+
+def historical_pnl(log_returns: np.ndarray, exposure: np.ndarray, horizon: int) -> np.ndarray:
+    """P&L of today's exposure over every overlapping `horizon`-day window of the history."""
+    cumulative = np.vstack([np.zeros(log_returns.shape[1]), np.cumsum(log_returns, axis=0)])
+    return np.expm1(cumulative[horizon:] - cumulative[:-horizon]) @ exposure
+
+
+def parametric_tail(
+    mean: np.ndarray,
+    cov: np.ndarray,
+    exposure: np.ndarray,
+    horizon: int,
+    confidences: Sequence[float]
+) -> List[Tuple[float, float]]:
+    """Delta-normal (VaR, CVaR): P&L ~ N(h * mean.e, h * e'Ce) from daily log-return moments."""
+    mu = horizon * float(mean @ exposure)
+    sigma = math.sqrt(max(horizon * float(exposure @ cov @ exposure), 0.0))
+    normal = NormalDist()
+    out = []
+    for confidence in confidences:
+        z = normal.inv_cdf(confidence)
+        out.append((sigma * z - mu, sigma * normal.pdf(z) / (1 - confidence) - mu))
+    return out
+
+
+def monte_carlo_chunks(
+    mean: np.ndarray,
+    cov: np.ndarray,
+    exposure: np.ndarray,
+    horizons: Sequence[int],
+    paths: int,
+    seed: Optional[int] = None,
+    chunk_paths: Optional[int] = None
+) -> Iterator[Dict[int, np.ndarray]]:
+    """
+    Simulated P&L per horizon under multivariate normal daily log returns,
+    one chunk of paths at a time.
+
+    One correlated draw per path serves every horizon: the h-day log
+    return is exactly h * mean + sqrt(h) * shock for i.i.d. normal days.
+    Positions are revalued in full (expm1), not linearized. Chunks come
+    from one seeded generator, so a seed gives the same draws whatever
+    the chunk size.
+    """
+    assets = len(exposure)
+    # cov = factor @ factor.T; eigh tolerates the singular covariances short histories give
+    values, vectors = np.linalg.eigh(cov)
+    factor_t = (vectors * np.sqrt(np.clip(values, 0, None))).T
+    chunk = chunk_paths or max(1, CHUNK_BYTES // (8 * max(assets, 1)))
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, paths, chunk):
+        shocks = rng.standard_normal((min(chunk, paths - start), assets)) @ factor_t
+        out = {}
+        for h in horizons:
+            moved = np.multiply(shocks, math.sqrt(h))
+            moved += h * mean
+            out[h] = np.expm1(moved, out=moved) @ exposure
+        yield out
+
+
+def monte_carlo_tails(
+    mean: np.ndarray,
+    cov: np.ndarray,
+    exposure: np.ndarray,
+    horizons: Sequence[int],
+    confidences: Sequence[float],
+    paths: int,
+    seed: Optional[int] = None,
+    chunk_paths: Optional[int] = None
+) -> Dict[int, List[Tuple[float, float]]]:
+    """
+    Monte Carlo (VaR, CVaR) per horizon and confidence. Only each
+    horizon's worst tail_size outcomes are kept as chunks arrive, so
+    memory is bounded by the chunk size and the lowest confidence rather
+    than by paths x horizons; the figures equal those of the full sample.
+    """
+    keep = tail_size(paths, confidences)
+    worst = {h: np.empty(0) for h in horizons}
+    for chunk in monte_carlo_chunks(mean, cov, exposure, horizons, paths, seed, chunk_paths):
+        for h, pnl in chunk.items():
+            merged = np.concatenate([worst[h], pnl])
+            if len(merged) > keep:
+                merged = np.partition(merged, keep - 1)[:keep]
+            worst[h] = merged
+    return {h: tail_losses(worst[h], confidences, paths) for h in horizons}
+
+
+# ------------------------------------------------------------
+# ENGINE
+# ------------------------------------------------------------
+def validate(confidences: Sequence[float], horizons: Sequence[int], methods: Sequence[str]) -> None:
+    """Raise ValueError for unknown methods, or confidences and horizons out of bounds."""
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        raise ValueError(f"Unknown VaR method(s) {', '.join(unknown)}. Available: {', '.join(METHODS)}")
+    if not confidences or any(not MIN_CONFIDENCE <= c < 1 for c in confidences):
+        raise ValueError(f"Confidence levels must be at least {MIN_CONFIDENCE} and below 1")
+    if not horizons or any(not 1 <= h <= MAX_HORIZON_DAYS for h in horizons):
+        raise ValueError(f"Horizons must be between 1 and {MAX_HORIZON_DAYS} days")
+    if len(set(confidences)) > MAX_CONFIDENCES or len(set(horizons)) > MAX_HORIZONS:
+        raise ValueError(f"At most {MAX_CONFIDENCES} confidence levels and {MAX_HORIZONS} horizons")
+
+
+def value_at_risk(
+    log_returns: np.ndarray,
+    exposure: np.ndarray,
+    confidences: Sequence[float] = DEFAULT_CONFIDENCES,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    methods: Sequence[str] = METHODS,
+    paths: int = 100_000,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    VaR and CVaR of a linear portfolio for every method x horizon x
+    confidence.
+
+    `log_returns` is (T, N) daily log returns of the held assets and
+    `exposure` (N,) today's signed market value per asset. Historical
+    simulation replays overlapping windows of the actual history;
+    parametric and Monte Carlo use its mean and covariance. A horizon
+    longer than the history gets no historical figures.
+    """
+    validate(confidences, horizons, methods)
+    confidences, horizons = list(dict.fromkeys(confidences)), list(dict.fromkeys(horizons))
+    log_returns = np.asarray(log_returns, dtype=float)
+    exposure = np.asarray(exposure, dtype=float)
+    mean = log_returns.mean(axis=0) if len(log_returns) else np.zeros(len(exposure))
+    cov = np.atleast_2d(np.cov(log_returns, rowvar=False)) if len(log_returns) > 1 else np.zeros((len(exposure),) * 2)
+
+    tails: Dict[Tuple[str, int], List[Tuple[float, float]]] = {}
+    samples: Dict[Tuple[str, int], int] = {}
+    for method in methods:
+        if method == "monte_carlo":
+            simulated = monte_carlo_tails(mean, cov, exposure, horizons, confidences, paths, seed)
+        for h in horizons:
+            if method == "historical":
+                pnl = historical_pnl(log_returns, exposure, h) if h <= len(log_returns) else np.empty(0)
+                tails[method, h] = tail_losses(pnl, confidences) if len(pnl) else [(None, None)] * len(confidences)
+                samples[method, h] = len(pnl)
+            elif method == "parametric":
+                tails[method, h] = parametric_tail(mean, cov, exposure, h, confidences)
+                samples[method, h] = len(log_returns)
+            else:
+                tails[method, h] = simulated[h]
+                samples[method, h] = paths
+
+    return [
+        {
+            "method": method,
+            "horizon_days": h,
+            "confidence": confidence,
+            "var": var,
+            "cvar": cvar,
+            "samples": samples[method, h],
+        }
+        for (method, h), pairs in tails.items()
+        for confidence, (var, cvar) in zip(confidences, pairs)
+    ]
+
+
+async def portfolio_value_at_risk(
+    db: Session,
+    user_id: int,
+    confidences: Sequence[float] = DEFAULT_CONFIDENCES,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    methods: Sequence[str] = METHODS,
+    paths: int = 100_000,
+    seed: Optional[int] = None,
+    lookback_days: int = 730
+) -> Dict[str, Any]:
+    """
+    VaR/CVaR of the user's open positions, marked at their last daily
+    close, from `lookback_days` of daily closes. Positions without price
+    data are left out and listed as unpriced. Runs on the CPU pool.
+    """
+    validate(confidences, horizons, methods)
+    held: Dict[str, float] = {}
+    for position in load_positions(db, user_id):
+        if position.quantity:
+            symbol = position.symbol.upper()
+            held[symbol] = held.get(symbol, 0.0) + position.quantity
+    batch = await data_fetcher.get_bar_series_batch(list(held), "D", lookback_days, Priority.BACKGROUND)
+    panel = BarPanel.from_series(batch["series"])
+
+    # Rows from the first day every held symbol has a close; gaps (and
+    # non-positive closes, which have no log return) carry the last close
+    closes = ffill_rows(np.where(panel.close > 0, panel.close, np.nan))
+    complete = np.flatnonzero(~np.isnan(closes).any(axis=1))
+    closes = closes[complete[0]:] if len(complete) else closes[:0]
+    exposure = np.array([held[symbol] for symbol in panel.symbols]) * closes[-1] if len(closes) else np.zeros(0)
+
+    results = []
+    if len(closes) > 1:
+        log_returns = np.diff(np.log(closes), axis=0)
+        results = await cpu_pool.run(value_at_risk, log_returns, exposure, confidences, horizons, methods, paths, seed)
+    return {
+        "positions": dict(zip(panel.symbols, np.round(exposure, 2).tolist())),
+        "gross_exposure": round(float(np.abs(exposure).sum()), 2),
+        "net_exposure": round(float(exposure.sum()), 2),
+        "observations": max(len(closes) - 1, 0),
+        "unpriced": sorted(set(held) - set(panel.symbols)),
+        "results": results,
+    }
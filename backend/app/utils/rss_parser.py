@@ -1,7 +1,10 @@
+import asyncio
 import feedparser
 from typing import List, Dict
 import structlog
 
+from app.core.executor import provider_executor
+
 logger = structlog.get_logger()
 
 # --------------------------------------------------
@@ -23,25 +26,34 @@ MAX_ARTICLES_PER_FEED = 10
 
 
 # --------------------------------------------------
-# RSS Parser (SAFE & SYNC)
+# RSS Parser (SAFE & ASYNC)
 # --------------------------------------------------
 
-def get_financial_news() -> List[Dict]:
+async def get_financial_news() -> List[Dict]:
     """
     Fetch and parse financial news RSS feeds.
 
+    feedparser.parse is blocking, so every feed is parsed on the
+    provider pool, concurrently.
+
     Always returns a list.
     Never crashes.
     """
 
     all_articles: List[Dict] = []
 
-    for feed_url in RSS_FEEDS:
+    feeds = await asyncio.gather(
+        *(
+            provider_executor.run(feedparser.parse, feed_url, request_headers=HEADERS)
+            for feed_url in RSS_FEEDS
+        ),
+        return_exceptions=True
+    )
+
+    for feed_url, feed in zip(RSS_FEEDS, feeds):
         try:
-            feed = feedparser.parse(
-                feed_url,
-                request_headers=HEADERS
-            )
+            if isinstance(feed, Exception):
+                raise feed
 
             # Guard: invalid or empty feed
             if not feed or not getattr(feed, "entries", None):
@@ -94,7 +106,7 @@ def get_financial_news() -> List[Dict]:
 # --------------------------------------------------
 
 def _test_rss_parser():
-    articles = get_financial_news()
+    articles = asyncio.run(get_financial_news())
     print(f"\n📊 RSS Test Result: {len(articles)} articles\n")
 
     if articles:
@@ -1,10 +1,13 @@
 import yfinance as yf
 import pandas as pd
 from typing import Dict, Any
+from app.core.executor import provider_executor
+
+# yfinance calls block on network I/O, so they all run on the provider pool
 
 async def get_stock_info(symbol: str) -> Dict[str, Any]:
     ticker = yf.Ticker(symbol)
-    info = ticker.info
+    info = await provider_executor.run(lambda: ticker.info)
     return {
         "symbol": symbol,
         "name": info.get("longName", ""),
@@ -21,10 +24,10 @@ async def get_stock_info(symbol: str) -> Dict[str, Any]:
 
 async def get_historical_data(symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
     ticker = yf.Ticker(symbol)
-    data = ticker.history(period=period, interval=interval)
+    data = await provider_executor.run(ticker.history, period=period, interval=interval)
     return data
 
 async def get_options_data(symbol: str) -> Dict[str, Any]:
     ticker = yf.Ticker(symbol)
-    options = ticker.options
+    options = await provider_executor.run(lambda: ticker.options)
     return {"expiration_dates": options}
@@ -0,0 +1,88 @@
+"""
+End-to-end backtest timings (signals, simulation, trades, metrics, equity
+curve), with the vectorized simulation checked against, and timed next
+to, a bar-by-bar loop over the same target positions.
+
+Run from backend/ (needs the usual .env for app settings):
+
+    python -m benchmarks.bench_backtest
+    python -m benchmarks.bench_backtest --years 20 40 --repeat 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.backtester import STRATEGIES, run_backtest, simulate, strategy_positions
+from app.services.bar_series import BarSeries
+
+
+# ------------------------------------------------------------
+# BAR-BY-BAR BASELINE
+# ------------------------------------------------------------
+def loop_equity(close, target, fee_bps=1.0, slippage_bps=2.0, capital=10_000.0):
+    cost_rate = (fee_bps + slippage_bps) / 10_000
+    equity, position, out = capital, 0.0, []
+    for i in range(len(close)):
+        bar_return = close[i] / close[i - 1] - 1 if i > 0 else 0.0
+        equity *= 1 + position * bar_return - abs(target[i] - position) * cost_rate
+        position = target[i]
+        out.append(equity)
+    return out
+
+
+# ------------------------------------------------------------
+# HARNESS
+# ------------------------------------------------------------
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _daily_bars(years: int, seed: int = 0) -> BarSeries:
+    dates = pd.bdate_range(end="2024-12-31", periods=252 * years)
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, len(dates))))
+    return BarSeries(
+        dates.as_unit("ns").asi8, close, close * 1.005, close * 0.995, close,
+        rng.integers(10**5, 10**6, len(dates)).astype(float), symbol="SIM",
+    )
+
+
+def run(years_list, repeat: int) -> None:
+    print(
+        f"{'years':>6} {'bars':>7} {'strategy':>11} {'backtest ms':>12} "
+        f"{'simulate ms':>12} {'loop ms':>9} {'trades':>7} {'max |diff|':>11}"
+    )
+    for years in years_list:
+        bars = _daily_bars(years)
+        for strategy in STRATEGIES:
+            backtest_ms = _best_of(lambda: run_backtest(bars, strategy), repeat)
+
+            target = strategy_positions(bars, strategy)
+            simulate_ms = _best_of(lambda: simulate(bars.close, target), repeat)
+            loop_ms = _best_of(lambda: loop_equity(bars.close.tolist(), target.tolist()), repeat)
+
+            result = run_backtest(bars, strategy)
+            diff = float(np.max(np.abs(np.asarray(result["equity_curve"]["equity"]) - loop_equity(bars.close, target))))
+            print(
+                f"{years:>6} {len(bars):>7} {strategy:>11} {backtest_ms:>12.2f} "
+                f"{simulate_ms:>12.2f} {loop_ms:>9.2f} {len(result['trades']):>7} {diff:>11.2e}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, nargs="+", default=[20])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.years, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
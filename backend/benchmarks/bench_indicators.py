@@ -0,0 +1,109 @@
+"""
+Indicator kernels vs the original list-based implementations.
+
+Run from backend/ (needs the usual .env for app settings):
+
+    python -m benchmarks.bench_indicators
+    python -m benchmarks.bench_indicators --sizes 10000 1000000 --repeat 3
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.technical_analysis import TechnicalAnalysis
+
+
+# ------------------------------------------------------------
+# ORIGINAL IMPLEMENTATION (baseline)
+# ------------------------------------------------------------
+def legacy_rsi(prices, period=14):
+    if len(prices) < period:
+        return []
+    gains, losses = [], []
+    for i in range(1, len(prices)):
+        change = prices[i] - prices[i - 1]
+        if change > 0:
+            gains.append(change)
+            losses.append(0)
+        else:
+            gains.append(0)
+            losses.append(abs(change))
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    rsi_values = []
+    for i in range(period, len(prices)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        rsi_values.append(100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+    return rsi_values
+
+
+def legacy_indicators(close: np.ndarray) -> dict:
+    close_prices = close.tolist()
+    n = len(close_prices)
+    out = {}
+
+    rsi_values = legacy_rsi(close_prices)
+    out["rsi"] = [np.nan] * (n - len(rsi_values)) + rsi_values
+
+    fast = pd.Series(close_prices).ewm(span=12).mean()
+    slow = pd.Series(close_prices).ewm(span=26).mean()
+    macd = fast - slow
+    out["macd"] = macd.tolist()
+    out["macd_signal"] = macd.ewm(span=9).mean().tolist()
+
+    sma = pd.Series(close_prices).rolling(window=20).mean()
+    std = pd.Series(close_prices).rolling(window=20).std()
+    out["bollinger_upper"] = (sma + std * 2).tolist()
+    out["bollinger_lower"] = (sma - std * 2).tolist()
+
+    out["sma"] = pd.Series(close_prices).rolling(window=20).mean()
+    out["ema"] = pd.Series(close_prices).ewm(span=20).mean().tolist()
+    return out
+
+
+# ------------------------------------------------------------
+# HARNESS
+# ------------------------------------------------------------
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(sizes, repeat: int) -> None:
+    from app.services.bar_series import BarSeries
+
+    ta = TechnicalAnalysis()
+    rng = np.random.default_rng(0)
+
+    print(f"{'bars':>10} {'legacy ms':>12} {'kernels ms':>12} {'speedup':>9} {'max |diff|':>12}")
+    for n in sizes:
+        close = 100 + rng.standard_normal(n).cumsum() * 0.5 + n * 0.001
+        bars = BarSeries(np.arange(n, dtype=np.int64), close, close, close, close, np.ones(n))
+
+        legacy_ms = _best_of(lambda: legacy_indicators(close), repeat)
+        kernels_ms = _best_of(lambda: ta.calculate_bar_indicators(bars), repeat)
+
+        old, new = legacy_indicators(close), ta.calculate_bar_indicators(bars)
+        diff = max(float(np.nanmax(np.abs(np.asarray(old[k], dtype=float) - new[k]))) for k in new)
+
+        print(f"{n:>10} {legacy_ms:>12.2f} {kernels_ms:>12.2f} {legacy_ms / kernels_ms:>8.1f}x {diff:>12.2e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Lot matching over synthetic trade histories: the vectorized engine
+against a per-trade replay that keeps a deque of open lots per symbol.
+Realized PnL per symbol is checked to agree for every method.
+
+Run from backend/ (needs the usual .env for app settings):
+
+    python -m benchmarks.bench_lot_matching
+    python -m benchmarks.bench_lot_matching --trades 100000 1000000 --symbols 50 --repeat 5
+"""
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from app.services.lot_matching import METHODS, match_lots
+
+
+# ------------------------------------------------------------
+# PER-TRADE BASELINE
+# ------------------------------------------------------------
+def replay(trades, method):
+    """Realized PnL per symbol, one trade and one lot object at a time."""
+    books = {}
+    for i in np.lexsort((trades["id"], trades["ts"], trades["symbol"])).tolist():
+        symbol, price = trades["symbol"][i], float(trades["price"][i])
+        signed = float(trades["quantity"][i]) * (1 if trades["side"][i] > 0 else -1)
+        lots, pnl = books.setdefault(symbol, (deque(), [0.0]))
+        while signed and lots and (lots[0][0] > 0) != (signed > 0):
+            if method == "average":
+                held = sum(q for q, _ in lots)
+                merged = [held, sum(q * p for q, p in lots) / held]
+                lots.clear()
+                lots.append(merged)
+            lot = lots[-1] if method == "lifo" else lots[0]
+            take = min(abs(signed), abs(lot[0])) * (1 if lot[0] > 0 else -1)
+            pnl[0] += take * (price - lot[1])
+            lot[0] -= take
+            signed += take
+            if abs(lot[0]) < 1e-9:
+                lots.pop() if method == "lifo" else lots.popleft()
+        if abs(signed) > 1e-9:
+            lots.append([signed, price])
+    return {symbol: pnl[0] for symbol, (_, pnl) in books.items()}
+
+
+# ------------------------------------------------------------
+# HARNESS
+# ------------------------------------------------------------
+def _history(n: int, symbols: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return {
+        "id": np.arange(n),
+        "symbol": rng.choice([f"SYM{i:03d}" for i in range(symbols)], n),
+        "side": rng.choice([1, -1], n),
+        "quantity": rng.integers(1, 500, n).astype(float),
+        "price": rng.uniform(5, 500, n).round(2),
+        "ts": np.sort(rng.integers(1_500_000_000, 1_700_000_000, n)) * 10**9,
+    }
+
+
+def _best(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'trades':>9} {'method':>8} {'replay ms':>10} {'vector ms':>10} {'speedup':>8} {'lots':>9} {'round trips':>12}")
+    for n in args.trades:
+        trades = _history(n, args.symbols)
+        for method in METHODS:
+            # The replay is slow at 1M trades; one timed run is enough there
+            expected, replay_ms = _best(lambda: replay(trades, method), 1 if n >= 1_000_000 else args.repeat)
+            match, vector_ms = _best(lambda: match_lots(trades, method), args.repeat)
+            realized = match.realized_by_symbol()
+            assert all(abs(realized[s] - pnl) <= 1e-6 * max(1.0, abs(pnl)) for s, pnl in expected.items()), method
+            print(
+                f"{n:>9} {method:>8} {replay_ms:>10.1f} {vector_ms:>10.1f} {replay_ms / vector_ms:>7.1f}x "
+                f"{len(match.lots['pnl']):>9} {len(match.round_trips['pnl']):>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Portfolio summary three ways: loading every Trade row into ORM objects
+and grouping in Python, one GROUP BY symbol, trade_type query, and
+reading the positions projection (one row per symbol). The first two
+are checked to agree; all three must agree on trade count and value.
+
+Runs against a throwaway SQLite file by default; pass --url to use
+another database (trades and positions tables are created there and the benchmark
+user's rows are deleted afterwards).
+
+Run from backend/ (needs the usual .env for app settings):
+
+    python -m benchmarks.bench_portfolio_summary
+    python -m benchmarks.bench_portfolio_summary --trades 10000 100000 --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from sqlalchemy import create_engine, delete, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Position, Trade
+from app.services.portfolio import portfolio_summary
+from app.services.positions import load_positions, rebuild_positions
+
+USER_ID = 987_654
+
+
+# ------------------------------------------------------------
+# ROW-BY-ROW BASELINE (the previous /summary implementation)
+# ------------------------------------------------------------
+def orm_summary(db, user_id):
+    trades = db.query(Trade).filter(Trade.user_id == user_id).all()
+    if not trades:
+        return {"total_trades": 0, "total_value": 0, "win_rate": 0, "total_pnl": 0, "sharpe_ratio": 0}
+
+    total_value = sum(trade.quantity * trade.price for trade in trades)
+    symbol_trades = {}
+    for trade in trades:
+        symbol_trades.setdefault(trade.symbol, []).append(trade)
+
+    pnl, winning_trades = 0, 0
+    for s_trades in symbol_trades.values():
+        buys = [t for t in s_trades if t.trade_type == "buy"]
+        sells = [t for t in s_trades if t.trade_type == "sell"]
+        if buys and sells:
+            avg_buy = sum(t.price for t in buys) / len(buys)
+            avg_sell = sum(t.price for t in sells) / len(sells)
+            qty = min(sum(t.quantity for t in buys), sum(t.quantity for t in sells))
+            symbol_pnl = (avg_sell - avg_buy) * qty
+            pnl += symbol_pnl
+            if symbol_pnl > 0:
+                winning_trades += 1
+
+    return {
+        "total_trades": len(trades),
+        "total_value": round(total_value, 2),
+        "win_rate": round(winning_trades / len(symbol_trades) * 100, 2),
+        "total_pnl": round(pnl, 2),
+        "sharpe_ratio": round(pnl / total_value if total_value > 0 else 0, 4),
+    }
+
+
+# ------------------------------------------------------------
+# GROUP BY (per-side totals, same average-price estimate)
+# ------------------------------------------------------------
+def grouped_summary(db, user_id):
+    rows = (
+        db.query(
+            Trade.symbol, Trade.trade_type, func.count(Trade.id),
+            func.sum(Trade.quantity), func.sum(Trade.price), func.sum(Trade.quantity * Trade.price),
+        )
+        .filter(Trade.user_id == user_id)
+        .group_by(Trade.symbol, Trade.trade_type)
+        .all()
+    )
+    totals = {}
+    for symbol, trade_type, count, quantity, price_sum, notional in rows:
+        totals.setdefault(symbol, {})[trade_type] = (count, quantity, price_sum, notional)
+    if not totals:
+        return {"total_trades": 0, "total_value": 0, "win_rate": 0, "total_pnl": 0, "sharpe_ratio": 0}
+
+    total_value = sum(side[3] for sides in totals.values() for side in sides.values())
+    pnl, winning_trades = 0, 0
+    for sides in totals.values():
+        buys, sells = sides.get("buy"), sides.get("sell")
+        if buys and sells:
+            symbol_pnl = (sells[2] / sells[0] - buys[2] / buys[0]) * min(buys[1], sells[1])
+            pnl += symbol_pnl
+            if symbol_pnl > 0:
+                winning_trades += 1
+
+    return {
+        "total_trades": sum(side[0] for sides in totals.values() for side in sides.values()),
+        "total_value": round(total_value, 2),
+        "win_rate": round(winning_trades / len(totals) * 100, 2),
+        "total_pnl": round(pnl, 2),
+        "sharpe_ratio": round(pnl / total_value if total_value > 0 else 0, 4),
+    }
+
+
+# ------------------------------------------------------------
+# POSITIONS PROJECTION (what /summary reads)
+# ------------------------------------------------------------
+def positions_summary(db, user_id):
+    return portfolio_summary(load_positions(db, user_id))
+
+
+# ------------------------------------------------------------
+# HARNESS
+# ------------------------------------------------------------
+def _seed(engine, n: int, symbols: int = 500, batch: int = 50_000) -> None:
+    rng = np.random.default_rng(0)
+    names = [f"SYM{i:03d}" for i in range(symbols)]
+    with engine.begin() as conn:
+        conn.execute(delete(Trade).where(Trade.user_id == USER_ID))
+        conn.execute(delete(Position).where(Position.user_id == USER_ID))
+        for lo in range(0, n, batch):
+            size = min(batch, n - lo)
+            conn.execute(insert(Trade), [
+                {"user_id": USER_ID, "symbol": names[s], "trade_type": side, "quantity": float(q), "price": float(p)}
+                for s, side, q, p in zip(
+                    rng.integers(0, symbols, size),
+                    rng.choice(["buy", "sell"], size),
+                    rng.integers(1, 500, size),
+                    rng.uniform(5, 500, size).round(2),
+                )
+            ])
+
+
+def _measure(fn, Session, repeat: int):
+    """Best wall time (ms) and peak Python allocation (MiB) of one call."""
+    best = float("inf")
+    for _ in range(repeat):
+        with Session() as db:
+            started = time.perf_counter()
+            result = fn(db, USER_ID)
+            best = min(best, time.perf_counter() - started)
+
+    with Session() as db:
+        tracemalloc.start()
+        fn(db, USER_ID)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, best * 1000, peak / 2**20
+
+
+def run(url: str, sizes, repeat: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine, tables=[Trade.__table__, Position.__table__])
+    Session = sessionmaker(bind=engine)
+
+    print(
+        f"{'trades':>9} {'orm ms':>10} {'group ms':>9} {'positions ms':>13} "
+        f"{'orm MiB':>9} {'group MiB':>10} {'positions MiB':>14}"
+    )
+    try:
+        for n in sizes:
+            _seed(engine, n)
+            with Session() as db:
+                rebuild_positions(db, USER_ID)
+            # ORM path is slow at 1M rows; one timed run is enough there
+            orm, orm_ms, orm_mib = _measure(orm_summary, Session, 1 if n >= 1_000_000 else repeat)
+            grouped, group_ms, group_mib = _measure(grouped_summary, Session, repeat)
+            projected, pos_ms, pos_mib = _measure(positions_summary, Session, repeat)
+            assert orm == grouped, (orm, grouped)
+            assert orm["total_trades"] == projected["total_trades"] and orm["total_value"] == projected["total_value"]
+            print(
+                f"{n:>9} {orm_ms:>10.1f} {group_ms:>9.1f} {pos_ms:>13.2f} "
+                f"{orm_mib:>9.1f} {group_mib:>10.2f} {pos_mib:>14.2f}"
+            )
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Trade).where(Trade.user_id == USER_ID))
+            conn.execute(delete(Position).where(Position.user_id == USER_ID))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    if args.url:
+        run(args.url, args.trades, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.trades, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Parameter sweep throughput on the process pool, with bars shared through
+one shared memory block versus pickled into every task.
+
+Run from backend/ (needs the usual .env for app settings):
+
+    python -m benchmarks.bench_sweeps
+    python -m benchmarks.bench_sweeps --symbols 200 --years 10 --workers 4
+"""
+import argparse
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app.core.executor import _preload
+from app.services.bar_series import BarSeries
+from app.services.shared_bars import SharedBars
+from app.services.sweeps import build_candidates, sweep_chunk
+
+
+# ------------------------------------------------------------
+# PICKLED BASELINE
+# ------------------------------------------------------------
+def pickled_chunk(series, strategy, candidates, allow_short, fee_bps, slippage_bps):
+    """sweep_chunk over bars that travelled with the task."""
+    shared = SharedBars.create(series)
+    try:
+        return sweep_chunk(shared.handle, strategy, candidates, allow_short, fee_bps, slippage_bps)
+    finally:
+        shared.close()
+
+
+# ------------------------------------------------------------
+# HARNESS
+# ------------------------------------------------------------
+def _universe(symbols: int, years: int):
+    dates = pd.bdate_range(end="2024-12-31", periods=252 * years).as_unit("ns").asi8
+    rng = np.random.default_rng(0)
+    universe = {}
+    for i in range(symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(dates))))
+        universe[f"S{i:04d}"] = BarSeries(dates, close, close, close, close, np.full(len(dates), 1e6), symbol=f"S{i:04d}")
+    return universe
+
+
+def run(symbols: int, years: int, workers: int, chunk: int) -> None:
+    universe = _universe(symbols, years)
+    candidates = build_candidates("ema_cross", {"fast": [5, 10, 20, 30], "slow": [50, 100, 150, 200]})
+    names = list(universe)
+    groups = [names[i:i + chunk] for i in range(0, len(names), chunk)]
+    costs = (False, 1.0, 2.0)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_preload, initargs=(("app.services.sweeps",),)) as pool:
+        list(pool.map(int, range(workers)))  # start and preload workers outside the timing
+
+        shared = SharedBars.create(universe)
+        handles = [shared.subset(group) for group in groups]
+        started = time.perf_counter()
+        rows = [r for f in [pool.submit(sweep_chunk, h, "ema_cross", candidates, *costs) for h in handles] for r in f.result()]
+        shared_s = time.perf_counter() - started
+        shared.close()
+
+        payloads = [{s: universe[s] for s in group} for group in groups]
+        started = time.perf_counter()
+        baseline = [r for f in [pool.submit(pickled_chunk, p, "ema_cross", candidates, *costs) for p in payloads] for r in f.result()]
+        pickled_s = time.perf_counter() - started
+
+    assert len(rows) == len(baseline) == symbols * len(candidates)
+    task_bytes = np.mean([len(pickle.dumps(h)) for h in handles])
+    pickled_bytes = np.mean([len(pickle.dumps(p)) for p in payloads])
+    print(f"{symbols} symbols x {len(candidates)} candidates, {252 * years} bars, {workers} workers, {len(groups)} tasks")
+    print(f"{'shared memory':>14}: {shared_s * 1000:9.1f} ms  {task_bytes / 1024:10.1f} KiB/task")
+    print(f"{'pickled bars':>14}: {pickled_s * 1000:9.1f} ms  {pickled_bytes / 1024:10.1f} KiB/task")
+    print(f"{'evals/s':>14}: {len(rows) / shared_s:9.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk", type=int, default=8)
+    args = parser.parse_args()
+    run(args.symbols, args.years, args.workers, args.chunk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Value at Risk over a synthetic correlated portfolio: every method at
+each path count, plus the Monte Carlo engine against a per-horizon loop
+that draws fresh shocks and builds the whole path array for each horizon.
+
+Run from backend/ (needs the usual .env for app settings):
+
+    python -m benchmarks.bench_value_at_risk
+    python -m benchmarks.bench_value_at_risk --paths 100000 1000000 --assets 50 --repeat 5
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.services.value_at_risk import METHODS, tail_losses, value_at_risk
+
+
+# ------------------------------------------------------------
+# PER-HORIZON BASELINE
+# ------------------------------------------------------------
+def per_horizon(mean, cov, exposure, horizons, paths, seed):
+    """Monte Carlo tails drawing all paths at once, separately for each horizon."""
+    rng = np.random.default_rng(seed)
+    out = {}
+    for h in horizons:
+        moves = rng.multivariate_normal(h * mean, h * cov, paths)
+        out[h] = tail_losses(np.expm1(moves) @ exposure, (0.99,))
+    return out
+
+
+# ------------------------------------------------------------
+# HARNESS
+# ------------------------------------------------------------
+def _portfolio(assets: int, days: int = 750, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(0, 0.01, (assets, 3))
+    cov = loadings @ loadings.T + np.diag(rng.uniform(1e-5, 2e-4, assets))
+    returns = rng.multivariate_normal(np.full(assets, 2e-4), cov, days)
+    exposure = rng.uniform(-5_000, 20_000, assets)
+    return returns, exposure
+
+
+def _best(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--assets", type=int, default=50)
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    returns, exposure = _portfolio(args.assets)
+    mean, cov = returns.mean(axis=0), np.cov(returns, rowvar=False)
+    sigma = math.sqrt(exposure @ cov @ exposure)
+    print(f"{args.assets} assets, {len(returns)} days, 1-day sigma {sigma:,.0f}")
+
+    print(f"{'paths':>9} {'method':>12} {'ms':>9} {'loop ms':>9} {'speedup':>8} {'VaR99 10d':>11} {'CVaR99 10d':>11}")
+    for paths in args.paths:
+        for method in METHODS:
+            records, engine_ms = _best(
+                lambda: value_at_risk(returns, exposure, (0.99,), args.horizons, [method], paths, seed=1), args.repeat
+            )
+            worst = records[-1]
+            loop = ""
+            if method == "monte_carlo":
+                _, loop_ms = _best(lambda: per_horizon(mean, cov, exposure, args.horizons, paths, 1), args.repeat)
+                loop = f"{loop_ms:>9.1f} {loop_ms / engine_ms:>7.1f}x"
+            print(
+                f"{paths:>9} {method:>12} {engine_ms:>9.1f} {loop:>18} "
+                f"{worst['var'] or 0:>11,.0f} {worst['cvar'] or 0:>11,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
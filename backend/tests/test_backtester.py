@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from app.core.security import get_current_user
+from app.main import app
+from app.services.backtester import extract_trades, run_backtest, simulate, strategy_positions
+from app.services.bar_series import BarSeries
+from app.services.risk_management import RiskManagement
+
+def _bars(close):
+    """Daily BarSeries over the given closes"""
+    close = np.asarray(close, dtype=float)
+    ts = pd.bdate_range("2024-01-02", periods=len(close)).as_unit("ns").asi8
+    return BarSeries(ts, close, close, close, close, np.ones(len(close)), symbol="SIM")
+
+@pytest.fixture
+def walk():
+    """Ten years of random-walk daily closes"""
+    rng = np.random.default_rng(5)
+    return _bars(100 * np.exp(np.cumsum(rng.normal(0, 0.015, 2520))))
+
+def test_simulation_matches_a_bar_loop(walk):
+    """Test equity equals a bar-by-bar loop: positions earn the next bar, costs hit turnover"""
+    target = strategy_positions(walk, "bollinger", allow_short=True)
+    sim = simulate(walk.close, target, fee_bps=5, slippage_bps=10, initial_capital=1000)
+
+    equity, position, expected = 1000.0, 0.0, []
+    for i, price in enumerate(walk.close):
+        bar_return = price / walk.close[i - 1] - 1 if i else 0.0
+        equity *= 1 + position * bar_return - abs(target[i] - position) * 15 / 10_000
+        position = target[i]
+        expected.append(equity)
+
+    np.testing.assert_allclose(sim["equity"], expected, rtol=1e-10)
+    assert set(np.unique(target)) <= {-1.0, 0.0, 1.0}
+
+def test_signal_bar_return_is_not_captured():
+    """Test a position opened on a bar's close does not earn that bar's move"""
+    close = np.array([100.0, 50.0, 100.0])
+    sim = simulate(close, np.array([0.0, 1.0, 1.0]), fee_bps=0, slippage_bps=0, initial_capital=1)
+
+    np.testing.assert_allclose(sim["equity"], [1.0, 1.0, 2.0])
+
+def test_trade_list_round_trips():
+    """Test entries/exits, prices with slippage and the open flag of the trade list"""
+    bars = _bars([10, 11, 12, 13, 12, 11, 10, 11])
+    target = np.array([0, 1, 1, 0, -1, -1, 1, 1], dtype=float)
+    equity = simulate(bars.close, target, 0, 100)["equity"]
+
+    trades = extract_trades(bars, target, equity, fee_bps=0, slippage_bps=100, initial_capital=10_000)
+
+    assert [(t["side"], t["bars_held"], t["open"]) for t in trades] == [
+        ("long", 2, False), ("short", 2, False), ("long", 1, True),
+    ]
+    assert trades[0]["entry_price"] == pytest.approx(11 * 1.01)
+    assert trades[0]["exit_price"] == pytest.approx(13 * 0.99)
+    assert trades[1]["return"] == pytest.approx(-(10 * 1.01) / (12 * 0.99) + 1)
+    assert trades[1]["entry_date"] == "2024-01-08"
+
+def test_backtest_reports_risk_management_metrics(walk):
+    """Test Sharpe, drawdown and win rate come from RiskManagement"""
+    result = run_backtest(walk, "rsi", {"period": 10, "lower": 35, "upper": 65})
+    metrics = result["metrics"]
+    equity = np.asarray(result["equity_curve"]["equity"])
+
+    returns = np.r_[0.0, equity[1:] / equity[:-1] - 1]
+    assert metrics["sharpe_ratio"] == pytest.approx(RiskManagement.calculate_sharpe_ratio(returns))
+    assert metrics["max_drawdown"] == RiskManagement.calculate_max_drawdown(equity)
+    assert metrics["win_rate"]["total_trades"] == len(result["trades"]) > 0
+    assert metrics["final_equity"] == pytest.approx(equity[-1])
+
+    with pytest.raises(ValueError):
+        run_backtest(walk, "moon_phase")
+    with pytest.raises(ValueError):
+        run_backtest(walk, "rsi", {"lookback": 5})
+
+@pytest.mark.parametrize("strategy,params,match", [
+    ("rsi", {"period": 0}, "whole number >= 1"),
+    ("rsi", {"period": -3}, "whole number >= 1"),
+    ("rsi", {"period": 7.5}, "whole number >= 1"),
+    ("rsi", {"lower": 80}, "less than 'upper'"),
+    ("rsi", {"upper": 120}, "between 0 and 100"),
+    ("macd_cross", {"fast": 0}, "whole number >= 1"),
+    ("macd_cross", {"fast": 30}, "less than 'slow'"),
+    ("ema_cross", {"fast": -1}, "whole number >= 1"),
+    ("ema_cross", {"fast": 0}, "whole number >= 1"),
+    ("ema_cross", {"fast": 50, "slow": 50}, "less than 'slow'"),
+    ("bollinger", {"period": 1}, "whole number >= 2"),
+    ("bollinger", {"std": 0}, "positive"),
+])
+def test_run_route_rejects_bad_parameter_values(strategy, params, match):
+    """Test out-of-range strategy parameters are a 400 from the backtest route, before any data fetch"""
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    try:
+        response = TestClient(app).post("/api/backtest/run", json={"symbol": "AAPL", "strategy": strategy, "params": params})
+    finally:
+        app.dependency_overrides.pop(get_current_user)
+
+    assert response.status_code == 400
+    assert match in response.json()["detail"]
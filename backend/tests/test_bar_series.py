@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.bar_series import BarSeries
+from app.services.technical_analysis import TechnicalAnalysis
+
+@pytest.fixture
+def frame():
+    """Normalized daily OHLCV frame as stored in the cache"""
+    dates = pd.bdate_range("2024-01-02", periods=60)
+    close = np.linspace(100, 130, len(dates))
+    return pd.DataFrame({
+        "date": dates,
+        "open": close - 1,
+        "high": close + 1,
+        "low": close - 2,
+        "close": close,
+        "volume": np.full(len(dates), 1000.0),
+    })
+
+def test_arrays_are_read_only_views(frame):
+    """Test wrapping a frame shares its float arrays instead of copying them"""
+    bars = BarSeries.from_frame(frame, "AAPL", "1d")
+
+    assert np.shares_memory(bars.close, frame["close"].to_numpy())
+    assert bars.ts.dtype == np.int64 and bars.close.flags.c_contiguous
+    with pytest.raises(ValueError):
+        bars.close[0] = 0.0
+    assert np.shares_memory(bars.tail(10).close, bars.close)
+
+def test_dates_render_like_the_legacy_strings(frame):
+    """Test JSON dates match the old astype(str) output, daily and intraday"""
+    bars = BarSeries.from_frame(frame)
+    assert bars.date_strings() == frame["date"].astype(str).tolist()
+
+    intraday = frame.assign(date=pd.date_range("2024-03-08 09:30", periods=60, freq="5min", tz="America/New_York"))
+    bars = BarSeries.from_frame(intraday, interval="5m")
+    assert bars.date_strings() == intraday["date"].astype(str).tolist()
+    assert bars.to_records()[0] == {
+        "date": "2024-03-08 09:30:00-05:00", "open": 99.0, "high": 101.0, "low": 98.0, "close": 100.0, "volume": 1000.0
+    }
+
+def test_bar_indicators_are_aligned_arrays(frame):
+    """Test indicators come back as float arrays, one value per bar"""
+    bars = BarSeries.from_frame(frame)
+    indicators = TechnicalAnalysis().calculate_bar_indicators(bars)
+
+    assert set(indicators) == {"rsi", "macd", "macd_signal", "bollinger_upper", "bollinger_lower", "sma", "ema"}
+    assert all(len(values) == len(bars) for values in indicators.values())
+    np.testing.assert_allclose(indicators["sma"], frame["close"].rolling(20).mean(), equal_nan=True)
+    assert np.isnan(indicators["rsi"][:14]).all() and indicators["rsi"][-1] == 100
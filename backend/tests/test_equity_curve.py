@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from app.services.bar_series import DAY_NS, BarPanel, BarSeries
+from app.services.equity_curve import EquityCurveCache, build_equity_curve
+
+DAY0 = 19_723 * DAY_NS  # 2024-01-01
+
+def _panel(**closes):
+    """Daily panel from symbol -> closes starting on DAY0"""
+    series = {}
+    for symbol, close in closes.items():
+        close = np.asarray(close, dtype=float)
+        ts = DAY0 + np.arange(len(close)) * DAY_NS
+        series[symbol] = BarSeries(ts, close, close, close, close, np.ones(len(close)), symbol=symbol)
+    return BarPanel.from_series(series)
+
+def _trades(*rows):
+    """Column arrays from (symbol, side, quantity, price, day) rows"""
+    symbol, side, quantity, price, day = (np.array(col) for col in zip(*rows))
+    return {
+        "id": np.arange(len(rows)),
+        "symbol": symbol,
+        "side": side.astype(np.int8),
+        "quantity": quantity.astype(float),
+        "price": price.astype(float),
+        "ts": DAY0 + (day * DAY_NS).astype(np.int64) + 15 * 3600 * 10**9,
+    }
+
+def test_marks_positions_at_daily_closes():
+    """Test equity is cash plus market value at each close, and returns are over gross exposure"""
+    curve = build_equity_curve(
+        _trades(("AAPL", 1, 10, 100, 0), ("AAPL", -1, 10, 106, 2)),
+        _panel(AAPL=[102, 105, 104, 110], MSFT=[1, 2, 3, 4]),
+    )
+
+    assert curve["ts"].tolist() == [DAY0 + d * DAY_NS for d in range(4)]
+    assert curve["equity"].tolist() == pytest.approx([20, 50, 60, 60])
+    assert curve["gross_exposure"].tolist() == pytest.approx([1020, 1050, 0, 0])
+    assert curve["returns"].tolist() == pytest.approx([30 / 1050, 10 / 1050, 0])
+
+def test_falls_back_to_trade_prices():
+    """Test a symbol without closes is marked at its trades, and a day without bars gets a row"""
+    curve = build_equity_curve(
+        _trades(("AAPL", 1, 1, 100, 0), ("NOPE", -1, 2, 50, 1), ("NOPE", -1, 1, 40, 5)),
+        _panel(AAPL=[100, 101, 102]),
+    )
+
+    assert (curve["ts"] - DAY0).tolist() == [0, DAY_NS, 2 * DAY_NS, 5 * DAY_NS]
+    # Short 2 @ 50 marked at 50 until the sale at 40 re-marks all 3
+    assert curve["market_value"].tolist() == pytest.approx([100, 1, 2, -18])
+    assert curve["equity"].tolist() == pytest.approx([0, 1, 2, 22])
+
+def test_cache_drops_builds_that_raced_an_invalidation():
+    """Test a curve built before a trade change is not stored after it"""
+    cache = EquityCurveCache(max_entries=1)
+    curve = {"ts": np.arange(3)}
+    stale = cache.generation(1)
+    cache.invalidate(1)
+    cache.put(1, stale, curve)
+    assert cache.get(1) is None
+
+    cache.put(1, cache.generation(1), curve)
+    cache.put(2, cache.generation(2), {"ts": np.arange(1)})
+    assert cache.get(1) is None and cache.get(2) is not None
+    assert not curve["ts"].flags.writeable
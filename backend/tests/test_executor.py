@@ -0,0 +1,29 @@
+import asyncio
+import threading
+from app.core.executor import BoundedExecutor
+
+def test_cancelled_calls_leave_the_queue():
+    """Test queue_depth drops back for calls cancelled before a worker picked them up"""
+    executor = BoundedExecutor(max_workers=1, name="test")
+    release = threading.Event()
+
+    async def main():
+        busy = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = [asyncio.ensure_future(executor.run(sum, [1, 2])) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert executor.stats()["queue_depth"] == 3
+
+        queued[0].cancel()
+        await asyncio.sleep(0.05)
+        assert executor.stats()["queue_depth"] == 2
+
+        executor.shutdown()
+        release.set()
+        await busy
+        await asyncio.gather(*queued, return_exceptions=True)
+
+    asyncio.run(main())
+    stats = executor.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["cancelled"] == 3
+    assert stats["completed"] == 1
@@ -0,0 +1,60 @@
+import asyncio
+import json
+from websockets.exceptions import ConnectionClosedError
+from app.providers.finnhub import FinnhubProvider
+
+class FakeSocket:
+    """Connection that sends its messages, then ends the way `ending` says"""
+    def __init__(self, messages, ending):
+        self.messages, self.ending, self.sent = messages, ending, []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def __aiter__(self):
+        return self._messages()
+
+    async def _messages(self):
+        for message in self.messages:
+            yield message
+        if self.ending:
+            raise self.ending
+
+def test_stream_reconnects_with_backoff(monkeypatch):
+    """Test a dropped or refused connection is retried with growing delays and re-subscribed"""
+    trade = json.dumps({"type": "trade", "data": [{"s": "AAPL", "p": 1.0, "t": 1}]})
+    sockets = [
+        FakeSocket([trade, "not json"], ConnectionClosedError(None, None)),
+        OSError("connection refused"),
+        FakeSocket(['{"type": "ping"}', trade], None),
+    ]
+    opened, delays = [], []
+
+    def connect(url):
+        socket = sockets.pop(0)
+        if isinstance(socket, Exception):
+            raise socket
+        opened.append(socket)
+        return socket
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("app.providers.finnhub.websockets.connect", connect)
+    monkeypatch.setattr("app.providers.finnhub.asyncio.sleep", sleep)
+
+    async def main():
+        stream = FinnhubProvider().stream_ticks(["AAPL"])
+        batches = [await stream.__anext__() for _ in range(2)]
+        await stream.aclose()
+        return batches
+
+    assert asyncio.run(main()) == [[{"s": "AAPL", "p": 1.0, "t": 1}]] * 2
+    assert delays == [1.0, 2.0]
+    assert [socket.sent for socket in opened] == [[{"type": "subscribe", "symbol": "AAPL"}]] * 2
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.bar_series import BarSeries
+from app.services.indicator_cache import IndicatorCache
+from app.services.technical_analysis import DEFAULT_INDICATOR_PARAMS, TechnicalAnalysis
+
+def _bars(symbol="AAPL", n=120, last_close=None):
+    """Random-walk daily BarSeries, optionally with a revised last close"""
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(n).cumsum()
+    if last_close is not None:
+        close[-1] = last_close
+    ts = pd.bdate_range("2024-01-02", periods=n).as_unit("ns").asi8
+    return BarSeries(ts, close, close + 1, close - 1, close, np.full(n, 1000.0), symbol=symbol)
+
+@pytest.fixture
+def cache():
+    """Cache with room for a handful of 120-bar indicator sets"""
+    return IndicatorCache(max_bytes=3 * 7 * 120 * 8)
+
+def _compute(bars, calls):
+    """Compute function that counts how often it runs"""
+    def compute():
+        calls.append(bars.symbol)
+        return TechnicalAnalysis().calculate_bar_indicators(bars)
+    return compute
+
+def test_unchanged_bars_hit(cache):
+    """Test equal bars (even a different BarSeries object) reuse the stored arrays"""
+    calls = []
+    first = cache.get_or_compute(_bars(), DEFAULT_INDICATOR_PARAMS, _compute(_bars(), calls))
+    second = cache.get_or_compute(_bars(), DEFAULT_INDICATOR_PARAMS, _compute(_bars(), calls))
+
+    assert calls == ["AAPL"]
+    assert second["rsi"] is first["rsi"]
+    assert not second["rsi"].flags.writeable
+    assert cache.stats()["hits"] == 1
+
+def test_revised_bar_or_new_params_miss(cache):
+    """Test a changed last bar or different parameters recompute"""
+    calls = []
+    bars = _bars()
+    cache.get_or_compute(bars, DEFAULT_INDICATOR_PARAMS, _compute(bars, calls))
+
+    revised = _bars(last_close=float(bars.close[-1]) + 0.01)
+    cache.get_or_compute(revised, DEFAULT_INDICATOR_PARAMS, _compute(revised, calls))
+    cache.get_or_compute(bars, {**DEFAULT_INDICATOR_PARAMS, "rsi_period": 7}, _compute(bars, calls))
+
+    assert len(calls) == 3
+
+def test_evicts_least_recent_within_byte_budget(cache):
+    """Test the oldest entries are dropped once arrays exceed the byte budget"""
+    calls = []
+    for symbol in ["A", "B", "C", "D"]:
+        bars = _bars(symbol)
+        cache.get_or_compute(bars, DEFAULT_INDICATOR_PARAMS, _compute(bars, calls))
+
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= cache.max_bytes
+
+    bars = _bars("A")
+    cache.get_or_compute(bars, DEFAULT_INDICATOR_PARAMS, _compute(bars, calls))
+    assert calls == ["A", "B", "C", "D", "A"]
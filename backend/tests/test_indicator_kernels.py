@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.technical_analysis import TechnicalAnalysis, bollinger, ema, macd, rsi, sma
+
+def reference_rsi(prices, period=14):
+    """The original per-price loop, kept as the reference for Wilder RSI"""
+    gains, losses = [], []
+    for i in range(1, len(prices)):
+        change = prices[i] - prices[i - 1]
+        gains.append(change if change > 0 else 0)
+        losses.append(0 if change > 0 else abs(change))
+
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    values = []
+    for i in range(period, len(prices)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        values.append(100 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss))
+    return [np.nan] * (len(prices) - len(values)) + values
+
+@pytest.fixture
+def prices():
+    """Random-walk closes with a flat stretch (no losses) in the middle"""
+    rng = np.random.default_rng(42)
+    close = 100 + rng.standard_normal(500).cumsum()
+    close[200:230] = np.linspace(close[200], close[200] + 15, 30)
+    return close
+
+def test_rsi_matches_the_loop_implementation(prices):
+    """Test vectorized Wilder RSI reproduces the original loop"""
+    np.testing.assert_allclose(rsi(prices), reference_rsi(prices.tolist()), rtol=1e-10, equal_nan=True)
+    assert np.isnan(rsi(prices[:14])).all()
+
+def test_public_wrappers_keep_their_list_shapes(prices):
+    """Test the TechnicalAnalysis wrappers still return the original lists: trimmed RSI, [] when too short"""
+    ta, closes = TechnicalAnalysis(), prices.tolist()
+    series = pd.Series(closes)
+
+    values = ta.calculate_rsi(closes)
+    assert isinstance(values, list) and len(values) == len(closes) - 14
+    assert values == pytest.approx(reference_rsi(closes)[14:], rel=1e-10)
+    assert values[-1] == pytest.approx(rsi(prices)[-1])
+
+    lines = ta.calculate_macd(closes)
+    expected = series.ewm(span=12).mean() - series.ewm(span=26).mean()
+    assert [len(v) for v in lines.values()] == [len(closes)] * 3
+    assert lines["macd"] == pytest.approx(expected.tolist(), rel=1e-10)
+    assert ta.calculate_ema(closes, 20) == pytest.approx(series.ewm(span=20).mean().tolist(), rel=1e-10)
+    assert ta.calculate_bollinger_bands(closes)["middle"][-1] == pytest.approx(series.tail(20).mean())
+
+    short = closes[:10]
+    assert ta.calculate_rsi(short) == [] and ta.calculate_ema(short, 20) == []
+    assert ta.calculate_macd(short) == {"macd": [], "signal": [], "histogram": []}
+    assert ta.calculate_bollinger_bands(short) == {"upper": [], "middle": [], "lower": []}
+
+def test_moving_averages_match_pandas(prices):
+    """Test SMA/EMA/MACD/Bollinger equal the pandas definitions they replace"""
+    series = pd.Series(prices)
+    np.testing.assert_allclose(sma(prices, 20), series.rolling(20).mean(), equal_nan=True)
+    np.testing.assert_allclose(ema(prices, 20), series.ewm(span=20).mean())
+
+    line, signal, histogram = macd(prices)
+    expected = series.ewm(span=12).mean() - series.ewm(span=26).mean()
+    np.testing.assert_allclose(line, expected)
+    np.testing.assert_allclose(signal, expected.ewm(span=9).mean())
+    np.testing.assert_allclose(histogram, line - signal)
+
+    upper, middle, lower = bollinger(prices)
+    std = series.rolling(20).std()
+    np.testing.assert_allclose(upper, middle + 2 * std, equal_nan=True)
+    np.testing.assert_allclose(lower, middle - 2 * std, equal_nan=True)
+
+@pytest.mark.parametrize("kernel", [lambda x: rsi(x), lambda x: ema(x, 20), lambda x: sma(x, 20), lambda x: macd(x)[1]])
+def test_panel_input_is_computed_per_column(prices, kernel):
+    """Test a time x symbol matrix gives the same columns as 1-D calls"""
+    panel = np.column_stack([prices, prices[::-1], prices * 2])
+    result = kernel(panel)
+
+    for col in range(panel.shape[1]):
+        np.testing.assert_allclose(result[:, col], kernel(panel[:, col]), equal_nan=True)
+
+def test_panel_indicators_match_single_symbol_results():
+    """Test a panel with a late-listed symbol gives each column its own results"""
+    from app.services.bar_series import BarPanel, BarSeries
+    from app.services.technical_analysis import TechnicalAnalysis
+
+    dates = pd.bdate_range("2023-01-02", periods=200)
+    rng = np.random.default_rng(3)
+    series = {}
+    for symbol, start in [("AAPL", 0), ("NEWCO", 80)]:
+        close = 50 + rng.standard_normal(len(dates) - start).cumsum()
+        series[symbol] = BarSeries.from_frame(pd.DataFrame({
+            "date": dates[start:], "open": close, "high": close, "low": close, "close": close, "volume": 1.0,
+        }), symbol)
+
+    ta = TechnicalAnalysis()
+    panel = BarPanel.from_series(series)
+    result = ta.calculate_panel_indicators(panel)
+
+    for j, symbol in enumerate(panel.symbols):
+        alone = ta.calculate_bar_indicators(series[symbol])
+        rows = ~np.isnan(panel.close[:, j])
+        for name, values in alone.items():
+            np.testing.assert_allclose(result[name][rows, j], values, rtol=1e-12, equal_nan=True, err_msg=name)
+        assert np.isnan(result["rsi"][~rows, j]).all()
+
+def test_panel_indicators_ignore_other_symbols_calendars():
+    """Test 7-day, business-day and gapped symbols in one panel each match their own compute_indicators"""
+    from app.services.bar_series import BarPanel, BarSeries
+    from app.services.technical_analysis import INDICATOR_OUTPUTS, TechnicalAnalysis, compute_indicators
+
+    rng = np.random.default_rng(11)
+    calendars = {
+        "BTC-USD": pd.date_range("2023-01-02", periods=400),
+        "AAPL": pd.bdate_range("2023-01-02", periods=286),
+        "GAPPY": pd.bdate_range("2023-01-02", periods=286).delete([100, 101, 102, 200]),
+    }
+    series = {}
+    for symbol, dates in calendars.items():
+        close = 100 + rng.standard_normal(len(dates)).cumsum()
+        series[symbol] = BarSeries.from_frame(pd.DataFrame({
+            "date": dates, "open": close, "high": close + rng.random(len(dates)), "low": close - rng.random(len(dates)),
+            "close": close, "volume": rng.integers(100, 1000, len(dates)).astype(float),
+        }), symbol)
+
+    panel = BarPanel.from_series(series)
+    outputs = list(INDICATOR_OUTPUTS)
+    result = TechnicalAnalysis().calculate_panel_indicators(panel, outputs)
+
+    for j, symbol in enumerate(panel.symbols):
+        own = panel.column(symbol)
+        alone = compute_indicators({col: getattr(own, col) for col in ("high", "low", "close", "volume")}, outputs)
+        rows = ~np.isnan(panel.close[:, j])
+        for name in outputs:
+            np.testing.assert_allclose(result[name][rows, j], alone[name], rtol=1e-12, equal_nan=True, err_msg=f"{symbol} {name}")
+            assert np.isnan(result[name][~rows, j]).all()
+    assert not np.isnan(result["sma"][:, panel.symbols.index("AAPL")]).all()
+
+@pytest.fixture
+def ohlcv():
+    """Random-walk high/low/close/volume"""
+    rng = np.random.default_rng(7)
+    close = 100 + rng.standard_normal(300).cumsum()
+    high = close + rng.random(300) * 2
+    low = close - rng.random(300) * 2
+    volume = rng.integers(100, 1000, 300).astype(float)
+    return high, low, close, volume
+
+def test_volume_and_range_kernels_match_pandas(ohlcv):
+    """Test ATR/VWAP/OBV/Stochastic equal their pandas definitions"""
+    from app.services.technical_analysis import atr, obv, stochastic, vwap
+
+    high, low, close, volume = ohlcv
+    h, l, c, v = map(pd.Series, ohlcv)
+
+    true_range = pd.concat([h - l, (h - c.shift()).abs(), (l - c.shift()).abs()], axis=1).max(axis=1)
+    expected = np.full(len(c), np.nan)
+    expected[13] = true_range[:14].mean()
+    for i in range(14, len(c)):
+        expected[i] = (expected[i - 1] * 13 + true_range[i]) / 14
+    np.testing.assert_allclose(atr(high, low, close), expected, equal_nan=True)
+
+    typical = (h + l + c) / 3
+    session = np.repeat([0, 1, 2], 100)
+    np.testing.assert_allclose(vwap(high, low, close, volume), (typical * v).cumsum() / v.cumsum())
+    np.testing.assert_allclose(
+        vwap(high, low, close, volume, session),
+        (typical * v).groupby(session).cumsum() / v.groupby(session).cumsum(),
+    )
+
+    np.testing.assert_allclose(obv(close, volume), (np.sign(c.diff()).fillna(0) * v).cumsum())
+
+    k, d = stochastic(high, low, close)
+    expected_k = 100 * (c - l.rolling(14).min()) / (h.rolling(14).max() - l.rolling(14).min())
+    np.testing.assert_allclose(k, expected_k, equal_nan=True)
+    np.testing.assert_allclose(d, expected_k.rolling(3).mean(), equal_nan=True)
+
+def test_selected_indicators_and_params(ohlcv):
+    """Test only the requested outputs are returned, with their own periods"""
+    from app.services.bar_series import BarSeries
+    from app.services.technical_analysis import TechnicalAnalysis, indicator_params, resolve_indicators
+
+    high, low, close, volume = ohlcv
+    bars = BarSeries(np.arange(len(close), dtype=np.int64), close, high, low, close, volume)
+
+    result = TechnicalAnalysis().calculate_bar_indicators(bars, ["rsi", "stochastic", "atr"], {"rsi_period": 7})
+
+    assert list(result) == ["rsi", "stoch_k", "stoch_d", "atr"]
+    np.testing.assert_allclose(result["rsi"], rsi(close, 7), equal_nan=True)
+    assert indicator_params(resolve_indicators(["obv", "rsi"])) == {"rsi_period": 14}
+    with pytest.raises(ValueError):
+        resolve_indicators(["rsi", "adx"])
@@ -0,0 +1,89 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.bar_series import BarSeries
+from app.services.indicator_stream import IndicatorEngine, IndicatorState
+from app.services.technical_analysis import bollinger, ema, macd, rsi
+
+@pytest.fixture
+def daily():
+    """300 daily bars of random-walk closes"""
+    dates = pd.bdate_range("2023-01-02", periods=300)
+    close = 100 + np.random.default_rng(1).standard_normal(len(dates)).cumsum()
+    return BarSeries.from_frame(pd.DataFrame({
+        "date": dates, "open": close, "high": close, "low": close, "close": close, "volume": 1.0,
+    }), "AAPL", "1d")
+
+def _expected(close):
+    """Last-bar values of the array kernels over the full history"""
+    line, signal, _ = macd(close)
+    upper, middle, lower = bollinger(close)
+    return {
+        "rsi": rsi(close)[-1], "ema": ema(close, 20)[-1], "macd": line[-1], "macd_signal": signal[-1],
+        "sma": middle[-1], "bollinger_upper": upper[-1], "bollinger_lower": lower[-1],
+    }
+
+def _ms(ts_ns):
+    """Epoch ms of 15:00 New York time on the bar's day"""
+    return (pd.Timestamp(ts_ns).tz_localize("America/New_York") + pd.Timedelta(hours=15)).value / 1e6
+
+def test_ticks_match_batch_kernels(daily):
+    """Test streaming new bars tick by tick lands on the batch values"""
+    state = IndicatorState("AAPL", "1d")
+    state.seed(daily[:250])
+
+    for ts, close in zip(daily.ts[250:], daily.close[250:]):
+        state.on_tick(close + 1.0, _ms(ts))  # intrabar tick, superseded below
+        state.on_tick(close, _ms(ts) + 60_000)
+
+    for name, value in _expected(daily.close).items():
+        assert state.values[name] == pytest.approx(value, rel=1e-9), name
+    assert state.snapshot()["bars"] == 300
+
+def test_stale_ticks_are_ignored(daily):
+    """Test a trade for an already closed bar does not move the state"""
+    state = IndicatorState("AAPL", "1d")
+    state.seed(daily)
+    before = dict(state.values)
+
+    state.on_tick(1.0, _ms(daily.ts[-5]))
+
+    assert state.values == before
+
+def test_engine_routes_trades_to_tracked_symbols(daily, monkeypatch):
+    """Test the engine seeds once and applies stream trades to that state"""
+    engine = IndicatorEngine()
+
+    async def fake_seed_bars(self, symbol, resolution, days, priority):
+        return daily
+
+    monkeypatch.setattr("app.services.data_fetcher.DataFetcher.get_bar_series", fake_seed_bars)
+    state = asyncio.run(engine.get("aapl", "1d"))
+
+    engine.on_trades([{"s": "AAPL", "p": 500.0, "t": _ms(daily.ts[-1])}, {"s": "MSFT", "p": 1.0}])
+
+    assert state.close == 500.0
+    assert asyncio.run(engine.get("AAPL", "1d")) is state
+    assert engine.stats() == {"ticks": 1, "seeds": 1, "evicted": 0, "tracked": 1}
+
+def test_engine_drops_idle_and_least_recent_series(daily, monkeypatch):
+    """Test unread series stop receiving ticks and the tracked count is capped"""
+    engine = IndicatorEngine(max_tracked=2, idle_ttl=60)
+    clock = [1_000.0]
+
+    async def fake_seed_bars(self, symbol, resolution, days, priority):
+        return daily
+
+    monkeypatch.setattr("app.services.data_fetcher.DataFetcher.get_bar_series", fake_seed_bars)
+    monkeypatch.setattr("app.services.indicator_stream.time.time", lambda: clock[0])
+    stale = asyncio.run(engine.get("AAPL", "1d"))
+    asyncio.run(engine.get("MSFT", "1d"))
+    asyncio.run(engine.get("TSLA", "1d"))  # over the cap: AAPL was read least recently
+    assert engine.stats()["tracked"] == 2
+
+    clock[0] += 61
+    engine.on_trades([{"s": "AAPL", "p": 500.0, "t": _ms(daily.ts[-1])}, {"s": "TSLA", "p": 500.0}])
+
+    assert stale.close != 500.0
+    assert engine.stats() == {"ticks": 0, "seeds": 3, "evicted": 3, "tracked": 0}
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from app.services.lot_matching import NS_PER_DAY, match_lots
+from app.services.risk_management import RiskManagement
+
+def _trades(*rows, symbol="AAPL"):
+    """Column arrays from (side, quantity, price, day) rows, one trade per day offset"""
+    side, quantity, price, day = (np.array(col) for col in zip(*rows))
+    return {
+        "id": np.arange(len(rows)),
+        "symbol": np.full(len(rows), symbol),
+        "side": side,
+        "quantity": quantity.astype(float),
+        "price": price.astype(float),
+        "ts": day.astype(np.int64) * NS_PER_DAY,
+    }
+
+SCALED = _trades(
+    (1, 10, 100, 0),
+    (1, 10, 110, 1),
+    (-1, 15, 120, 2),  # FIFO: 10 @ 100 + 5 @ 110, LIFO: 10 @ 110 + 5 @ 100
+    (-1, 5, 90, 5),
+)
+
+@pytest.mark.parametrize("method,pnl,holding", [
+    ("fifo", [200.0, 50.0, -100.0], [2.0, 1.0, 4.0]),
+    ("lifo", [100.0, 100.0, -50.0], [2.0, 1.0, 5.0]),
+    ("average", [225.0, -75.0], [1.5, 4.5]),
+])
+def test_scaling_in_and_out(method, pnl, holding):
+    """Test realized PnL and holding days per closed lot under each method"""
+    lots = match_lots(SCALED, method).lots
+
+    order = np.lexsort((lots["open_ts"], lots["close_ts"]))
+    assert lots["pnl"][order].tolist() == pytest.approx(pnl)
+    assert lots["holding_days"][order].tolist() == pytest.approx(holding)
+    assert lots["closed"].all()
+
+def test_flip_splits_round_trips_and_feeds_win_rate():
+    """Test a trade through zero closes the long round trip and opens a short one"""
+    match = match_lots(_trades(
+        (1, 10, 100, 0),
+        (-1, 15, 90, 1),   # -100 on the long, short 5 @ 90
+        (1, 5, 80, 2),     # +50 on the short
+        (1, 3, 10, 3),     # new long, still open
+    ), "fifo")
+    trips = match.round_trips
+
+    assert trips["side"].tolist() == [1, -1, 1]
+    assert trips["closed"].tolist() == [True, True, False]
+    assert trips["pnl"].tolist() == pytest.approx([-100.0, 50.0, 0.0])
+    assert RiskManagement.calculate_win_rate(match.win_rate_records()) == {
+        "win_rate": 0.5, "total_trades": 2, "winning_trades": 1, "losing_trades": 1
+    }
+    still_open = ~match.lots["closed"]
+    assert match.lots["quantity"][still_open].tolist() == [3.0]
+
+@pytest.mark.parametrize("method", ["fifo", "lifo", "average"])
+def test_matches_per_trade_replay(method):
+    """Test per-symbol realized PnL against a straightforward lot-by-lot replay"""
+    rng = np.random.default_rng(7)
+    n = 400
+    trades = {
+        "id": np.arange(n),
+        "symbol": rng.choice(["AAPL", "MSFT", "TSLA"], n),
+        "side": rng.choice([1, -1], n),
+        "quantity": rng.integers(1, 20, n).astype(float),
+        "price": rng.uniform(10, 20, n).round(2),
+        "ts": rng.integers(0, 10**15, n),
+    }
+
+    expected = {}
+    for i in np.lexsort((trades["id"], trades["ts"])):
+        symbol, price = trades["symbol"][i], trades["price"][i]
+        signed = trades["quantity"][i] * trades["side"][i]
+        book = expected.setdefault(symbol, {"lots": [], "pnl": 0.0})
+        lots = book["lots"]
+        while signed and lots and (lots[0][0] > 0) != (signed > 0):
+            lot = lots[0] if method == "fifo" else lots[-1]
+            if method == "average":
+                held = sum(q for q, _ in lots)
+                lot = [held, sum(q * p for q, p in lots) / held]
+                lots[:] = [lot]
+            take = min(abs(signed), abs(lot[0])) * np.sign(lot[0])
+            book["pnl"] += take * (price - lot[1])
+            lot[0] -= take
+            signed += take
+            if lot[0] == 0:
+                lots.remove(lot)
+        if signed:
+            lots.append([signed, price])
+
+    realized = match_lots(trades, method).realized_by_symbol()
+    assert realized == pytest.approx({symbol: book["pnl"] for symbol, book in expected.items()})
+
+def test_unknown_method():
+    """Test an unsupported matching method is rejected"""
+    with pytest.raises(ValueError, match="hifo"):
+        match_lots(SCALED, "hifo")
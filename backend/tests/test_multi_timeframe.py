@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.bar_series import BarSeries
+from app.services.multi_timeframe import finest_interval, multi_timeframe_indicators
+from app.services.resampler import resample_bars
+from app.services.technical_analysis import TechnicalAnalysis
+
+INDICATORS = ["rsi", "macd", "bollinger", "atr", "vwap", "stochastic"]
+
+def _bars(n=900):
+    """Random-walk daily BarSeries"""
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    ts = pd.bdate_range("2021-01-04", periods=n).as_unit("ns").asi8
+    return BarSeries(ts, close, close * 1.01, close * 0.99, close, rng.uniform(1e5, 1e6, n), symbol="SIM")
+
+def test_each_timeframe_matches_its_own_calculation():
+    """Test aligned values at each bar's close equal indicators on the resampled series alone"""
+    bars = _bars()
+    aligned = multi_timeframe_indicators(bars, ["1d", "1wk", "1mo"], INDICATORS)
+    ta = TechnicalAnalysis()
+
+    daily = ta.calculate_bar_indicators(bars, INDICATORS)
+    for name, values in daily.items():
+        np.testing.assert_allclose(aligned["1d"][name], values, equal_nan=True)
+
+    for interval in ("1wk", "1mo"):
+        tf_bars, ends = resample_bars(bars, interval)
+        expected = ta.calculate_bar_indicators(tf_bars, INDICATORS)
+        for name, values in expected.items():
+            np.testing.assert_allclose(aligned[interval][name][ends], values, equal_nan=True)
+        np.testing.assert_array_equal(aligned[interval]["ts"][ends], tf_bars.ts)
+
+def test_higher_timeframes_only_show_closed_bars():
+    """Test a week's value appears on its last day and holds until the next week closes"""
+    bars = _bars(60)
+    weekly = multi_timeframe_indicators(bars, ["1d", "1wk"], ["ema"], {"ema_period": 2})["1wk"]
+    _, ends = resample_bars(bars, "1wk")
+
+    assert (weekly["ts"][:ends[0]] == -1).all()
+    for prev, end in zip(ends[:-1], ends[1:]):
+        assert np.all(weekly["ema"][prev:end] == weekly["ema"][prev])
+    assert weekly["ema"][-1] != weekly["ema"][ends[-2]]
+
+    assert finest_interval(["1mo", "60m", "1d"]) == "60m"
+    with pytest.raises(ValueError):
+        finest_interval(["1d", "2h"])
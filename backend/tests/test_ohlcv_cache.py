@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+import pandas as pd
+from app.services.ohlcv_cache import OHLCVCache
+
+@pytest.fixture
+def frame():
+    """Ten recent daily bars"""
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=10, freq="D")
+    return pd.DataFrame({
+        "date": dates,
+        "open": range(10),
+        "high": range(1, 11),
+        "low": range(10),
+        "close": [float(i) + 0.5 for i in range(10)],
+        "volume": [1000.0] * 10,
+    })
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache backed by a temporary directory"""
+    return OHLCVCache(cache_dir=str(tmp_path), max_entries=2)
+
+def test_miss_then_hit(cache, frame):
+    """Test a stored series is served from memory"""
+    assert cache.get("AAPL", "1d", 30) is None
+    cache.put("AAPL", "1d", 30, frame)
+
+    cached = cache.get("aapl", "1d", 30)
+    assert cached is not None
+    assert len(cached) == 10
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+def test_wider_window_is_a_miss(cache, frame):
+    """Test a request for more days than were fetched is not served"""
+    cache.put("AAPL", "1d", 30, frame)
+    assert cache.get("AAPL", "1d", 180) is None
+
+def test_expired_entry(cache, frame):
+    """Test entries older than the interval TTL are not served"""
+    cache.ttls["1d"] = 0
+    cache.put("AAPL", "1d", 30, frame)
+    assert cache.get("AAPL", "1d", 30) is None
+    assert cache.stats()["expired"] == 1
+
+def test_lru_eviction(cache, frame):
+    """Test the least recently used entry is evicted"""
+    cache.put("AAPL", "1d", 30, frame)
+    cache.put("MSFT", "1d", 30, frame)
+    cache.get("AAPL", "1d", 30)
+    cache.put("TSLA", "1d", 30, frame)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+
+def test_survives_restart(tmp_path, frame):
+    """Test a fresh cache instance reads series back from disk"""
+    first = OHLCVCache(cache_dir=str(tmp_path))
+    first.put("AAPL", "1d", 30, frame)
+    assert first.flush(timeout=5)
+
+    restarted = OHLCVCache(cache_dir=str(tmp_path))
+    cached = restarted.get("AAPL", "1d", 30)
+    assert cached is not None
+    assert cached["close"].tolist() == frame["close"].tolist()
+    assert cached["date"].astype(str).tolist() == frame["date"].astype(str).tolist()
+    assert restarted.stats()["disk_hits"] == 1
+
+def test_disk_writes_do_not_block_put(cache, frame, monkeypatch):
+    """Test put returns while the disk write is still pending, and queued writes of a key coalesce"""
+    release, written = threading.Event(), []
+    def slow_write(key, entry):
+        release.wait(5)
+        written.append((key, len(entry.frame)))
+    monkeypatch.setattr(cache, "_write_to_disk", slow_write)
+
+    cache.put("AAPL", "1d", 30, frame)
+    cache.put("MSFT", "1d", 30, frame)
+    cache.put("MSFT", "1d", 30, frame.iloc[:5])
+    assert cache.get("MSFT", "1d", 30) is not None
+    assert cache.stats()["pending_writes"] == 2
+
+    release.set()
+    assert cache.flush(timeout=5)
+    assert written == [(("AAPL", "1d"), 10), (("MSFT", "1d"), 5)]
+
+def test_cached_copy_is_isolated(cache, frame):
+    """Test callers cannot mutate the cached series"""
+    cache.put("AAPL", "1d", 30, frame)
+    cached = cache.get("AAPL", "1d", 30)
+    cached["close"] = 0.0
+    assert cache.get("AAPL", "1d", 30)["close"].iloc[-1] == 9.5
+
+def test_merge_tail_overwrites_forming_bar(cache, frame):
+    """Test an incremental tail replaces the last bar and appends new ones"""
+    cache.put("AAPL", "1d", 30, frame)
+    last = frame["date"].iloc[-1]
+    tail = pd.DataFrame({
+        "date": [last, last + pd.Timedelta(days=1)],
+        "open": [9.0, 10.0],
+        "high": [12.0, 13.0],
+        "low": [8.0, 9.0],
+        "close": [11.0, 12.0],
+        "volume": [5000.0, 10.0],
+    })
+
+    merged = cache.merge_tail("AAPL", "1d", tail)
+    assert len(merged) == 11
+    assert merged["close"].tolist()[-2:] == [11.0, 12.0]
+    assert cache.last_bar("AAPL", "1d") == last + pd.Timedelta(days=1)
+    assert cache.stats()["incremental_updates"] == 1
@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import Base, Position, Trade
+from app.services.portfolio import portfolio_summary
+from app.services.positions import apply_trade, load_positions, rebuild_positions, record_trades, recompute_symbols
+
+@pytest.fixture
+def db():
+    """In-memory database with the app's tables"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def _trade(symbol, trade_type, quantity, price, user_id=1):
+    """Trade row"""
+    return Trade(user_id=user_id, symbol=symbol, trade_type=trade_type, quantity=quantity, price=price)
+
+def _insert(db, *trades):
+    """Insert trades the way the API does: trades and positions in one commit"""
+    for trade in trades:
+        db.add(trade)
+        record_trades(db, trade.user_id, [trade])
+        db.commit()
+
+def _snapshot(db, user_id=1):
+    """Comparable view of a user's positions"""
+    return {
+        p.symbol: (round(p.quantity, 9), round(p.cost_basis, 6), round(p.realized_pnl, 6), p.trade_count, round(p.traded_value, 6))
+        for p in load_positions(db, user_id)
+    }
+
+def test_average_cost_scaling_in_out_and_reversal(db):
+    """Test realized PnL at average cost through scale-ins, partial exits and a flip to short"""
+    _insert(
+        db,
+        _trade("AAPL", "buy", 10, 100.0),
+        _trade("AAPL", "buy", 30, 110.0),   # 40 @ 107.5
+        _trade("AAPL", "sell", 20, 120.0),  # +250, 20 left @ 107.5
+        _trade("AAPL", "sell", 30, 100.0),  # -150 on 20, then short 10 @ 100
+        _trade("AAPL", "buy", 4, 90.0),     # +40 on the short
+    )
+    (position,) = load_positions(db, 1)
+
+    assert position.realized_pnl == pytest.approx(140.0)
+    assert position.quantity == pytest.approx(-6)
+    assert position.average_cost == pytest.approx(100.0)
+    assert position.trade_count == 5
+
+def test_edits_and_deletes_match_a_rebuild(db):
+    """Test incremental upkeep after update and delete equals a replay of the trade log"""
+    first, second, third = _trade("MSFT", "buy", 5, 300.0), _trade("MSFT", "sell", 5, 290.0), _trade("TSLA", "buy", 2, 200.0)
+    _insert(db, first, second, third, _trade("TSLA", "sell", 1, 250.0), _trade("AAPL", "buy", 1, 10.0, user_id=2))
+
+    second.price = 330.0
+    third.symbol = "NVDA"
+    recompute_symbols(db, 1, {"MSFT", "TSLA", "NVDA"})
+    db.commit()
+    db.delete(first)
+    recompute_symbols(db, 1, {"MSFT"})
+    db.commit()
+
+    incremental = _snapshot(db)
+    assert rebuild_positions(db, user_id=1) == 3
+    assert _snapshot(db) == incremental
+    assert incremental["MSFT"] == (-5, -1650.0, 0.0, 1, 1650.0)
+    assert set(incremental) == {"MSFT", "TSLA", "NVDA"}
+    assert _snapshot(db, 2) == {"AAPL": (1, 10.0, 0.0, 1, 10.0)}
+
+def test_concurrent_first_trades_share_one_row(tmp_path):
+    """Test a position row another request inserts just before ours is locked and reused, not duplicated"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    ours, theirs = Session(), Session()
+    raced = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def other_request_wins(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO positions") and not raced:
+            raced.append(True)
+            _insert(theirs, _trade("NVDA", "buy", 2, 100.0))
+
+    # Projection first: our transaction has written nothing when the other request commits
+    trade = _trade("NVDA", "buy", 1, 130.0)
+    record_trades(ours, 1, [trade])
+    ours.add(trade)
+    ours.commit()
+
+    assert raced
+    assert _snapshot(ours) == {"NVDA": (3, 330.0, 0.0, 2, 330.0)}
+    ours.close()
+    theirs.close()
+
+def test_summary_reads_positions(db):
+    """Test /summary figures come from the projection"""
+    _insert(
+        db,
+        _trade("AAPL", "buy", 20, 100.0), _trade("AAPL", "sell", 20, 110.0),
+        _trade("MSFT", "buy", 5, 300.0), _trade("MSFT", "sell", 5, 290.0),
+        _trade("TSLA", "buy", 1, 200.0),
+    )
+    positions = load_positions(db, 1)
+
+    assert portfolio_summary(positions) == {
+        "total_trades": 5,
+        "total_value": 7350.0,
+        "total_pnl": 150.0,
+        "win_rate": round(100 / 3, 2),
+        "sharpe_ratio": round(150 / 7350, 4),
+        "open_positions": 1,
+    }
+    assert portfolio_summary([])["total_trades"] == 0
+
+def test_unknown_trade_types_only_count():
+    """Test a trade that is neither buy nor sell leaves quantity and PnL alone"""
+    position = Position(quantity=0.0, cost_basis=0.0, realized_pnl=0.0, trade_count=0, traded_value=0.0)
+    apply_trade(position, "hold", 5, 10.0)
+
+    assert (position.quantity, position.trade_count, position.traded_value) == (0.0, 1, 50.0)
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import pytest
+from app.services.quote_service import QuoteService
+
+@pytest.fixture
+def quotes(monkeypatch):
+    """Quote service whose Finnhub fallback is recorded instead of called"""
+    service = QuoteService(quote_ttl=60, stream_max_age=60)
+    service.fetched = []
+
+    async def fake_fetch(symbol, priority):
+        service.fetched.append(symbol)
+        return {"symbol": symbol, "price": 100.0, "source": "finnhub"}
+
+    monkeypatch.setattr(service, "_fetch_quote", fake_fetch)
+    return service
+
+def test_streamed_trade_is_served_without_upstream(quotes):
+    """Test the last-trade table answers before Finnhub"""
+    quotes.record_trades([{"s": "AAPL", "p": 190.5, "v": 10, "t": time.time() * 1000}])
+
+    assert asyncio.run(quotes.get_current_price("aapl")) == 190.5
+    assert quotes.fetched == []
+    assert quotes.stats()["stream_hits"] == 1
+
+def test_out_of_order_tick_is_ignored(quotes):
+    """Test an older trade does not overwrite a newer one"""
+    now = time.time() * 1000
+    quotes.record_trades([{"s": "AAPL", "p": 191.0, "t": now}])
+    quotes.record_trades([{"s": "AAPL", "p": 150.0, "t": now - 5000}])
+
+    assert asyncio.run(quotes.get_current_price("AAPL")) == 191.0
+
+def test_batch_fallback_uses_micro_cache(quotes):
+    """Test batch lookups fetch each miss once and then hit the cache"""
+    result = asyncio.run(quotes.get_quotes(["MSFT", "TSLA", "msft"]))
+    assert set(result) == {"MSFT", "TSLA"}
+
+    asyncio.run(quotes.get_quotes(["MSFT", "TSLA"]))
+    assert sorted(quotes.fetched) == ["MSFT", "TSLA"]
+    assert quotes.stats()["cache_hits"] == 2
+
+def test_quotes_route_needs_auth_and_caps_symbols(quotes, monkeypatch):
+    """Test /prices/quotes rejects anonymous callers and oversized symbol lists before any fetch"""
+    from types import SimpleNamespace
+    from fastapi.testclient import TestClient
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.routes import prices
+    from app.routes.analytics import MAX_BATCH_SYMBOLS
+
+    monkeypatch.setattr(prices, "quote_service", quotes)
+    client = TestClient(app)
+    assert client.get("/api/prices/quotes?symbols=AAPL").status_code == 401
+
+    too_many = ",".join(f"S{i}" for i in range(MAX_BATCH_SYMBOLS + 1))
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    try:
+        rejected = client.get(f"/api/prices/quotes?symbols={too_many}")
+        accepted = client.get("/api/prices/quotes?symbols=aapl,AAPL,msft")
+    finally:
+        app.dependency_overrides.pop(get_current_user)
+
+    assert rejected.status_code == 400 and "At most" in rejected.json()["detail"]
+    assert accepted.status_code == 200 and sorted(quotes.fetched) == ["AAPL", "MSFT"]
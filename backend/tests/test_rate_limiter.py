@@ -0,0 +1,51 @@
+import asyncio
+import time
+import pytest
+from app.core.rate_limiter import ProviderLimiter, Priority, RateLimitExceeded
+
+@pytest.fixture
+def limiter():
+    """20 requests/second with a burst of 2"""
+    return ProviderLimiter("test", per_minute=1200, burst=2, max_queue=3)
+
+def test_requests_over_quota_queue_instead_of_failing(limiter):
+    """Test bursts beyond the bucket wait for tokens"""
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+    assert elapsed >= 0.1
+    stats = limiter.stats()
+    assert stats["granted"] == 5
+    assert stats["queued"] == 3
+    assert stats["rejected"] == 0
+
+def test_interactive_requests_jump_the_queue(limiter):
+    """Test queued interactive requests are served before background ones"""
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async def main():
+        await limiter.acquire()
+        await limiter.acquire()
+        await asyncio.gather(
+            request("background", Priority.BACKGROUND),
+            request("interactive", Priority.INTERACTIVE),
+        )
+
+    asyncio.run(main())
+    assert order == ["interactive", "background"]
+
+def test_full_queue_rejects(limiter):
+    """Test requests beyond the queue bound are rejected"""
+    async def main():
+        return await asyncio.gather(*(limiter.acquire() for _ in range(6)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert sum(isinstance(r, RateLimitExceeded) for r in results) == 1
+    assert limiter.stats()["rejected"] == 1
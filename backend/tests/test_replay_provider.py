@@ -0,0 +1,80 @@
+import asyncio
+import json
+import pandas as pd
+import pytest
+from app.providers.replay import ReplayProvider
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    """Two years of recorded daily bars, a quote and two trades for AAPL"""
+    (tmp_path / "ohlcv").mkdir()
+    (tmp_path / "quotes").mkdir()
+    (tmp_path / "ticks").mkdir()
+
+    dates = pd.bdate_range("2022-01-03", "2023-12-29")
+    pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "open": 100.0,
+        "high": 101.0,
+        "low": 99.0,
+        "close": [100.0 + i for i in range(len(dates))],
+        "volume": 1000,
+    }).to_csv(tmp_path / "ohlcv" / "AAPL_1d.csv", index=False)
+
+    (tmp_path / "quotes" / "AAPL.json").write_text(json.dumps({"c": 190.0, "pc": 189.0, "t": 1}))
+    (tmp_path / "ticks" / "AAPL.jsonl").write_text(
+        json.dumps({"s": "AAPL", "p": 190.1, "v": 5, "t": 1000}) + "\n"
+        + json.dumps({"s": "AAPL", "p": 190.2, "v": 5, "t": 1001}) + "\n"
+    )
+    return str(tmp_path)
+
+def test_bars_are_shifted_into_the_current_week(fixtures_dir):
+    """Test recorded bars end this week, keep their weekdays and honour the window"""
+    provider = ReplayProvider(fixtures_dir)
+    df = asyncio.run(provider.fetch_ohlcv("aapl", "1d", period="30d"))
+
+    last = pd.Timestamp(df["date"].iloc[-1])
+    assert (pd.Timestamp.now().normalize() - last).days < 7
+    assert (pd.DatetimeIndex(df["date"]).dayofweek < 5).all()
+    assert len(df) <= 23
+    assert df["close"].iloc[-1] == 100.0 + 519
+
+def test_unknown_symbol_looks_like_finnhub(fixtures_dir):
+    """Test missing fixtures answer the way the live upstreams do"""
+    provider = ReplayProvider(fixtures_dir)
+    assert asyncio.run(provider.fetch_quote("NOPE"))["c"] == 0
+    assert asyncio.run(provider.fetch_ohlcv("NOPE", "1d", period="30d")).empty
+    assert asyncio.run(provider.fetch_quote("AAPL"))["c"] == 190.0
+
+def test_latency_jitter_is_seeded(fixtures_dir, monkeypatch):
+    """Test two providers with the same seed sleep the same amounts"""
+    def run_once():
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        provider = ReplayProvider(fixtures_dir, latency_ms=50, jitter_ms=20, seed=7)
+        for _ in range(3):
+            asyncio.run(provider.fetch_quote("AAPL"))
+        return slept
+
+    first, second = run_once(), run_once()
+    assert first == second
+    assert all(0.03 <= s <= 0.07 for s in first)
+
+def test_ticks_replay_with_live_timestamps(fixtures_dir):
+    """Test recorded trades come back in order stamped with the wall clock"""
+    async def take(n):
+        provider = ReplayProvider(fixtures_dir)
+        batches = []
+        async for trades in provider.stream_ticks(["AAPL"]):
+            batches.append(trades)
+            if len(batches) == n:
+                break
+        return batches
+
+    batches = asyncio.run(take(2))
+    assert [b[0]["p"] for b in batches] == [190.1, 190.2]
+    assert batches[0][0]["t"] > 1_000_000_000_000
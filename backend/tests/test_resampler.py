@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.bar_series import BarSeries
+from app.services.resampler import resample_bars, resample_ohlcv, resample_source
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+def _bars(dates):
+    """Random-walk OHLCV frame over the given timestamps"""
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(len(dates)).cumsum()
+    return pd.DataFrame({
+        "date": dates,
+        "open": close + rng.standard_normal(len(dates)),
+        "high": close + 2,
+        "low": close - 2,
+        "close": close,
+        "volume": rng.integers(100, 1000, len(dates)).astype(float),
+    })
+
+@pytest.mark.parametrize("interval,rule", [("1wk", "W-MON"), ("1mo", "MS")])
+def test_daily_to_weekly_and_monthly_match_pandas(interval, rule):
+    """Test weekly/monthly bars equal pandas resample with first/max/min/last/sum"""
+    df = _bars(pd.bdate_range("2023-01-03", "2023-12-29"))
+    expected = (
+        df.set_index("date")
+        .resample(rule, label="left", closed="left")
+        .agg(AGG)
+        .dropna()
+        .reset_index()
+    )
+
+    result = resample_ohlcv(df, interval)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_minute_buckets_anchor_at_session_open():
+    """Test 60m bars start at 9:30 each session and skip the overnight gap"""
+    sessions = [
+        pd.date_range(f"2024-03-{day} 09:30", f"2024-03-{day} 15:59", freq="1min", tz="America/New_York")
+        for day in ("08", "11")  # DST starts in between
+    ]
+    df = _bars(sessions[0].append(sessions[1]))
+
+    result = resample_ohlcv(df, "60m")
+
+    assert len(result) == 14
+    assert str(result["date"].dt.tz) == "America/New_York"
+    assert result["date"].dt.strftime("%H:%M").tolist()[:7] == [
+        "09:30", "10:30", "11:30", "12:30", "13:30", "14:30", "15:30"
+    ]
+    assert result["volume"].sum() == df["volume"].sum()
+    assert result["high"].iloc[0] == df["high"].iloc[:60].max()
+    assert result["close"].iloc[-1] == df["close"].iloc[-1]
+
+def test_long_intraday_windows_are_not_resampled():
+    """Test 1m sources are only used where Yahoo has 1m history"""
+    assert resample_source("15m", 5) == "1m"
+    assert resample_source("15m", 30) is None
+    assert resample_source("1wk", 3650) == "1d"
+    assert resample_source("1d", 180) is None
+
+@pytest.mark.parametrize("interval,dates", [
+    ("1mo", pd.bdate_range("2023-01-03", "2023-12-29")),
+    ("1d", pd.date_range("2024-03-08 09:30", "2024-03-12 15:59", freq="30min", tz="America/New_York")),
+])
+def test_bar_series_resampling_matches_frames(interval, dates):
+    """Test resample_bars gives resample_ohlcv's bars and the row each bar closes on"""
+    df = _bars(dates)
+    expected = BarSeries.from_frame(resample_ohlcv(df, interval), interval=interval)
+
+    result, ends = resample_bars(BarSeries.from_frame(df), interval)
+
+    assert result.tz == expected.tz
+    np.testing.assert_array_equal(result.ts, expected.ts)
+    for col in ("open", "high", "low", "close", "volume"):
+        np.testing.assert_allclose(getattr(result, col), getattr(expected, col))
+    np.testing.assert_array_equal(df["close"].to_numpy()[ends], result.close)
+    assert ends[-1] == len(df) - 1
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.bar_series import BarPanel, BarSeries
+from app.services.screener import Expression, ScreenerExpressionError, screen_shard
+from app.services.technical_analysis import TechnicalAnalysis
+
+def _series(symbol, close):
+    """Daily BarSeries with the given closes"""
+    close = np.asarray(close, dtype=float)
+    ts = pd.bdate_range("2024-01-02", periods=len(close)).as_unit("ns").asi8
+    return BarSeries(ts, close, close + 1, close - 1, close, np.full(len(close), 1000.0), symbol=symbol)
+
+@pytest.fixture
+def panel():
+    """Falling, rising and flat-then-jumping symbols over 120 bars"""
+    rng = np.random.default_rng(1)
+    noise = rng.standard_normal(120) * 0.2
+    return BarPanel.from_series({
+        "DOWN": _series("DOWN", 200 - np.arange(120) + noise),
+        "UP": _series("UP", 50 + np.arange(120) + noise),
+        "JUMP": _series("JUMP", np.r_[np.full(119, 100.0) + noise[:119], 130.0]),
+    })
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('ls')",
+    "close.real > 1",
+    "rsi < 30 if close else 1",
+    "unknown_field > 1",
+    "prev(close, 2) > 1",
+    "close > 'a'",
+    "rsi <",
+    "(" * 5000 + "close" + ")" * 5000,
+    "not " * 200 + "close",
+    "-" * 900 + "close",
+    " + ".join(["abs(close)"] * 80),
+])
+def test_rejects_unsupported_expressions(text):
+    """Test anything outside the screener grammar is refused before evaluation"""
+    with pytest.raises(ScreenerExpressionError):
+        Expression(text)
+
+def test_filters_on_latest_indicator_values(panel):
+    """Test matches and field values come from each symbol's last bar"""
+    oversold = {m["symbol"] for m in screen_shard(panel, "rsi < 30", None)}
+    overbought = {m["symbol"] for m in screen_shard(panel, "rsi > 70 and close > sma", None)}
+
+    assert oversold == {"DOWN"}
+    assert overbought == {"UP", "JUMP"}
+
+    up = next(m for m in screen_shard(panel, "close > 0", None) if m["symbol"] == "UP")
+    expected = TechnicalAnalysis().calculate_bar_indicators(panel.column("UP"))
+    assert up["close"] == panel.close[-1, panel.symbols.index("UP")]
+    assert up["rsi"] == pytest.approx(expected["rsi"][-1])
+    assert up["bollinger_middle"] == pytest.approx(expected["sma"][-1])
+
+def test_prev_and_crosses_look_one_bar_back(panel):
+    """Test prev() and crosses_above() compare the last two bars"""
+    jumped = screen_shard(panel, "close / prev(close) - 1 > 0.2", None)
+    crossed = screen_shard(panel, "crosses_above(close, bollinger_upper)", None)
+
+    assert [m["symbol"] for m in jumped] == ["JUMP"]
+    assert [m["symbol"] for m in crossed] == ["JUMP"]
+
+def test_rank_expression_and_short_histories():
+    """Test rank values are returned per match and short histories never match"""
+    panel = BarPanel.from_series({
+        "A": _series("A", 100 + np.arange(80.0)),
+        "B": _series("B", 100 + 2 * np.arange(80.0)),
+        "NEW": _series("NEW", [10.0, 11.0, 12.0]),
+    })
+
+    matches = screen_shard(panel, "close > 0 and rsi > 0", "close - sma")
+    ranks = {m["symbol"]: m["rank"] for m in matches}
+
+    assert set(ranks) == {"A", "B"}
+    assert ranks["B"] == pytest.approx(2 * ranks["A"])
+
+def test_lags_follow_each_symbols_own_calendar():
+    """Test prev() and crosses read a symbol's previous bar, not the previous row of a mixed-calendar panel"""
+    rng = np.random.default_rng(4)
+    # Business days ending on a Monday: the panel row before it is BTC-USD's Sunday
+    jump = np.r_[np.full(119, 100.0) + rng.standard_normal(119) * 0.2, 130.0]
+    daily = pd.date_range("2024-01-01", periods=170)
+    crypto = BarSeries(
+        daily.as_unit("ns").asi8, *[np.full(len(daily), 50.0)] * 4, np.full(len(daily), 1000.0), symbol="BTC-USD",
+    )
+    panel = BarPanel.from_series({"JUMP": _series("JUMP", jump), "BTC-USD": crypto})
+    alone = BarPanel.from_series({"JUMP": _series("JUMP", jump)})
+
+    for expression in ["close / prev(close) - 1 > 0.2", "crosses_above(close, bollinger_upper)", "rsi > prev(rsi) + 10"]:
+        mixed = [m for m in screen_shard(panel, expression, None) if m["symbol"] == "JUMP"]
+        assert mixed == screen_shard(alone, expression, None), expression
+        assert len(mixed) == 1
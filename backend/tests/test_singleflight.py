@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from app.core.singleflight import SingleFlight
+
+@pytest.fixture
+def flights():
+    """Fresh coalescing group"""
+    return SingleFlight("test")
+
+def test_concurrent_calls_share_one_execution(flights):
+    """Test concurrent callers for one key trigger a single upstream call"""
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"c": 150.0}
+
+    async def main():
+        return await asyncio.gather(*(flights.do(("finnhub", "AAPL"), fetch) for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(r == {"c": 150.0} for r in results)
+    assert flights.stats()["coalesced"] == 9
+    assert flights.stats()["in_flight"] == 0
+
+def test_failures_propagate_and_are_not_cached(flights):
+    """Test every waiter sees the error and the next call retries"""
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("key", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    asyncio.run(main())
+    assert len(calls) == 2
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.backtester import run_backtest
+from app.services.bar_series import BarSeries
+from app.services.shared_bars import SharedBars, attach
+from app.services.sweeps import (
+    SweepError, build_candidates, parameter_grid, sweep_chunk, walk_forward_chunk, walk_forward_windows,
+)
+
+# symbol -> (seed, bars)
+UNIVERSE = {"AAA": (1, 750), "BBB": (2, 500), "CCC": (3, 300)}
+
+def _bars(symbol):
+    """Random-walk daily BarSeries"""
+    seed, n = UNIVERSE[symbol]
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    ts = pd.bdate_range("2021-01-04", periods=n).as_unit("ns").asi8
+    return BarSeries(ts, close, close * 1.01, close * 0.99, close, np.full(n, 1e6), symbol=symbol)
+
+@pytest.fixture
+def shared():
+    """Three symbols of different lengths in one shared memory block"""
+    block = SharedBars.create({symbol: _bars(symbol) for symbol in UNIVERSE})
+    yield block
+    block.close()
+
+def test_parameter_spaces():
+    """Test grid ranges, random sampling and candidate validation"""
+    grid = parameter_grid({"period": {"min": 10, "max": 20, "step": 5}, "lower": [25, 30]})
+    assert grid == [
+        {"period": 10, "lower": 25}, {"period": 10, "lower": 30}, {"period": 15, "lower": 25},
+        {"period": 15, "lower": 30}, {"period": 20, "lower": 25}, {"period": 20, "lower": 30},
+    ]
+
+    space = {"fast": {"min": 5, "max": 30}, "slow": [50, 100, 200]}
+    sampled = build_candidates("ema_cross", space, mode="random", samples=40, seed=7)
+    assert sampled == build_candidates("ema_cross", space, mode="random", samples=40, seed=7)
+    assert all(5 <= c["fast"] <= 30 and c["slow"] in (50, 100, 200) for c in sampled)
+    assert len({tuple(c.items()) for c in sampled}) == len(sampled)
+
+    assert build_candidates("rsi", {"period": [7]}) == [{"period": 7, "lower": 30, "upper": 70}]
+    for strategy, bad in [
+        ("rsi", {"lookback": [5]}), ("rsi", {"period": [0]}), ("rsi", {"period": {"min": 5, "max": 9}}),
+        ("ema_cross", {"fast": [60, 80]}), ("bollinger", {"period": [1, 20]}), ("bollinger", {"std": [0, 2]}),
+        ("rsi", {"lower": [20, -5], "upper": [70]}),
+    ]:
+        with pytest.raises(SweepError):
+            build_candidates(strategy, bad)
+
+def test_overlapping_ranges_skip_conflicting_combinations():
+    """Test fast >= slow and lower >= upper combinations are dropped rather than failing the sweep"""
+    grid = build_candidates("ema_cross", {"fast": {"min": 5, "max": 30, "step": 5}, "slow": {"min": 20, "max": 60, "step": 10}})
+    expected = [(f, s) for f in range(5, 35, 5) for s in range(20, 70, 10) if f < s]
+    assert [(c["fast"], c["slow"]) for c in grid] == expected
+
+    thresholds = build_candidates("rsi", {"lower": [20, 30, 40], "upper": [35, 70]})
+    assert [(c["lower"], c["upper"]) for c in thresholds] == [(20, 35), (20, 70), (30, 35), (30, 70), (40, 70)]
+
+    sampled = build_candidates("macd_cross", {"fast": {"min": 5, "max": 40}, "slow": {"min": 20, "max": 60}}, mode="random", samples=50, seed=3)
+    assert sampled and all(c["fast"] < c["slow"] for c in sampled)
+
+def test_shared_bars_round_trip(shared):
+    """Test attached views equal the original bars and are read-only"""
+    views = attach(shared.subset(["BBB", "CCC"]))
+    original = _bars("BBB")
+
+    assert list(views) == ["BBB", "CCC"]
+    np.testing.assert_array_equal(views["BBB"].ts, original.ts)
+    np.testing.assert_array_equal(views["BBB"].close, original.close)
+    assert len(views["CCC"]) == 300
+    assert not views["BBB"].close.flags.writeable
+
+def test_sweep_chunk_matches_single_backtests(shared):
+    """Test the batched sweep metrics equal a full backtest of each candidate"""
+    candidates = build_candidates("rsi", {"period": [7, 14], "lower": [25, 35]})
+    rows = sweep_chunk(shared.subset(["AAA", "BBB"]), "rsi", candidates, True, 1.0, 2.0)
+
+    assert len(rows) == 8
+    for row in rows:
+        metrics = run_backtest(_bars(row["symbol"]), "rsi", row["params"], allow_short=True, include_curve=False)["metrics"]
+        assert row["total_return"] == pytest.approx(metrics["total_return"])
+        assert row["sharpe_ratio"] == pytest.approx(metrics["sharpe_ratio"])
+        assert row["max_drawdown"] == pytest.approx(metrics["max_drawdown"]["max_drawdown"])
+        assert row["cagr"] == pytest.approx(metrics["cagr"])
+        assert row["trades"] == metrics["win_rate"]["total_trades"]
+
+def test_walk_forward_picks_in_sample_best(shared):
+    """Test each window trains on its own bars and is scored on the following ones"""
+    assert walk_forward_windows(300, 200, 50) == [(0, 200, 250), (50, 250, 300)]
+
+    candidates = build_candidates("ema_cross", {"fast": [5, 10, 20], "slow": [50, 100]})
+    rows = walk_forward_chunk(shared.subset(["AAA", "CCC"]), "ema_cross", candidates, False, 1.0, 2.0,
+                              "total_return", 250, 100, None)
+    per_symbol = {s: [r for r in rows if r["symbol"] == s] for s in ("AAA", "CCC")}
+    assert len(per_symbol["AAA"]) == 5 and per_symbol["CCC"] == []
+
+    first = per_symbol["AAA"][0]
+    bars = _bars("AAA")
+    train = BarSeries(bars.ts[:250], *(getattr(bars, f)[:250] for f in ("open", "high", "low", "close", "volume")))
+    scores = [
+        run_backtest(train, "ema_cross", params, fee_bps=1.0, slippage_bps=2.0, include_curve=False)["metrics"]["total_return"]
+        for params in candidates
+    ]
+    # Signals computed on the full series equal those on the train prefix (causal indicators)
+    assert first["params"] == candidates[int(np.argmax(scores))]
+    assert first["in_sample"]["total_return"] == pytest.approx(max(scores))
+    assert (first["train_end"], first["test_start"]) == ("2021-12-17", "2021-12-20")
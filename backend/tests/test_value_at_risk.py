@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+from app.services.value_at_risk import monte_carlo_chunks, monte_carlo_tails, tail_losses, tail_size, value_at_risk
+
+def _history(days=500, seed=3):
+    """Correlated daily log returns for two assets"""
+    rng = np.random.default_rng(seed)
+    cov = np.array([[0.0004, 0.0002], [0.0002, 0.0009]])
+    return rng.multivariate_normal([0.0005, 0.0002], cov, days)
+
+def test_tail_losses_on_known_samples():
+    """Test VaR is the loss quantile and CVaR the mean loss beyond it"""
+    pnl = -np.arange(1.0, 101.0)  # losses 1..100
+
+    [(var, cvar)] = tail_losses(pnl, [0.95])
+
+    assert var == pytest.approx(95.05)
+    assert cvar == pytest.approx(np.mean(np.arange(96.0, 101.0)))
+
+def test_parametric_matches_closed_form():
+    """Test delta-normal VaR/CVaR scale with sqrt(horizon) from the sample moments"""
+    returns = _history()
+    exposure = np.array([10_000.0, -4_000.0])
+    mean, cov = returns.mean(axis=0), np.cov(returns, rowvar=False)
+
+    records = value_at_risk(returns, exposure, [0.99], [1, 10], ["parametric"])
+
+    for record in records:
+        h = record["horizon_days"]
+        sigma = math.sqrt(h * exposure @ cov @ exposure)
+        assert record["var"] == pytest.approx(2.3263478740 * sigma - h * mean @ exposure)
+        assert record["cvar"] == pytest.approx(2.6652142203 * sigma - h * mean @ exposure)
+        assert record["samples"] == len(returns)
+
+def test_monte_carlo_is_seeded_and_converges_to_parametric():
+    """Test a seed reproduces the paths whatever the chunk size, near the normal answer"""
+    returns = _history()
+    exposure = np.array([10_000.0, 5_000.0])
+    mean, cov = returns.mean(axis=0), np.cov(returns, rowvar=False)
+
+    whole = next(monte_carlo_chunks(mean, cov, exposure, [1, 10], 50_000, seed=11, chunk_paths=50_000))
+    chunked = np.concatenate([c[10] for c in monte_carlo_chunks(mean, cov, exposure, [1, 10], 50_000, seed=11, chunk_paths=7_000)])
+    assert np.allclose(whole[10], chunked, rtol=0, atol=1e-9)
+
+    # Streaming keeps only the worst tail of each horizon, yet matches the full sample
+    streamed = monte_carlo_tails(mean, cov, exposure, [1, 10], [0.9, 0.99], 50_000, seed=11, chunk_paths=7_000)
+    for h in (1, 10):
+        full = tail_losses(whole[h], [0.9, 0.99])
+        assert np.allclose(streamed[h], full, rtol=1e-9)
+        assert [v for v, _ in full] == pytest.approx(np.quantile(-whole[h], [0.9, 0.99]), rel=1e-12)
+    assert tail_size(50_000, [0.9, 0.99]) == 5_001
+
+    # Full revaluation is convex in the returns; at low volatility it is close to delta-normal
+    calm = returns / 10
+    records = value_at_risk(calm, exposure, [0.95], [1], ["parametric", "monte_carlo"], paths=200_000, seed=5)
+    parametric, simulated = records
+    assert simulated["samples"] == 200_000
+    assert simulated["var"] == pytest.approx(parametric["var"], rel=0.02)
+    assert simulated["cvar"] == pytest.approx(parametric["cvar"], rel=0.02)
+
+def test_historical_needs_enough_history():
+    """Test historical windows overlap and a horizon past the history yields no figures"""
+    returns = _history(days=30)
+
+    short, long = value_at_risk(returns, np.array([1_000.0, 1_000.0]), [0.95], [5, 31], ["historical"])
+
+    assert short["samples"] == 26 and short["var"] is not None
+    assert long["samples"] == 0 and long["var"] is None and long["cvar"] is None
+
+@pytest.mark.parametrize("kwargs,match", [
+    ({"methods": ["garch"]}, "garch"),
+    ({"confidences": [1.0]}, "below 1"),
+    ({"confidences": [0.2]}, "at least 0.5"),
+    ({"horizons": [0]}, "between 1 and 252"),
+    ({"horizons": [300]}, "between 1 and 252"),
+    ({"horizons": list(range(1, 12))}, "At most"),
+])
+def test_rejects_bad_inputs(kwargs, match):
+    """Test unknown methods, confidences and horizons are rejected"""
+    with pytest.raises(ValueError, match=match):
+        value_at_risk(_history(days=10), np.ones(2), **kwargs)